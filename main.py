@@ -5,6 +5,7 @@ Usage::
     python main.py --help
     python main.py --serve
     python main.py --scan
+    python main.py --train-index
     python main.py --settings
 """
 
@@ -55,6 +56,11 @@ def main():
         action="store_true",
         help="Perform a full media scan and index update",
     )
+    parser.add_argument(
+        "--train-index",
+        action="store_true",
+        help="Train the IVF-PQ index for flat-backend collections",
+    )
     parser.add_argument("--grpc", action="store_true", help="Start the gRPC Inference Server")
     parser.add_argument("--grpc-port", type=int, default=50051, help="gRPC server port (default: 50051)")
 
@@ -105,6 +111,11 @@ def main():
         index_service.run_full_scan()
         return
 
+    if args.train_index:
+        index_service = IndexService()
+        index_service.train_vector_index()
+        return
+
     if args.serve:
         from wsgi import app
 
@@ -28,7 +28,7 @@ def create_app() -> Flask:
     CORS(app)
 
     index_service = IndexService()
-    face_service = FaceService()
+    face_service = FaceService(index_service.face_collection)
     search_service = SearchService(index_service, face_service)
 
     app.index_service = index_service
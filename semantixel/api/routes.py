@@ -5,16 +5,37 @@ as a Flask :class:`Blueprint`.
 """
 
 import io
+import json
 import os
-from flask import Blueprint, request, jsonify, send_file, send_from_directory, current_app, abort
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    request,
+    send_file,
+    send_from_directory,
+    stream_with_context,
+)
 from semantixel.core.config import config
 from semantixel.core.logging import logger
 from semantixel.core.security import is_safe_path, is_safe_url
 from semantixel.media import describe_local_media, is_media_id, parse_media_id
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 main_bp = Blueprint("main", __name__)
 
 
+def _wants_page(data: dict) -> bool:
+    """Whether a search request asked for a cursor-paginated response."""
+    return bool(data.get("cursor") or data.get("paginate"))
+
+
 def _validate_local_query_path(query: str) -> str:
     """Validate and return the locator for a local query path.
 
@@ -27,6 +48,26 @@ def _validate_local_query_path(query: str) -> str:
     return query_media.locator
 
 
+def _validate_image_query(query: str) -> str:
+    """Validate an image query (URL, media ID or local path) and return it.
+
+    Local paths are stripped of surrounding quotes. Aborts with ``400``
+    for insecure URLs and ``403`` for paths outside the configured
+    directories.
+    """
+    if query.startswith(("http://", "https://")):
+        if not is_safe_url(query):
+            abort(400, "Insecure URL provided.")
+    elif is_media_id(query):
+        media = parse_media_id(query)
+        if media.source == "local":
+            _validate_local_query_path(media.locator)
+    else:
+        query = query.strip('"').strip("'")
+        _validate_local_query_path(query)
+    return query
+
+
 # Search endpoints
 
 
@@ -40,15 +81,27 @@ def clip_text():
         ``top_k`` (int, default 5): Maximum results.
         ``media_type`` (str, default "image"): ``"image"``, ``"video"``,
             ``"audio"``, or ``"all"``.
+        ``paginate`` (bool, optional): Return a page object with a cursor.
+        ``cursor`` (str, optional): ``next_cursor`` of the previous page;
+            the query, threshold and media type are taken from it.
 
     Returns:
-        JSON array of results with metadata.
+        JSON array of results with metadata, or with ``paginate``/``cursor``
+        an object with ``results`` and ``next_cursor``.
     """
     data = request.json or {}
     query = data.get("query", "")
     threshold = float(data.get("threshold", 0))
     top_k = int(data.get("top_k", 5))
     media_type = data.get("media_type", "image")
+    if _wants_page(data):
+        try:
+            page = current_app.search_service.semantic_text_search_page(
+                query, top_k, threshold, media_type, data.get("cursor")
+            )
+        except ValueError as exc:
+            abort(400, str(exc))
+        return jsonify(page)
     results = current_app.search_service.semantic_text_search(query, top_k, threshold, media_type)
     return jsonify(results)
 
@@ -62,9 +115,12 @@ def clip_image():
         ``threshold`` (float, default 0): Minimum similarity.
         ``top_k`` (int, default 5): Maximum results.
         ``media_type`` (str, default "all"): Type filter.
+        ``paginate`` (bool, optional): Return a page object with a cursor.
+        ``cursor`` (str, optional): ``next_cursor`` of the previous page.
 
     Returns:
-        JSON array of similar results, excluding the query itself.
+        JSON array of similar results, excluding the query itself, or with
+        ``paginate``/``cursor`` an object with ``results`` and ``next_cursor``.
     """
     data = request.json or {}
     query = data.get("query", "")
@@ -72,20 +128,27 @@ def clip_image():
     top_k = int(data.get("top_k", 5))
     media_type = data.get("media_type", "all")
 
-    if query.startswith(("http://", "https://")):
-        if not is_safe_url(query):
-            abort(400, "Insecure URL provided.")
-    else:
-        if is_media_id(query):
-            media = parse_media_id(query)
-            if media.source == "local":
-                _validate_local_query_path(media.locator)
-        else:
-            query = query.strip('"').strip("'")
-            _validate_local_query_path(query)
+    if data.get("cursor"):
+        # The cursor's session holds the image embedding; nothing is read from disk.
+        try:
+            page = current_app.search_service.semantic_image_search_page(
+                top_k=top_k, cursor=data["cursor"]
+            )
+        except ValueError as exc:
+            abort(400, str(exc))
+        return jsonify(page)
+
+    query = _validate_image_query(query)
 
     try:
-        results = current_app.search_service.semantic_image_search(query, top_k, threshold, media_type)
+        if _wants_page(data):
+            results = current_app.search_service.semantic_image_search_page(
+                query, top_k, threshold, media_type
+            )
+        else:
+            results = current_app.search_service.semantic_image_search(
+                query, top_k, threshold, media_type
+            )
     except ValueError as exc:
         abort(400, str(exc))
     return jsonify(results)
@@ -140,28 +203,256 @@ def embed_text():
         ``threshold`` (float, default 0.1): Minimum BM25 score.
         ``top_k`` (int, default 5): Maximum results.
         ``media_type`` (str, default "all"): Type filter.
+        ``paginate`` (bool, optional): Return a page object with a cursor.
+        ``cursor`` (str, optional): ``next_cursor`` of the previous page.
 
     Returns:
-        JSON array of keyword-matched results.
+        JSON array of keyword-matched results, or with ``paginate``/``cursor``
+        an object with ``results`` and ``next_cursor``.
     """
     data = request.json or {}
     query = data.get("query", "")
     threshold = float(data.get("threshold", 0.1))
     top_k = int(data.get("top_k", 5))
     media_type = data.get("media_type", "all")
+    if _wants_page(data):
+        try:
+            page = current_app.search_service.keyword_search_page(
+                query, top_k, threshold, media_type, data.get("cursor")
+            )
+        except ValueError as exc:
+            abort(400, str(exc))
+        return jsonify(page)
     results = current_app.search_service.keyword_search(query, top_k, threshold, media_type)
     return jsonify(results)
 
 
+@main_bp.route("/hybrid_search", methods=["POST"])
+def hybrid_search():
+    """Semantic and keyword search fused into a single ranking.
+
+    Request JSON:
+        ``query`` (str): The search phrase.
+        ``threshold`` (float, default 0): Minimum fused score.
+        ``top_k`` (int, default 5): Maximum results.
+        ``media_type`` (str, default "all"): Type filter.
+        ``fusion`` (str, optional): ``"rrf"`` or ``"weighted"``; defaults
+            to ``search.fusion`` from the config.
+
+    Returns:
+        JSON array of results, each with a fused ``score``.
+    """
+    data = request.json or {}
+    query = data.get("query", "")
+    threshold = float(data.get("threshold", 0))
+    top_k = int(data.get("top_k", 5))
+    media_type = data.get("media_type", "all")
+    fusion = data.get("fusion")
+    try:
+        results = current_app.search_service.hybrid_search(
+            query, top_k, threshold, media_type, fusion
+        )
+    except ValueError as exc:
+        abort(400, str(exc))
+    return jsonify(results)
+
+
+@main_bp.route("/batch_search", methods=["POST"])
+def batch_search():
+    """Run many text or image searches in one request.
+
+    All queries share one encoder forward pass and one collection query
+    per modality.
+
+    Request JSON:
+        ``queries`` (list[str]): Text queries, or image paths / media IDs /
+            URLs when ``query_type`` is ``"image"``.
+        ``query_type`` (str, default "text"): ``"text"`` or ``"image"``.
+        ``threshold`` (float, default 0): Minimum similarity score.
+        ``top_k`` (int, default 5): Maximum results per query.
+        ``media_type`` (str): Type filter; defaults to ``"image"`` for text
+            queries and ``"all"`` for image queries, as in ``/clip_text``
+            and ``/clip_image``.
+
+    Returns:
+        JSON array with one result array per query, in request order.
+    """
+    data = request.json or {}
+    queries = data.get("queries", [])
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        abort(400, "queries must be a list of strings.")
+    if len(queries) > config.search.max_batch_queries:
+        abort(400, "At most %d queries per batch." % config.search.max_batch_queries)
+
+    query_type = data.get("query_type", "text")
+    threshold = float(data.get("threshold", 0))
+    top_k = int(data.get("top_k", 5))
+    search_service = current_app.search_service
+    if query_type == "text":
+        media_type = data.get("media_type", "image")
+        results = search_service.batch_text_search(queries, top_k, threshold, media_type)
+    elif query_type == "image":
+        media_type = data.get("media_type", "all")
+        queries = [_validate_image_query(q) for q in queries]
+        try:
+            results = search_service.batch_image_search(queries, top_k, threshold, media_type)
+        except ValueError as exc:
+            abort(400, str(exc))
+    else:
+        abort(400, "query_type must be 'text' or 'image'.")
+    return jsonify(results)
+
+
+@main_bp.route("/stream_search", methods=["POST"])
+def stream_search():
+    """Stream search results as each modality returns.
+
+    Emits one ``partial`` event per source in completion order, then a
+    ``final`` event with the merged ranking. The body is newline-delimited
+    JSON, or server-sent events when ``format`` is ``"sse"`` or the
+    client sends ``Accept: text/event-stream``.
+
+    Request JSON:
+        ``query`` (str): The search phrase.
+        ``mode`` (str, default "semantic"): ``"semantic"`` (CLIP + MiniLM
+            + CLAP) or ``"hybrid"`` (adds BM25 and fuses rankings).
+        ``threshold`` (float, default 0): Minimum score.
+        ``top_k`` (int, default 5): Maximum results per event.
+        ``media_type`` (str, default "image"): Type filter.
+        ``fusion`` (str, optional): Hybrid fusion method.
+        ``format`` (str, optional): ``"ndjson"`` or ``"sse"``.
+
+    Returns:
+        A streamed ``application/x-ndjson`` or ``text/event-stream`` body.
+    """
+    data = request.json or {}
+    query = data.get("query", "")
+    threshold = float(data.get("threshold", 0))
+    top_k = int(data.get("top_k", 5))
+    media_type = data.get("media_type", "image")
+    try:
+        events = current_app.search_service.stream_search(
+            query,
+            top_k,
+            threshold,
+            media_type,
+            mode=data.get("mode", "semantic"),
+            fusion=data.get("fusion"),
+        )
+    except ValueError as exc:
+        abort(400, str(exc))
+
+    use_sse = data.get("format") == "sse" or (
+        "format" not in data
+        and request.accept_mimetypes.best == "text/event-stream"
+    )
+
+    def generate():
+        """Serialise each event as an NDJSON line or an SSE frame."""
+        for event in events:
+            payload = json.dumps(event)
+            if use_sse:
+                yield "event: %s\ndata: %s\n\n" % (event["event"], payload)
+            else:
+                yield payload + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@main_bp.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    """Return hit/miss counters of the search caches.
+
+    Returns:
+        JSON object with one counter block per cache.
+    """
+    return jsonify(current_app.search_service.cache_stats())
+
+
+def _json_response(payload) -> Response:
+    """Serialise a large JSON payload, with ``orjson`` when it is installed."""
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, separators=(",", ":"))
+    return Response(body, mimetype="application/json")
+
+
+def _graph_response(build, variant: str = "") -> Response:
+    """Serve a view of the stored graph with ``ETag`` revalidation.
+
+    Args:
+        build: Callable returning the JSON payload and the ETag of the
+            stored graph it was built from.
+        variant: Suffix distinguishing views of the same stored graph.
+
+    Returns:
+        The JSON response, or ``304 Not Modified`` when the client's
+        ``If-None-Match`` matches.
+    """
+    etag = current_app.search_service.graph_etag()
+    if etag is not None and request.if_none_match.contains(etag + variant):
+        response = Response(status=304)
+        response.set_etag(etag + variant)
+        return response
+
+    payload, etag = build()
+    response = _json_response(payload)
+    if etag is not None:
+        response.set_etag(etag + variant)
+    return response
+
+
 @main_bp.route("/graph_data", methods=["GET"])
 def graph_data():
-    """Return the full semantic similarity graph.
+    """Return the semantic similarity graph.
+
+    The graph is served from its persisted copy with an ``ETag``; a
+    request whose ``If-None-Match`` matches gets ``304 Not Modified``.
+
+    Query params:
+        ``level`` (int, optional): Return the clusters at this level of
+            detail instead of every item.
 
     Returns:
         JSON object with ``nodes`` and ``links`` arrays.
     """
-    results = current_app.search_service.generate_graph_data()
-    return jsonify(results)
+    search_service = current_app.search_service
+    level = request.args.get("level")
+    if level is None:
+        return _graph_response(search_service.generate_graph_data)
+    try:
+        level = int(level)
+    except ValueError:
+        abort(400, "level must be an integer.")
+    if level < 0:
+        abort(400, "level must be >= 0.")
+    return _graph_response(
+        lambda: search_service.generate_graph_level(level), "-level-%d" % level
+    )
+
+
+@main_bp.route("/graph_cluster/<cluster_id>", methods=["GET"])
+def graph_cluster(cluster_id):
+    """Expand one cluster of a level-of-detail graph.
+
+    Returns:
+        JSON object with the ``cluster`` ID and its ``nodes`` (sub-clusters,
+        or media items for a leaf) and ``links``.
+    """
+    search_service = current_app.search_service
+
+    def build():
+        try:
+            return search_service.expand_graph_cluster(cluster_id)
+        except KeyError:
+            abort(404, "Unknown cluster.")
+
+    return _graph_response(build, "-cluster-%s" % cluster_id)
 
 
 @main_bp.route("/subgraph_data", methods=["POST"])
@@ -177,7 +468,7 @@ def subgraph_data():
     data = request.json or {}
     ids = data.get("ids", [])
     results = current_app.search_service.generate_subgraph_data(ids)
-    return jsonify(results)
+    return _json_response(results)
 
 
 # Google Drive OAuth endpoints
@@ -7,11 +7,31 @@ first import; call :func:`reload_config` to re-read the YAML file.
 
 import os
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class BM25Config(BaseModel):
+    """Analyzer settings for the BM25 keyword index.
+
+    Changing any of these triggers a keyword-index rebuild on the next scan.
+
+    Attributes:
+        fold_accents: Strip accents during normalisation (``"café"`` → ``"cafe"``).
+        min_token_length: Drop tokens shorter than this.
+        ngram_max: Longest character n-gram added per token (0 disables n-grams).
+        ngram_min: Shortest character n-gram added per token.
+        stemming: Apply the light English stemmer.
+    """
+
+    fold_accents: bool = True
+    min_token_length: int = 1
+    ngram_max: int = 0
+    ngram_min: int = 3
+    stemming: bool = False
+
+
 class CLIPConfig(BaseModel):
     """Settings for the CLIP image/text embedding provider.
 
@@ -72,6 +92,24 @@ class AudioConfig(BaseModel):
     transcription_max_duration: float = 60.0
 
 
+class FaceConfig(BaseModel):
+    """Settings for face detection and the persisted face index.
+
+    Attributes:
+        enabled: Detect and embed faces during scans.
+        model_name: DeepFace recognition model used for embeddings.
+        detector_backend: DeepFace face detector backend.
+        min_confidence: Discard detections below this detector confidence.
+        max_matches: Maximum face neighbours fetched per name search.
+    """
+
+    enabled: bool = True
+    model_name: str = "Facenet"
+    detector_backend: str = "opencv"
+    min_confidence: float = 0.5
+    max_matches: int = 1000
+
+
 class GoogleDriveConfig(BaseModel):
     """Settings for Google Drive integration.
 
@@ -105,6 +143,174 @@ class GoogleDriveConfig(BaseModel):
     )
 
 
+class GraphConfig(BaseModel):
+    """Settings for the level-of-detail semantic graph.
+
+    Attributes:
+        branching: Sub-clusters each cluster is split into.
+        leaf_size: Clusters with at most this many items are not split
+            further; expanding one returns its items.
+        max_links: Most links returned by a level or cluster view; the
+            links aggregating the most item edges are kept.
+    """
+
+    branching: int = 16
+    leaf_size: int = 256
+    max_links: int = 5000
+
+
+class GrpcConfig(BaseModel):
+    """Settings for the gRPC inference server.
+
+    Attributes:
+        max_batch_size: Maximum inputs coalesced into one forward pass.
+        max_wait_ms: Longest time a request waits for others to batch with.
+    """
+
+    max_batch_size: int = 32
+    max_wait_ms: float = 5.0
+
+
+class PipelineConfig(BaseModel):
+    """Settings for the staged image indexing pipeline.
+
+    Attributes:
+        decode_workers: Threads decoding images and extracting video frames.
+        queue_depth: Batches buffered between consecutive stages.
+    """
+
+    decode_workers: int = 4
+    queue_depth: int = 4
+
+
+class CursorCacheConfig(BaseModel):
+    """Settings for the paging sessions behind search cursors.
+
+    Attributes:
+        max_entries: Sessions kept in memory.  With ``0`` text and keyword
+            cursors re-rank from the top on every page and image-search
+            cursors cannot be followed.
+        ttl_seconds: Idle time after which a session expires (``0`` keeps
+            sessions until evicted).
+    """
+
+    max_entries: int = 256
+    ttl_seconds: float = 600.0
+
+
+class EmbeddingCacheConfig(BaseModel):
+    """Settings for the query-embedding cache.
+
+    Attributes:
+        disk_enabled: Also persist query embeddings to
+            ``db/query_embeddings.sqlite3`` so they survive restarts.
+        max_entries: Embeddings kept in the in-memory LRU (``0`` disables
+            the memory tier).
+        ttl_seconds: Age after which a cached embedding is recomputed
+            (``0`` keeps entries until evicted).
+    """
+
+    disk_enabled: bool = False
+    max_entries: int = 1024
+    ttl_seconds: float = 3600.0
+
+
+class ResultCacheConfig(BaseModel):
+    """Settings for the search result cache.
+
+    Attributes:
+        max_entries: Result lists kept in memory (``0`` disables the cache).
+        ttl_seconds: Age after which a cached result list is recomputed
+            (``0`` keeps entries until the index generation changes).
+    """
+
+    max_entries: int = 512
+    ttl_seconds: float = 300.0
+
+
+class SearchConfig(BaseModel):
+    """Settings for query-time search and hybrid result fusion.
+
+    Attributes:
+        cursor_cache: Paging session settings for cursor pagination.
+        embedding_cache: Query-embedding cache settings.
+        fusion: Default hybrid fusion method, ``"rrf"`` (reciprocal rank
+            fusion) or ``"weighted"`` (weighted sum of normalised scores).
+        max_batch_queries: Most queries accepted by one batch search.
+        max_workers: Threads running per-modality queries concurrently,
+            shared by all requests.
+        overfetch_factor: Neighbours first requested per result slot
+            (``top_k * overfetch_factor``) before deduplication.
+        overfetch_growth: Multiplier applied to ``n_results`` each time a
+            filtered page comes back short.
+        overfetch_max_factor: Cap on ``n_results`` as a multiple of ``top_k``.
+        result_cache: Search result cache settings.
+        rrf_k: Rank offset ``k`` in the RRF contribution ``1 / (k + rank)``.
+        timeout_seconds: Time each search source (modality query or BM25
+            lookup) may take before it is dropped from the results;
+            ``0`` waits indefinitely.
+        timeouts: Per-source overrides of ``timeout_seconds`` keyed by
+            ``clip``, ``minilm``, ``clap`` or ``bm25``.
+        weights: Per-source fusion weight (``clip``, ``minilm``, ``clap``,
+            ``bm25``); sources not listed get ``1.0``.
+    """
+
+    cursor_cache: CursorCacheConfig = Field(default_factory=CursorCacheConfig)
+    embedding_cache: EmbeddingCacheConfig = Field(default_factory=EmbeddingCacheConfig)
+    fusion: str = "rrf"
+    max_batch_queries: int = 64
+    max_workers: int = 8
+    overfetch_factor: int = 3
+    overfetch_growth: int = 4
+    overfetch_max_factor: int = 100
+    result_cache: ResultCacheConfig = Field(default_factory=ResultCacheConfig)
+    rrf_k: int = 60
+    timeout_seconds: float = 10.0
+    timeouts: Dict[str, float] = Field(default_factory=dict)
+    weights: Dict[str, float] = Field(default_factory=dict)
+
+
+class IVFPQConfig(BaseModel):
+    """Settings for the optional IVF-PQ index over flat-backend collections.
+
+    Attributes:
+        collections: Flat-backend collections that get an IVF-PQ index.
+        enabled: Use the trained index for unfiltered queries.
+        m: PQ sub-quantisers (bytes per vector code).
+        nlist: Number of inverted lists (coarse k-means clusters).
+        nprobe: Inverted lists scanned per query.
+        rerank: Candidates re-ranked exactly against the raw vectors.
+        train_sample: Maximum vectors sampled for k-means training.
+    """
+
+    collections: List[str] = Field(default_factory=lambda: ["images"])
+    enabled: bool = False
+    m: int = 64
+    nlist: int = 4096
+    nprobe: int = 32
+    rerank: int = 256
+    train_sample: int = 200000
+
+
+class VectorStoreConfig(BaseModel):
+    """Settings selecting and tuning the vector backend per collection.
+
+    Attributes:
+        backends: Backend per collection name (``"chroma"`` or ``"flat"``);
+            collections not listed use ChromaDB.
+        flat_block_size: Rows scored per matrix-multiply block by the
+            flat backend.
+        flat_dtype: Storage dtype for flat-backend embeddings
+            (``"float16"`` or ``"float32"``).
+        ivfpq: Compressed approximate index settings.
+    """
+
+    backends: Dict[str, str] = Field(default_factory=dict)
+    flat_block_size: int = 65536
+    flat_dtype: str = "float16"
+    ivfpq: IVFPQConfig = Field(default_factory=IVFPQConfig)
+
+
 class SemantixelConfig(BaseSettings):
     """Root configuration model for the Semantixel application.
 
@@ -114,28 +320,43 @@ class SemantixelConfig(BaseSettings):
     Attributes:
         audio: Audio processing settings.
         batch_size: Number of items to process in a single model batch.
+        bm25: Keyword index analyzer settings.
         clip: CLIP model settings.
-        deep_scan: Re-index even if entry already exists.
+        deep_scan: Re-index every item even if its scan-manifest entry is
+            unchanged.
         exclude_directories: Glob patterns / paths to skip during scan.
+        face: Face detection and indexing settings.
         google_drive: Google Drive integration settings.
+        graph: Level-of-detail semantic graph settings.
+        grpc: gRPC inference server settings.
         include_directories: Directories to include in the scan.
         ocr_provider: Active OCR provider name (``"doctr"``).
+        pipeline: Indexing pipeline concurrency settings.
         port: Port for the Flask web server.
         scan_method: Scan strategy (reserved).
+        search: Query-time search and hybrid fusion settings.
         text_embed: Text embedding settings.
+        vector_store: Vector backend selection per collection.
     """
 
     audio: AudioConfig = Field(default_factory=AudioConfig)
     batch_size: int = 16
+    bm25: BM25Config = Field(default_factory=BM25Config)
     clip: CLIPConfig = Field(default_factory=CLIPConfig)
-    deep_scan: bool = True
+    deep_scan: bool = False
     exclude_directories: List[str] = Field(default_factory=list)
+    face: FaceConfig = Field(default_factory=FaceConfig)
     google_drive: GoogleDriveConfig = Field(default_factory=GoogleDriveConfig)
+    graph: GraphConfig = Field(default_factory=GraphConfig)
+    grpc: GrpcConfig = Field(default_factory=GrpcConfig)
     include_directories: List[str] = Field(default_factory=list)
     ocr_provider: str = "doctr"
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
     port: int = 23107
     scan_method: str = "default"
+    search: SearchConfig = Field(default_factory=SearchConfig)
     text_embed: TextEmbedConfig = Field(default_factory=TextEmbedConfig)
+    vector_store: VectorStoreConfig = Field(default_factory=VectorStoreConfig)
 
     model_config = SettingsConfigDict(
         env_prefix="SEMANTIXEL_",
@@ -7,16 +7,20 @@
 
 import io
 import signal
+import threading
 from concurrent import futures
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import grpc
 from PIL import Image
 
+from semantixel.core.config import config
 from semantixel.core.logging import logger
 from semantixel import semantixel_inference_pb2
 from semantixel import semantixel_inference_pb2_grpc
+from semantixel.services.micro_batcher import MicroBatcher
 from semantixel.services.model_manager import model_manager
+from semantixel.services.search_cursor import result_score
 
 
 class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceServicer):
@@ -24,14 +28,50 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
 
     Delegates all ML operations to the shared ModelManager singleton
     so that models are loaded at most once regardless of access layer
-    (Flask REST or gRPC).
+    (Flask REST or gRPC).  Concurrent requests are coalesced by
+    :class:`MicroBatcher` instances so that many single-input RPCs
+    share one forward pass.  The search service backing
+    ``HybridSearch`` is created on first use, so inference-only
+    deployments never open the vector store.
     """
 
     def __init__(self) -> None:
-        """Initialise servicer with shared model providers."""
+        """Initialise servicer with shared model providers and batchers."""
         self._clip = model_manager.clip
         self._ocr = model_manager.ocr
 
+        batching = config.grpc
+        self._image_batcher = MicroBatcher(
+            "clip_image",
+            lambda images, _key: self._clip.get_image_embeddings(images),
+            batching.max_batch_size,
+            batching.max_wait_ms,
+        )
+        self._text_batcher = MicroBatcher(
+            "clip_text",
+            lambda texts, _key: self._clip.get_text_embeddings_batch(texts),
+            batching.max_batch_size,
+            batching.max_wait_ms,
+        )
+        self._ocr_batcher = MicroBatcher(
+            "ocr",
+            lambda images, threshold: self._ocr.apply_ocr(images, threshold=threshold),
+            batching.max_batch_size,
+            batching.max_wait_ms,
+        )
+        self._search_service = None
+        self._search_lock = threading.Lock()
+
+    @property
+    def batchers(self) -> List[MicroBatcher]:
+        """All request coalescers owned by this servicer."""
+        return [self._image_batcher, self._text_batcher, self._ocr_batcher]
+
+    def close(self) -> None:
+        """Stop the batcher worker threads."""
+        for batcher in self.batchers:
+            batcher.close()
+
     def _decode_images(
         self,
         blobs: List[bytes],
@@ -57,6 +97,36 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
                 )
         return images
 
+    def _get_search_service(self):
+        """Return the shared SearchService, creating it on first call."""
+        with self._search_lock:
+            if self._search_service is None:
+                from semantixel.services.face_service import FaceService
+                from semantixel.services.index_service import IndexService
+                from semantixel.services.search_service import SearchService
+
+                index_service = IndexService()
+                face_service = FaceService(index_service.face_collection)
+                self._search_service = SearchService(index_service, face_service)
+            return self._search_service
+
+    @staticmethod
+    def _to_search_result(
+        result: Dict[str, Any],
+    ) -> semantixel_inference_pb2.SearchResult:
+        """Convert a search result dict into a ``SearchResult`` message."""
+        message = semantixel_inference_pb2.SearchResult(
+            media_id=result.get("media_id") or "",
+            source=result.get("source") or "",
+            path=result.get("path") or "",
+            type=result.get("type") or "",
+            composite_id=result.get("composite_id") or "",
+            score=result_score(result) or 0.0,
+        )
+        if result.get("timestamp") is not None:
+            message.timestamp = result["timestamp"]
+        return message
+
     def _clip_model_name(self) -> str:
         """Return the active CLIP model checkpoint name."""
         return getattr(self._clip, "checkpoint", "unknown")
@@ -88,7 +158,7 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
             context.abort(grpc.StatusCode.INVALID_ARGUMENT, "No images provided")
 
         pil_images = self._decode_images(request.images, context)
-        embeddings = self._clip.get_image_embeddings(pil_images)
+        embeddings = self._image_batcher.submit(pil_images)
         proto_embeddings = [
             semantixel_inference_pb2.Embedding(values=emb) for emb in embeddings
         ]
@@ -110,6 +180,8 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
     ) -> semantixel_inference_pb2.EmbedTextResponse:
         """Produce L2-normalised CLIP embeddings for one or more texts.
 
+        All texts in the request are encoded in a single forward pass.
+
         Args:
             request: Contains text strings to embed (batched).
             context: gRPC context for error reporting.
@@ -122,10 +194,8 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
             context.abort(grpc.StatusCode.INVALID_ARGUMENT, "No texts provided")
 
         embeddings = [
-            semantixel_inference_pb2.Embedding(
-                values=self._clip.get_text_embeddings(t),
-            )
-            for t in request.texts
+            semantixel_inference_pb2.Embedding(values=emb)
+            for emb in self._text_batcher.submit(list(request.texts))
         ]
 
         dim = len(embeddings[0].values) if embeddings else 0
@@ -167,13 +237,135 @@ class InferenceServicer(semantixel_inference_pb2_grpc.SemantixelInferenceService
             thresh = 0.4
 
         pil_images = self._decode_images(request.images, context)
-        texts = self._ocr.apply_ocr(pil_images, threshold=thresh)
+        texts = self._ocr_batcher.submit(pil_images, key=thresh)
         cleaned = [t if t is not None else "" for t in texts]
         results = [
             semantixel_inference_pb2.OCRResult(text=t) for t in cleaned
         ]
         return semantixel_inference_pb2.ExtractOCRResponse(results=results)
 
+    #  GetInferenceStats 
+
+    def GetInferenceStats(
+        self,
+        request: semantixel_inference_pb2.InferenceStatsRequest,
+        context: grpc.ServicerContext,
+    ) -> semantixel_inference_pb2.InferenceStatsResponse:
+        """Report queue depth and batch-size histograms per batcher.
+
+        Args:
+            request: Empty stats request.
+            context: gRPC context for error reporting.
+
+        Returns:
+            InferenceStatsResponse with one BatcherStats per batcher.
+        """
+        batchers = []
+        for batcher in self.batchers:
+            stats = batcher.stats()
+            batchers.append(
+                semantixel_inference_pb2.BatcherStats(
+                    name=stats["name"],
+                    queue_depth=stats["queue_depth"],
+                    batches=stats["batches"],
+                    items=stats["items"],
+                    batch_size_histogram=stats["batch_size_histogram"],
+                )
+            )
+        return semantixel_inference_pb2.InferenceStatsResponse(batchers=batchers)
+
+    #  HybridSearch 
+
+    def HybridSearch(
+        self,
+        request: semantixel_inference_pb2.HybridSearchRequest,
+        context: grpc.ServicerContext,
+    ) -> semantixel_inference_pb2.HybridSearchResponse:
+        """Run a fused semantic + keyword search over the local index.
+
+        Args:
+            request: Query, result limit, threshold, media type and
+                     optional fusion method.
+            context: gRPC context for error reporting.
+
+        Returns:
+            HybridSearchResponse with results by descending fused score.
+        """
+        if not request.query.strip():
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "No query provided")
+        if request.top_k < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "top_k must be >= 0")
+
+        fusion = request.fusion or config.search.fusion
+        try:
+            results = self._get_search_service().hybrid_search(
+                request.query,
+                top_k=request.top_k or 5,
+                threshold=request.threshold,
+                media_type=request.media_type or "all",
+                fusion=fusion,
+            )
+        except ValueError as exc:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(exc))
+
+        return semantixel_inference_pb2.HybridSearchResponse(
+            results=[self._to_search_result(r) for r in results],
+            fusion=fusion,
+        )
+
+    #  BatchSearch 
+
+    def BatchSearch(
+        self,
+        request: semantixel_inference_pb2.BatchSearchRequest,
+        context: grpc.ServicerContext,
+    ) -> semantixel_inference_pb2.BatchSearchResponse:
+        """Run many text or image searches in one call.
+
+        Args:
+            request: Text queries or raw query images (not both), plus
+                     result limit, threshold and media type.
+            context: gRPC context for error reporting.
+
+        Returns:
+            BatchSearchResponse with one QueryResults per query, in order.
+        """
+        if bool(request.texts) == bool(request.images):
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Provide either texts or images",
+            )
+        count = len(request.texts) or len(request.images)
+        if count > config.search.max_batch_queries:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"At most {config.search.max_batch_queries} queries per batch",
+            )
+        if request.top_k < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "top_k must be >= 0")
+
+        search_service = self._get_search_service()
+        top_k = request.top_k or 5
+        media_type = request.media_type or "all"
+        if request.texts:
+            batches = search_service.batch_text_search(
+                list(request.texts), top_k, request.threshold, media_type
+            )
+        else:
+            pil_images = self._decode_images(request.images, context)
+            batches = search_service.batch_image_search(
+                pil_images, top_k, request.threshold, media_type
+            )
+
+        return semantixel_inference_pb2.BatchSearchResponse(
+            queries=[
+                semantixel_inference_pb2.QueryResults(
+                    results=[self._to_search_result(r) for r in results]
+                )
+                for results in batches
+            ]
+        )
+
     #  HealthCheck 
 
     def HealthCheck(
@@ -235,6 +427,7 @@ class GrpcInferenceServer:
         self.port = port
         self.max_workers = max_workers
         self._server: Optional[grpc.aio.Server] = None
+        self._servicer: Optional[InferenceServicer] = None
 
     @property
     def address(self) -> str:
@@ -247,8 +440,9 @@ class GrpcInferenceServer:
             futures.ThreadPoolExecutor(max_workers=self.max_workers),
         )
 
+        self._servicer = InferenceServicer()
         semantixel_inference_pb2_grpc.add_SemantixelInferenceServicer_to_server(
-            InferenceServicer(),
+            self._servicer,
             self._server,
         )
 
@@ -272,6 +466,8 @@ class GrpcInferenceServer:
             return
         logger.info("Shutting down gRPC Inference Server...")
         await self._server.stop(grace)
+        if self._servicer is not None:
+            self._servicer.close()
         model_manager.unload_all()
         logger.info("gRPC Inference Server stopped")
 
@@ -13,6 +13,7 @@ uniform representation used throughout the indexing and search pipeline.
 """
 
 import base64
+import functools
 import os
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
@@ -31,8 +32,12 @@ def _b64_encode(value: str) -> str:
     )
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def _b64_decode(value: str) -> str:
-    """URL-safe base64 decode (with padding restoration)."""
+    """URL-safe base64 decode (with padding restoration).
+
+    Memoised because every frame of a video shares the same locator.
+    """
     padding = "=" * (-len(value) % 4)
     return base64.urlsafe_b64decode((value + padding).encode("ascii")).decode("utf-8")
 
@@ -106,6 +106,34 @@ class HFAudioCLAPProvider(BaseModelProvider):
             logger.error("Error getting CLAP text embedding for '%s': %s", text, exc)
             return [0.0] * 512
 
+    def get_text_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Compute L2-normalised CLAP text embeddings in one forward pass.
+
+        Args:
+            texts: Text queries describing sounds.
+
+        Returns:
+            One 512-dimensional embedding vector per query, in input order.
+        """
+        if not texts:
+            return []
+        if not self.is_loaded:
+            self.load()
+
+        try:
+            inputs = self.processor(
+                text=list(texts), padding=True, return_tensors="pt"
+            ).to(self.device)
+            with torch.no_grad():
+                outputs = self.model.get_text_features(**inputs)
+                embeddings = unwrap_output(outputs)
+
+            embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
+            return embeddings.cpu().numpy().tolist()
+        except Exception as exc:
+            logger.error("Error getting CLAP text embeddings for %d texts: %s", len(texts), exc)
+            return [[0.0] * 512 for _ in texts]
+
     def unload(self):
         """Unload model and free GPU memory."""
         if self.is_loaded:
@@ -53,6 +53,20 @@ class CLIPProvider(BaseModelProvider):
             L2-normalised embedding vector.
         """
 
+    def get_text_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several text queries, preserving input order.
+
+        The default implementation calls :meth:`get_text_embeddings` once
+        per text; providers should override it with a true batched forward.
+
+        Args:
+            texts: Query strings.
+
+        Returns:
+            One L2-normalised embedding vector per input text.
+        """
+        return [self.get_text_embeddings(text) for text in texts]
+
 
 class OCRProvider(BaseModelProvider):
     """Interface for OCR / text-extraction providers."""
@@ -86,6 +100,20 @@ class TextEmbeddingProvider(BaseModelProvider):
             Dense embedding vector.
         """
 
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, preserving input order.
+
+        The default implementation calls :meth:`get_embeddings` once per
+        text; providers should override it with a true batched forward.
+
+        Args:
+            texts: Input texts.
+
+        Returns:
+            One dense embedding vector per input text.
+        """
+        return [self.get_embeddings(text) for text in texts]
+
 
 class AudioProvider(BaseModelProvider):
     """Interface for audio transcription providers (e.g. Whisper)."""
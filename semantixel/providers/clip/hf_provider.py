@@ -96,10 +96,26 @@ class HFCLIPProvider(CLIPProvider):
         Returns:
             An embedding vector as a Python ``float`` list.
         """
+        return self.get_text_embeddings_batch([text])[0]
+
+    def get_text_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Compute L2-normalised CLIP text embeddings in one forward pass.
+
+        Args:
+            texts: The text queries.
+
+        Returns:
+            One embedding vector per query, in input order.
+        """
+        if not texts:
+            return []
+
         self.load()
         with torch.no_grad():
-            inputs = self.processor(text=[text], return_tensors="pt").to(self.device)
+            inputs = self.processor(
+                text=list(texts), padding=True, truncation=True, return_tensors="pt"
+            ).to(self.device)
             outputs = self.model.get_text_features(**inputs)
             text_features = unwrap_output(outputs)
             text_features = text_features / text_features.norm(p=2, dim=-1, keepdim=True)
-        return text_features.cpu()[0].tolist()
+        return [feat.tolist() for feat in text_features.cpu()]
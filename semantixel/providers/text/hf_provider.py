@@ -17,6 +17,8 @@ class HFTextEmbeddingProvider(TextEmbeddingProvider):
     checkpoint) with mean-pooling and L2 normalisation.
     """
 
+    MAX_BATCH_SIZE = 64
+
     def __init__(self, checkpoint: str = "sentence-transformers/all-MiniLM-L6-v2"):
         self.checkpoint = checkpoint
         self.tokenizer: Optional[AutoTokenizer] = None
@@ -79,3 +81,43 @@ class HFTextEmbeddingProvider(TextEmbeddingProvider):
         sentence_embeddings = self._mean_pooling(model_output, encoded_input["attention_mask"])
         sentence_embeddings = torch.nn.functional.normalize(sentence_embeddings, p=2, dim=1)
         return sentence_embeddings[0].tolist()
+
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Compute mean-pooled, L2-normalised embeddings for many texts.
+
+        Texts are sorted by length and split into sub-batches of at most
+        ``MAX_BATCH_SIZE`` so each forward pass pads only to the longest
+        text of similar length.  Results are returned in input order.
+
+        Args:
+            texts: Input texts to embed.
+
+        Returns:
+            One dense embedding vector per input text.
+        """
+        if not texts:
+            return []
+
+        self.load()
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        for start in range(0, len(order), self.MAX_BATCH_SIZE):
+            chunk = order[start:start + self.MAX_BATCH_SIZE]
+            encoded_input = self.tokenizer(
+                [texts[i] for i in chunk],
+                padding=True,
+                truncation=True,
+                return_tensors="pt",
+            ).to(self.device)
+
+            with torch.no_grad():
+                model_output = self.model(**encoded_input)
+
+            embeddings = self._mean_pooling(model_output, encoded_input["attention_mask"])
+            embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1).cpu()
+            for i, embedding in zip(chunk, embeddings):
+                results[i] = embedding.tolist()
+
+        return results
@@ -1,11 +1,12 @@
 """Audio indexing service for transcription and CLAP embedding."""
 
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 from tqdm import tqdm
 from semantixel.core.config import config
 from semantixel.core.logging import logger
 from semantixel.media import MediaDescriptor
 from semantixel.media_types import (is_audio_file as path_is_audio_file,is_video_file as path_is_video_file,)
+from semantixel.services.collection_utils import find_existing_ids
 
 
 class AudioIndexer:
@@ -20,6 +21,10 @@ class AudioIndexer:
     def __init__(self, text_collection, audio_collection):
         self.text_collection = text_collection
         self.audio_collection = audio_collection
+        self._indexed_transcripts: set = set()
+        self._indexed_ambient: set = set()
+        self._pending_transcripts: List[Tuple[str, str, dict]] = []
+        self._failed: Set[str] = set()
 
     def is_audio_file(self, path: str) -> bool:
         """Check whether *path* is a supported audio format."""
@@ -33,22 +38,29 @@ class AudioIndexer:
         self,
         audio_items: List[MediaDescriptor],
         pbar: Optional[tqdm] = None,
-    ) -> None:
+    ) -> Set[str]:
         """Transcribe and/or embed audio items.
 
         Args:
             audio_items: Media descriptors for audio files and videos
                 (videos may contain audio tracks).
             pbar: Optional progress bar to update.
+
+        Returns:
+            Media IDs whose transcription or CLAP embedding failed.
         """
         audio_config = config.audio
         if not audio_config.enabled:
             if pbar:
                 pbar.update(len(audio_items))
-            return
+            return set()
 
         from semantixel.services.model_manager import model_manager
 
+        self._load_index_state(audio_items)
+        self._pending_transcripts = []
+        self._failed = set()
+
         for media in audio_items:
             is_video = self.is_video_file(media.locator)
             derived_type = "video" if is_video else "audio"
@@ -70,8 +82,26 @@ class AudioIndexer:
             if pbar:
                 pbar.update(1)
 
+        self._flush_transcripts(model_manager)
+        return self._failed
+
     # Internal helpers
 
+    def _load_index_state(self, audio_items: List[MediaDescriptor]) -> None:
+        """Bulk-load which transcript and ambient entries already exist."""
+        try:
+            self._indexed_transcripts = find_existing_ids(
+                self.text_collection, [f"{m.media_id}:::audio" for m in audio_items]
+            )
+        except Exception:
+            self._indexed_transcripts = set()
+        try:
+            self._indexed_ambient = find_existing_ids(
+                self.audio_collection, [f"{m.media_id}:::ambient" for m in audio_items]
+            )
+        except Exception:
+            self._indexed_ambient = set()
+
     def _exceeds_max_duration(self, media: MediaDescriptor) -> bool:
         """Return ``True`` if the file exceeds the configured max duration.
 
@@ -96,15 +126,9 @@ class AudioIndexer:
     def _index_transcription(
         self, media: MediaDescriptor, derived_type: str, model_manager
     ) -> None:
-        """Transcribe and embed speech, then upsert into the text collection."""
+        """Transcribe speech and queue the transcript for batched embedding."""
         transcript_id = f"{media.media_id}:::audio"
-
-        try:
-            existing = self.text_collection.get(ids=[transcript_id])
-        except Exception:
-            existing = {"ids": []}
-
-        if existing["ids"]:
+        if transcript_id in self._indexed_transcripts:
             return
 
         try:
@@ -115,45 +139,56 @@ class AudioIndexer:
             logger.warning(
                 "Transcription failed for %s: %s", media.display_path, exc
             )
-            transcript = None
+            self._failed.add(media.media_id)
+            return
 
         if not (transcript and transcript.strip()):
             return
 
+        self._pending_transcripts.append((
+            transcript_id,
+            transcript,
+            {
+                "source": media.source,
+                "source_media_id": media.media_id,
+                "locator": media.locator,
+                "display_path": media.display_path,
+                "type": derived_type,
+                "subtype": "transcript",
+            },
+        ))
+        if len(self._pending_transcripts) >= config.batch_size:
+            self._flush_transcripts(model_manager)
+
+    def _flush_transcripts(self, model_manager) -> None:
+        """Embed pending transcripts in one batch and upsert them together."""
+        if not self._pending_transcripts:
+            return
+
+        ids, documents, metadatas = zip(*self._pending_transcripts)
+        self._pending_transcripts = []
         try:
-            text_embedding = model_manager.text_embed.get_embeddings(transcript)
+            embeddings = model_manager.text_embed.get_embeddings_batch(list(documents))
             self.text_collection.upsert(
-                ids=[transcript_id],
-                embeddings=[text_embedding],
-                metadatas=[{
-                    "source": media.source,
-                    "source_media_id": media.media_id,
-                    "locator": media.locator,
-                    "display_path": media.display_path,
-                    "type": derived_type,
-                    "subtype": "transcript",
-                }],
-                documents=[transcript],
+                ids=list(ids),
+                embeddings=embeddings,
+                metadatas=list(metadatas),
+                documents=list(documents),
             )
         except Exception as exc:
             logger.warning(
-                "Transcript embedding/indexing failed for %s: %s",
-                media.display_path,
+                "Transcript embedding/indexing failed for %d items: %s",
+                len(ids),
                 exc,
             )
+            self._failed.update(m["source_media_id"] for m in metadatas)
 
     def _index_ambient(
         self, media: MediaDescriptor, derived_type: str, model_manager
     ) -> None:
         """Embed ambient audio via CLAP and upsert into the audio collection."""
         ambient_id = f"{media.media_id}:::ambient"
-
-        try:
-            existing = self.audio_collection.get(ids=[ambient_id])
-        except Exception:
-            existing = {"ids": []}
-
-        if existing["ids"]:
+        if ambient_id in self._indexed_ambient:
             return
 
         try:
@@ -162,6 +197,7 @@ class AudioIndexer:
             logger.warning(
                 "CLAP embedding failed for %s: %s", media.display_path, exc
             )
+            self._failed.add(media.media_id)
             return
 
         self.audio_collection.upsert(
@@ -0,0 +1,645 @@
+"""Sparse inverted index with Okapi BM25 scoring.
+
+Postings are stored as CSR arrays (``indptr`` per term, then parallel
+``doc_idx`` / ``tf`` arrays) together with document frequencies and
+document lengths.  A query only touches the postings of its own terms
+and selects the top-k with ``argpartition`` instead of scoring and
+sorting the whole corpus.
+
+The index supports incremental updates: new documents go to a small
+in-memory *delta* segment and deletions only set a tombstone, so a
+rescan that touches a handful of files does not pay an O(corpus) cost.
+:meth:`InvertedIndex.compact` periodically merges the delta into the
+main CSR segment and drops tombstoned documents.
+
+:meth:`InvertedIndex.save` writes versioned directories of plain
+``.npy`` arrays that :meth:`InvertedIndex.load` opens with
+``np.load(mmap_mode=...)``, so loading does not deserialise the corpus.
+The main segment (term dictionary, postings, document lengths, ...) is
+immutable between compactions and shared by every generation saved in
+the meantime; a generation only adds the delta segment and the
+tombstone bitmap.  The term dictionary is kept sorted and looked up by
+binary search directly on the mapped bytes.
+
+Documents and queries are passed as arrays of interned integer term IDs
+(see :meth:`InvertedIndex.intern`), so postings are computed with
+vectorised NumPy operations rather than per-token Python dicts.
+
+Scores match ``rank_bm25.BM25Okapi`` (``k1=1.5``, ``b=0.75``,
+``epsilon=0.25``), including its floor for negative IDF values.  As in
+Lucene, collection statistics (document count, document frequencies,
+average length) include tombstoned documents until the next compaction.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+MEDIA_TYPE_CODES = {"image": 0, "video": 1, "audio": 2, "unknown": 3}
+FORMAT_NAME = "semantixel-bm25"
+FORMAT_VERSION = 2
+
+
+class StringTable:
+    """Immutable sequence of strings stored as UTF-8 bytes plus offsets.
+
+    Both arrays may be memory-mapped; strings are decoded on access.
+    """
+
+    def __init__(self, blob: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None):
+        self.blob = blob if blob is not None else np.zeros(0, dtype=np.uint8)
+        self.offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[Optional[str]]) -> "StringTable":
+        """Encode *strings* (``None`` is stored as an empty string)."""
+        encoded = [(s or "").encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    @classmethod
+    def load(cls, path: str, name: str, mmap_mode: Optional[str] = "r") -> "StringTable":
+        """Open ``<name>.bin.npy`` / ``<name>.offsets.npy`` from *path*."""
+        return cls(
+            np.load(os.path.join(path, name + ".bin.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, name + ".offsets.npy"), mmap_mode=mmap_mode),
+        )
+
+    def save(self, path: str, name: str) -> None:
+        """Write the table as two ``.npy`` arrays under *path*."""
+        np.save(os.path.join(path, name + ".bin.npy"), np.asarray(self.blob))
+        np.save(os.path.join(path, name + ".offsets.npy"), np.asarray(self.offsets))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        return self.bytes_at(idx).decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def bytes_at(self, idx: int) -> bytes:
+        """Raw UTF-8 bytes of entry *idx*."""
+        return self.blob[self.offsets[idx]:self.offsets[idx + 1]].tobytes()
+
+    def sorted_order(self) -> np.ndarray:
+        """Entry indices ordered by their bytes, for :meth:`find_range`."""
+        return np.asarray(sorted(range(len(self)), key=self.bytes_at), dtype=np.int64)
+
+    def find_range(self, order: np.ndarray, low: bytes, high: bytes) -> np.ndarray:
+        """Entries whose bytes lie in ``[low, high)``, by binary search.
+
+        Args:
+            order: Result of :meth:`sorted_order` for this table.
+            low: Inclusive lower bound.
+            high: Exclusive upper bound.
+
+        Returns:
+            Matching entry indices.
+        """
+        return np.asarray(order[self._bisect(order, low):self._bisect(order, high)])
+
+    def _bisect(self, order: np.ndarray, key: bytes) -> int:
+        """Position of the first entry of *order* not below *key*."""
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.bytes_at(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class Vocabulary:
+    """Term → term ID mapping over a sorted :class:`StringTable`.
+
+    Terms present at the last build or compaction are stored sorted and
+    found by binary search, so a memory-mapped dictionary needs no
+    decoding at load time.  Terms added since then get consecutive IDs
+    from a small in-memory dict.
+    """
+
+    def __init__(self, base: Optional[StringTable] = None, extra: Optional[List[str]] = None):
+        self.base = base if base is not None else StringTable()
+        self._n_base = len(self.base)
+        self._extra: Dict[str, int] = {}
+        for term in extra or []:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return self._n_base + len(self._extra)
+
+    def get(self, term: str) -> Optional[int]:
+        """Term ID of *term*, or ``None`` if unknown."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self._n_base
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.base.bytes_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_base and self.base.bytes_at(lo) == key:
+            return lo
+        return self._extra.get(term)
+
+    def add(self, term: str) -> int:
+        """Return the ID of *term*, assigning a new one if needed."""
+        term_id = self.get(term)
+        if term_id is None:
+            term_id = len(self)
+            self._extra[term] = term_id
+        return term_id
+
+    def extra_terms(self) -> List[str]:
+        """Terms added since the base table was built, in ID order."""
+        return sorted(self._extra, key=self._extra.__getitem__)
+
+    def terms(self) -> List[str]:
+        """Every term, in ID order."""
+        return [self.base[i] for i in range(self._n_base)] + self.extra_terms()
+
+
+class InvertedIndex:
+    """BM25 inverted index with a CSR main segment and an append-only delta.
+
+    Attributes:
+        vocabulary: Term → term ID (:class:`Vocabulary`).
+        indptr: Main-segment offsets into the postings arrays, one per
+            term known at the last compaction (plus one).
+        doc_idx: Main-segment document index of each posting.
+        tf: Main-segment term frequency of each posting.
+        df: ``(n_terms,)`` document frequencies across both segments.
+        doc_len: ``(n_docs,)`` document lengths in tokens.
+        doc_types: ``(n_docs,)`` media type codes (see ``MEDIA_TYPE_CODES``).
+        live: ``(n_docs,)`` ``False`` for tombstoned documents.
+        n_main_docs: Documents covered by the main segment; later ones
+            belong to the delta.
+        main_path: Directory holding the saved main segment, or ``None``
+            if it changed since it was last saved or loaded.
+        analyzer_signature: Identifies the analyzer chain that produced
+            the terms; persisted so a changed chain can be detected.
+    """
+
+    COMPACT_DELTA_RATIO = 0.1
+    COMPACT_DELETED_RATIO = 0.2
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.analyzer_signature = ""
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every document and term."""
+        self.vocabulary = Vocabulary()
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.doc_idx = np.zeros(0, dtype=np.int32)
+        self.tf = np.zeros(0, dtype=np.float32)
+        self.df = np.zeros(0, dtype=np.int64)
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.doc_types = np.zeros(0, dtype=np.int8)
+        self.live = np.zeros(0, dtype=bool)
+        self.n_main_docs = 0
+        self.main_path: Optional[str] = None
+        self._delta_docs: Dict[int, List[int]] = {}
+        self._delta_tf: Dict[int, List[int]] = {}
+        self._delta_postings = 0
+        self._idf: Optional[np.ndarray] = None
+        self._avgdl: Optional[float] = None
+
+    # Statistics
+
+    @property
+    def n_docs(self) -> int:
+        """Number of documents, including tombstoned ones."""
+        return len(self.doc_len)
+
+    @property
+    def n_deleted(self) -> int:
+        """Number of tombstoned documents awaiting compaction."""
+        return int(self.n_docs - np.count_nonzero(self.live))
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the delta or tombstones have grown large enough to merge."""
+        if not self.n_docs:
+            return False
+        return (
+            self._delta_postings > self.COMPACT_DELTA_RATIO * max(len(self.doc_idx), 1)
+            or self.n_deleted > self.COMPACT_DELETED_RATIO * self.n_docs
+        )
+
+    @property
+    def idf(self) -> np.ndarray:
+        """BM25Okapi IDF per term, floored at ``epsilon * mean`` when negative."""
+        if self._idf is None:
+            if not len(self.df):
+                self._idf = np.zeros(0, dtype=np.float32)
+            else:
+                idf = np.log(self.n_docs - self.df + 0.5) - np.log(self.df + 0.5)
+                idf[idf < 0] = self.epsilon * idf.mean()
+                self._idf = idf.astype(np.float32)
+        return self._idf
+
+    @property
+    def avgdl(self) -> float:
+        """Mean document length (1.0 for an empty corpus)."""
+        if self._avgdl is None:
+            self._avgdl = float(self.doc_len.mean()) if self.n_docs else 0.0
+            if not self._avgdl:
+                self._avgdl = 1.0
+        return self._avgdl
+
+    # Building and updating
+
+    def intern(self, tokens: Sequence[str], add: bool = True) -> np.ndarray:
+        """Map tokens to term IDs.
+
+        Args:
+            tokens: Analyzed tokens.
+            add: Assign IDs to unknown tokens; otherwise they are dropped.
+
+        Returns:
+            ``int64`` array of term IDs, in token order.
+        """
+        lookup = self.vocabulary.add if add else self.vocabulary.get
+        cache: Dict[str, Optional[int]] = {}
+        ids = []
+        for token in tokens:
+            if token not in cache:
+                cache[token] = lookup(token)
+            if cache[token] is not None:
+                ids.append(cache[token])
+        return np.asarray(ids, dtype=np.int64)
+
+    def build(self, docs_terms: Sequence[np.ndarray], doc_types: Sequence[str]) -> None:
+        """Replace the index with one built from term-ID arrays.
+
+        The vocabulary is kept, so *docs_terms* may be interned against
+        this index beforehand; unused terms are dropped.
+
+        Args:
+            docs_terms: One term-ID array per document.
+            doc_types: Media type per document (``"image"``, ``"video"``, ...).
+        """
+        vocabulary = self.vocabulary
+        self.reset()
+        self.vocabulary = vocabulary
+        terms, docs, freqs = self._postings(docs_terms, 0)
+        self._append_docs(docs_terms, doc_types)
+        self._set_main(terms, docs, freqs)
+
+    def add_documents(
+        self, docs_terms: Sequence[np.ndarray], doc_types: Sequence[str]
+    ) -> int:
+        """Append documents (as term-ID arrays) to the delta segment.
+
+        Returns:
+            Index assigned to the first new document; the rest follow
+            consecutively.
+        """
+        first = self.n_docs
+        if not len(docs_terms):
+            return first
+        terms, docs, freqs = self._postings(docs_terms, first)
+        for term, doc, freq in zip(terms.tolist(), docs.tolist(), freqs.tolist()):
+            self._delta_docs.setdefault(term, []).append(doc)
+            self._delta_tf.setdefault(term, []).append(freq)
+        self._delta_postings += len(terms)
+        self._append_docs(docs_terms, doc_types)
+        return first
+
+    def delete(self, doc_indices: Sequence[int]) -> None:
+        """Tombstone documents; they stop matching immediately."""
+        if len(doc_indices):
+            self.live[np.asarray(doc_indices, dtype=np.int64)] = False
+
+    def compact(self) -> np.ndarray:
+        """Merge the delta into the main segment and drop tombstones.
+
+        Documents are renumbered densely in their existing order and
+        terms that no longer occur are removed from the vocabulary.
+
+        Returns:
+            Old indices of the surviving documents, in new-index order.
+        """
+        keep = np.flatnonzero(self.live)
+        remap = np.full(self.n_docs, -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+
+        main_terms = np.repeat(
+            np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr)
+        )
+        terms = np.concatenate(
+            [main_terms]
+            + [np.full(len(d), t, dtype=np.int64) for t, d in self._delta_docs.items()]
+        )
+        docs = np.concatenate(
+            [self.doc_idx.astype(np.int64)]
+            + [np.asarray(d, dtype=np.int64) for d in self._delta_docs.values()]
+        )
+        freqs = np.concatenate(
+            [self.tf] + [np.asarray(f, dtype=np.float32) for f in self._delta_tf.values()]
+        )
+
+        alive = self.live[docs]
+        terms, docs, freqs = terms[alive], remap[docs[alive]], freqs[alive]
+
+        self.doc_len = self.doc_len[keep]
+        self.doc_types = self.doc_types[keep]
+        self.live = np.ones(len(keep), dtype=bool)
+        self._delta_docs.clear()
+        self._delta_tf.clear()
+        self._delta_postings = 0
+        self._set_main(terms, docs, freqs)
+        return keep
+
+    # Querying
+
+    def score(self, term_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every live document containing at least one query term.
+
+        Repeated query terms contribute once per occurrence, as in
+        ``BM25Okapi.get_scores``.
+
+        Returns:
+            ``(doc_indices, scores)`` for matching documents, sorted by
+            document index.
+        """
+        idf = self.idf
+        avgdl = self.avgdl
+        n_main_terms = len(self.indptr) - 1
+        docs_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+
+        query_terms, counts = np.unique(np.asarray(term_ids, dtype=np.int64), return_counts=True)
+        for term_id, count in zip(query_terms.tolist(), counts.tolist()):
+            segments = []
+            if term_id < n_main_terms:
+                start, end = self.indptr[term_id], self.indptr[term_id + 1]
+                segments.append((self.doc_idx[start:end], self.tf[start:end]))
+            if term_id in self._delta_docs:
+                segments.append(
+                    (
+                        np.asarray(self._delta_docs[term_id], dtype=np.int64),
+                        np.asarray(self._delta_tf[term_id], dtype=np.float32),
+                    )
+                )
+            for docs, tf in segments:
+                alive = self.live[docs]
+                docs, tf = docs[alive], tf[alive]
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / avgdl)
+                docs_parts.append(docs)
+                score_parts.append(count * idf[term_id] * tf * (self.k1 + 1) / (tf + norm))
+
+        if not docs_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        docs = np.concatenate(docs_parts)
+        contributions = np.concatenate(score_parts)
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        return unique_docs, np.bincount(inverse, weights=contributions)
+
+    def top_k(
+        self,
+        term_ids: np.ndarray,
+        k: int,
+        threshold: float = 0.0,
+        media_type: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the *k* best ``(doc_indices, scores)`` for a query.
+
+        Args:
+            term_ids: Query term IDs (from :meth:`intern` with ``add=False``).
+            k: Maximum number of results.
+            threshold: Minimum score; only positive scores are returned.
+            media_type: Restrict to one media type (``None`` for all).
+        """
+        docs, scores = self.score(term_ids)
+        keep = (scores > 0) & (scores >= threshold)
+        if media_type is not None:
+            keep &= self.doc_types[docs] == MEDIA_TYPE_CODES.get(media_type, -1)
+        docs, scores = docs[keep], scores[keep]
+
+        if k <= 0 or not len(docs):
+            return docs[:0], scores[:0]
+        if len(docs) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top.sort()
+            docs, scores = docs[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return docs[order], scores[order]
+
+    # Internal helpers
+
+    def _postings(
+        self, docs_terms: Sequence[np.ndarray], first_doc: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count ``(term, doc)`` pairs, update ``df`` and return postings."""
+        n_terms = max(len(self.vocabulary), 1)
+        lengths = [len(terms) for terms in docs_terms]
+        terms = (
+            np.concatenate([np.asarray(t, dtype=np.int64) for t in docs_terms])
+            if docs_terms else np.zeros(0, dtype=np.int64)
+        )
+        docs = np.repeat(
+            np.arange(first_doc, first_doc + len(lengths), dtype=np.int64), lengths
+        )
+        keys, freqs = np.unique(docs * n_terms + terms, return_counts=True)
+        docs, terms = np.divmod(keys, n_terms)
+
+        new_df = np.bincount(terms, minlength=len(self.vocabulary))
+        new_df[: len(self.df)] += self.df
+        self.df = new_df
+        self._idf = None
+        return terms, docs, freqs.astype(np.float32)
+
+    def _append_docs(
+        self, docs_terms: Sequence[np.ndarray], doc_types: Sequence[str]
+    ) -> None:
+        """Extend the per-document arrays with new documents."""
+        lengths = np.asarray([len(terms) for terms in docs_terms], dtype=np.float32)
+        codes = np.asarray(
+            [MEDIA_TYPE_CODES.get(t, MEDIA_TYPE_CODES["unknown"]) for t in doc_types],
+            dtype=np.int8,
+        )
+        self.doc_len = np.concatenate([self.doc_len, lengths])
+        self.doc_types = np.concatenate([self.doc_types, codes])
+        self.live = np.concatenate([self.live, np.ones(len(lengths), dtype=bool)])
+        self._idf = None
+        self._avgdl = None
+
+    def _set_main(self, terms: np.ndarray, docs: np.ndarray, freqs: np.ndarray) -> None:
+        """Install postings as the CSR main segment.
+
+        Terms without postings are dropped and the remaining ones are
+        renumbered in sorted order so the vocabulary can be stored as a
+        sorted, binary-searchable table.
+        """
+        all_terms = self.vocabulary.terms()
+        used = np.flatnonzero(np.bincount(terms, minlength=len(all_terms)))
+        order = sorted(used.tolist(), key=all_terms.__getitem__)
+        term_remap = np.full(len(all_terms), -1, dtype=np.int64)
+        term_remap[order] = np.arange(len(order))
+        self.vocabulary = Vocabulary(StringTable.from_strings([all_terms[i] for i in order]))
+        terms = term_remap[terms]
+
+        order = np.lexsort((docs, terms))
+        df = np.bincount(terms, minlength=len(self.vocabulary))
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=self.indptr[1:])
+        self.doc_idx = docs[order].astype(np.int32)
+        self.tf = freqs[order]
+        self.df = df.astype(np.int64)
+        self.n_main_docs = self.n_docs
+        self.main_path = None
+        self._idf = None
+        self._avgdl = None
+
+    # Persistence
+
+    def save(self, path: str, main_path: str) -> None:
+        """Write the index as ``.npy`` arrays plus ``meta.json`` files.
+
+        The main segment only changes on :meth:`build` and
+        :meth:`compact`.  It is written to *main_path* if it changed
+        since it was last saved or loaded, and is otherwise just
+        referenced, so an incremental update writes only the delta
+        segment (flat ``(term, doc, tf)`` arrays, the terms and the
+        document lengths and types it introduced) and the tombstone
+        bitmap into *path*.
+
+        Args:
+            path: Directory of this generation.
+            main_path: Directory for the main segment, used only when it
+                has to be written.
+        """
+        if self.main_path is None:
+            self._save_main(main_path)
+
+        os.makedirs(path, exist_ok=True)
+        StringTable.from_strings(self.vocabulary.extra_terms()).save(path, "delta_terms")
+        delta_term_ids = [t for t, docs in self._delta_docs.items() for _ in docs]
+        delta_docs = [d for docs in self._delta_docs.values() for d in docs]
+        delta_tf = [f for freqs in self._delta_tf.values() for f in freqs]
+        self._save_arrays(path, {
+            "doc_len": self.doc_len[self.n_main_docs:],
+            "doc_types": self.doc_types[self.n_main_docs:],
+            "live": np.packbits(self.live),
+            "delta_term_ids": np.asarray(delta_term_ids, dtype=np.int64),
+            "delta_docs": np.asarray(delta_docs, dtype=np.int64),
+            "delta_tf": np.asarray(delta_tf, dtype=np.float32),
+        })
+        self._save_meta(path, {
+            "main": os.path.relpath(self.main_path, path),
+            "n_docs": self.n_docs,
+            "n_terms": len(self.vocabulary),
+        })
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        """Open an index written by :meth:`save`.
+
+        Main-segment arrays are memory-mapped read-only, so opening is
+        independent of corpus size apart from the small delta segment,
+        the tombstone bitmap and the document frequencies (derived from
+        the postings offsets).
+
+        Raises:
+            ValueError: If *path* holds an unknown format or version.
+        """
+        meta = cls._load_meta(path)
+        main_path = os.path.normpath(os.path.join(path, meta["main"]))
+        main_meta = cls._load_meta(main_path)
+
+        def array(directory: str, name: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
+            return np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode)
+
+        def extend(name: str) -> np.ndarray:
+            main, delta = array(main_path, name), array(path, name, None)
+            return np.concatenate([main, delta]) if len(delta) else main
+
+        index = cls(main_meta["k1"], main_meta["b"], main_meta["epsilon"])
+        index.analyzer_signature = main_meta.get("analyzer", "")
+        index.vocabulary = Vocabulary(
+            StringTable.load(main_path, "terms"),
+            list(StringTable.load(path, "delta_terms", mmap_mode=None)),
+        )
+        index.indptr = array(main_path, "indptr")
+        index.doc_idx = array(main_path, "doc_idx")
+        index.tf = array(main_path, "tf")
+        index.doc_len = extend("doc_len")
+        index.doc_types = extend("doc_types")
+        index.live = np.unpackbits(array(path, "live", None), count=index.n_docs).astype(bool)
+        index.n_main_docs = int(main_meta["n_docs"])
+        index.main_path = main_path
+
+        delta_term_ids = array(path, "delta_term_ids", None)
+        delta = zip(
+            delta_term_ids.tolist(),
+            array(path, "delta_docs", None).tolist(),
+            array(path, "delta_tf", None).tolist(),
+        )
+        for term, doc, freq in delta:
+            index._delta_docs.setdefault(term, []).append(doc)
+            index._delta_tf.setdefault(term, []).append(freq)
+            index._delta_postings += 1
+
+        df = np.zeros(len(index.vocabulary), dtype=np.int64)
+        df[: len(index.indptr) - 1] = np.diff(index.indptr)
+        df += np.bincount(delta_term_ids, minlength=len(df))
+        index.df = df
+        return index
+
+    def _save_main(self, path: str) -> None:
+        """Write the main segment into *path* and remember its location."""
+        os.makedirs(path, exist_ok=True)
+        self.vocabulary.base.save(path, "terms")
+        self._save_arrays(path, {
+            "indptr": self.indptr,
+            "doc_idx": self.doc_idx,
+            "tf": self.tf,
+            "doc_len": self.doc_len[: self.n_main_docs],
+            "doc_types": self.doc_types[: self.n_main_docs],
+        })
+        self._save_meta(path, {
+            "k1": self.k1,
+            "b": self.b,
+            "epsilon": self.epsilon,
+            "n_docs": self.n_main_docs,
+            "n_terms": len(self.indptr) - 1,
+            "analyzer": self.analyzer_signature,
+        })
+        self.main_path = path
+
+    @staticmethod
+    def _save_arrays(path: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Write each array as ``<name>.npy`` under *path*."""
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), np.asarray(array))
+
+    @staticmethod
+    def _save_meta(path: str, fields: Dict) -> None:
+        """Write ``meta.json`` with the format header and *fields*."""
+        meta = {"format": FORMAT_NAME, "version": FORMAT_VERSION}
+        meta.update(fields)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _load_meta(path: str) -> Dict:
+        """Read and check ``meta.json`` under *path*."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("format") != FORMAT_NAME or meta.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported BM25 index format %s v%s"
+                % (meta.get("format"), meta.get("version"))
+            )
+        return meta
@@ -1,94 +1,195 @@
 """BM25 full-text keyword search over OCR and transcript content.
 
 Maintains a persistent BM25 index on disk so that keyword matches
-survive process restarts.  The index is rebuilt automatically after
-each full media scan.
+survive process restarts.  Each save writes a new generation directory
+of ``.npy`` arrays and then atomically repoints a ``CURRENT`` file, so
+readers never see a half-written index.  After each scan only the documents of new,
+changed and removed media are applied to the index; a full rebuild is
+reserved for the first scan.
+
+The main segment and its document IDs live in a ``main-NNNNNN``
+directory that is written once per rebuild or compaction and shared by
+the generations saved after it, so an incremental save only writes the
+delta segment, the tombstone bitmap and the appended document IDs.
+
+Searches re-read ``CURRENT`` and reopen the index when another process
+(a scan) has saved a newer generation, which is a cheap memory-mapped
+open.
 """
 
 import os
-import pickle
-from typing import List
-from rank_bm25 import BM25Okapi
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from semantixel.core.config import config
 from semantixel.core.logging import logger
+from semantixel.media import FRAME_SEPARATOR
+from semantixel.services.bm25_index import InvertedIndex, StringTable
+from semantixel.services.text_analyzer import Analyzer, build_analyzer
+from semantixel.services.collection_utils import DEFAULT_CHUNK_SIZE, iter_collection_pages
 
 
 class BM25Service:
     """BM25-based full-text search index for OCR / transcript content.
 
-    Uses the ``rank_bm25`` implementation of the Okapi BM25 algorithm.
-    Tokenization is whitespace-based (no stemmer by default).
+    Scoring uses an :class:`InvertedIndex` (CSR postings, Okapi BM25).
+    Text is turned into terms by an :class:`Analyzer` chain built from
+    ``config.bm25`` (or passed in), then interned to integer term IDs.  Document
+    text is not retained: the ``texts`` collection remains the source of
+    truth and only token statistics are kept.
+
+    ChromaDB document IDs of the main segment are kept in a memory-mapped
+    :class:`StringTable` and found by binary search over a persisted
+    sort order; only the IDs of documents added since the last
+    compaction are held in Python dicts.
 
     Attributes:
-        index_path: Path to the pickle file where the index is persisted.
-        bm25: The underlying ``BM25Okapi`` instance (``None`` until first rebuild).
-        documents: In-memory list of document texts, parallel to :attr:`doc_ids`.
-        doc_ids: ChromaDB document IDs, parallel to :attr:`documents`.
+        index_path: Directory where index generations are persisted.
+        analyzer: Text analysis chain shared by indexing and querying.
+        bm25: The underlying :class:`InvertedIndex` (``None`` until first rebuild).
     """
 
-    def __init__(self, index_path: str = "db/bm25_index.pkl"):
+    def __init__(self, index_path: str = "db/bm25_index", analyzer: Optional[Analyzer] = None):
         self.index_path = index_path
-        self.bm25 = None
-        self.documents: List[str] = []
-        self.doc_ids: List[str] = []
+        self.analyzer = analyzer or build_analyzer(config.bm25)
+        self.bm25: Optional[InvertedIndex] = None
+        self._main_ids = StringTable()
+        self._main_order = np.zeros(0, dtype=np.int64)
+        self._delta_ids: List[str] = []
+        self._delta_index: Dict[str, int] = {}
+        self._delta_media: Dict[str, List[int]] = {}
+        self._generation: Optional[str] = None
+        self._lock = threading.RLock()
         self.load()
 
     def load(self):
-        """Load a previously-saved BM25 index from disk, or start fresh."""
-        if os.path.exists(self.index_path):
-            try:
-                with open(self.index_path, "rb") as f:
-                    data = pickle.load(f)
-                    self.bm25 = data.get("bm25")
-                    self.documents = data.get("documents", [])
-                    self.doc_ids = data.get("doc_ids", [])
-                logger.info("Loaded BM25 index with %d documents", len(self.doc_ids))
-            except Exception as exc:
-                logger.error("Error loading BM25 index: %s. Starting fresh.", exc)
-                self.reset()
-        else:
+        """Open the current on-disk index generation, or start fresh.
+
+        Arrays and main-segment document IDs are memory-mapped; only
+        the IDs of delta documents are decoded.
+        """
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        """Body of :meth:`load`; the caller holds the lock."""
+        generation = self._current_generation()
+        self._generation = generation
+        if generation is None:
+            if os.path.exists(self.index_path + ".pkl"):
+                logger.info(
+                    "Ignoring legacy pickled BM25 index at %s.pkl; it will be rebuilt",
+                    self.index_path,
+                )
             logger.info("Initializing new BM25 index")
             self.reset()
+            return
+
+        path = os.path.join(self.index_path, generation)
+        try:
+            self.bm25 = InvertedIndex.load(path)
+            if self.bm25.analyzer_signature != self.analyzer.signature:
+                logger.info("BM25 analyzer settings changed; index will be rebuilt")
+                self.reset()
+                return
+            main_path = self.bm25.main_path
+            self._main_ids = StringTable.load(main_path, "doc_ids")
+            self._main_order = np.load(os.path.join(main_path, "doc_order.npy"), mmap_mode="r")
+            self._clear_delta()
+            delta_ids = StringTable.load(path, "delta_doc_ids", mmap_mode=None)
+            for idx, doc_id in enumerate(delta_ids, start=len(self._main_ids)):
+                self._register(doc_id, idx)
+                if not self.bm25.live[idx]:
+                    self._forget(doc_id, idx)
+            logger.info(
+                "Loaded BM25 index with %d documents",
+                self.bm25.n_docs - self.bm25.n_deleted,
+            )
+        except Exception as exc:
+            logger.error("Error loading BM25 index: %s. Starting fresh.", exc)
+            self.reset()
 
     def reset(self):
         """Clear the in-memory BM25 index."""
         self.bm25 = None
-        self.documents = []
-        self.doc_ids = []
+        self._set_main_ids([])
 
     def add_document(self, doc_id: str, text: str):
-        """Add or update a document in the in-memory index.
-
-        If *doc_id* already exists, *text* is appended (for multi-frame
-        videos whose OCR text accumulates).
+        """Add or replace a single document in the in-memory index.
 
         Args:
             doc_id: Unique document identifier.
             text: Document text content.
         """
-        if not text or not text.strip():
+        self.add_documents([doc_id], [text])
+
+    def add_documents(self, doc_ids: List[str], texts: List[str]):
+        """Add or replace documents in the index's delta segment.
+
+        Existing documents with the same IDs are tombstoned first.
+        Empty texts are skipped.
+
+        Args:
+            doc_ids: Unique document identifiers.
+            texts: Document texts, parallel to *doc_ids*.
+        """
+        if self.bm25 is None:
+            self.bm25 = self._new_index()
+
+        pairs = [(d, t) for d, t in zip(doc_ids, texts) if t and t.strip()]
+        self.remove_documents([d for d, _ in pairs])
+        if not pairs:
             return
 
-        if doc_id in self.doc_ids:
-            idx = self.doc_ids.index(doc_id)
-            if text not in self.documents[idx]:
-                self.documents[idx] += " " + text
-        else:
-            self.documents.append(text)
-            self.doc_ids.append(doc_id)
+        first = self.bm25.add_documents(
+            [self.bm25.intern(self.analyzer.analyze(text)) for _, text in pairs],
+            [self._infer_media_type(doc_id) for doc_id, _ in pairs],
+        )
+        for offset, (doc_id, _) in enumerate(pairs):
+            self._register(doc_id, first + offset)
+
+    def remove_documents(self, doc_ids: List[str]):
+        """Tombstone documents by ID (unknown IDs are ignored)."""
+        indices = []
+        for doc_id in doc_ids:
+            key = doc_id.encode("utf-8")
+            indices.extend(self._main_rows(key, key + b"\x00"))
+            if doc_id in self._delta_index:
+                idx = self._delta_index[doc_id]
+                self._forget(doc_id, idx)
+                indices.append(idx)
+        self._drop(indices)
+
+    def remove_media(self, media_ids: List[str]):
+        """Tombstone every document derived from the given media IDs."""
+        indices = []
+        for media_id in media_ids:
+            key = media_id.encode("utf-8")
+            prefix = (media_id + FRAME_SEPARATOR).encode("utf-8")
+            indices.extend(self._main_rows(key, key + b"\x00"))
+            indices.extend(self._main_rows(prefix, prefix + b"\xff"))
+            for idx in list(self._delta_media.get(media_id, [])):
+                self._forget(self._delta_ids[idx - len(self._main_ids)], idx)
+                indices.append(idx)
+        self._drop(indices)
 
     def rebuild(self, save: bool = True):
-        """Rebuild BM25 index from the current :attr:`documents` list.
+        """Compact the index (merge the delta segment, drop tombstones).
 
         Args:
             save: Whether to persist to disk after rebuilding.
         """
-        if not self.documents:
+        if self.bm25 is None or self.bm25.n_docs == self.bm25.n_deleted:
             logger.warning("No documents to index for BM25")
+            self.reset()
+            if save:
+                self.save()
             return
 
-        tokenized_docs = [doc.lower().split() for doc in self.documents]
-        self.bm25 = BM25Okapi(tokenized_docs)
-        logger.info("BM25 index rebuilt with %d documents", len(self.documents))
+        keep = self.bm25.compact()
+        self._set_main_ids([self._doc_id(i) for i in keep.tolist()])
+        logger.info("BM25 index compacted to %d documents", len(keep))
 
         if save:
             self.save()
@@ -118,25 +219,81 @@ class BM25Service:
     def rebuild_from_collection(self, collection, save: bool = True):
         """Rebuild the BM25 index from a ChromaDB collection's stored documents.
 
-        Reads ``ids`` and ``documents`` from the collection, replaces the
-        in-memory document store, and calls :meth:`rebuild`. This ensures
-        the keyword index always mirrors the current text collection,
-        automatically evicting stale entries from renamed or deleted files.
+        Reads ``ids`` and ``documents`` page by page and builds a fresh
+        index. This ensures the keyword index mirrors the current text
+        collection, evicting stale entries from renamed or deleted files.
 
         Args:
             collection: A ChromaDB collection with ``documents`` stored.
             save: Whether to persist the rebuilt index to disk.
         """
-        data = collection.get(include=["documents"])
-        ids = data.get("ids", [])
-        docs = data.get("documents", [])
-        self.documents = []
-        self.doc_ids = []
-        for doc_id, doc_text in zip(ids, docs):
-            if doc_text:
-                self.documents.append(doc_text)
-                self.doc_ids.append(doc_id)
-        self.rebuild(save=save)
+        index = self._new_index()
+        doc_ids: List[str] = []
+        docs_terms = []
+        for page in iter_collection_pages(collection, include=["documents"]):
+            for doc_id, doc_text in zip(page["ids"], page.get("documents") or []):
+                if doc_text and doc_text.strip():
+                    doc_ids.append(doc_id)
+                    docs_terms.append(index.intern(self.analyzer.analyze(doc_text)))
+
+        if not doc_ids:
+            logger.warning("No documents to index for BM25")
+            self.reset()
+            if save:
+                self.save()
+            return
+
+        index.build(docs_terms, [self._infer_media_type(d) for d in doc_ids])
+        self.bm25 = index
+        self._set_main_ids(doc_ids)
+        logger.info("BM25 index rebuilt with %d documents", len(doc_ids))
+
+        if save:
+            self.save()
+
+    def update_from_collection(
+        self,
+        collection,
+        removed_media_ids: List[str],
+        indexed_media_ids: List[str],
+        save: bool = True,
+    ):
+        """Apply one scan's changes without re-reading the whole collection.
+
+        Documents of *removed_media_ids* and *indexed_media_ids* are
+        tombstoned, then the current documents of *indexed_media_ids*
+        are fetched from *collection* and appended.  The index is
+        compacted once the delta or the tombstones grow large.
+
+        Args:
+            collection: The ChromaDB ``texts`` collection.
+            removed_media_ids: Media deleted or changed since the last scan.
+            indexed_media_ids: Media (re-)indexed by this scan.
+            save: Whether to persist the index afterwards.
+        """
+        self.remove_media(list(removed_media_ids) + list(indexed_media_ids))
+
+        added = 0
+        for start in range(0, len(indexed_media_ids), DEFAULT_CHUNK_SIZE):
+            chunk = list(indexed_media_ids[start:start + DEFAULT_CHUNK_SIZE])
+            for page in iter_collection_pages(
+                collection,
+                include=["documents"],
+                where={"source_media_id": {"$in": chunk}},
+            ):
+                ids = page["ids"]
+                self.add_documents(ids, page.get("documents") or [None] * len(ids))
+                added += len(ids)
+
+        logger.info(
+            "BM25 index updated: %d media removed, %d documents added",
+            len(removed_media_ids),
+            added,
+        )
+        if self.bm25 is not None and self.bm25.needs_compaction:
+            self.rebuild(save=False)
+        if save:
+            self.save()
 
     def search(
         self,
@@ -152,44 +309,158 @@ class BM25Service:
             top_k: Maximum number of results.
             threshold: Minimum BM25 score (note: BM25 scores are not
                 normalised to 0-1, so this is typically left at 0).
+                Only positive scores are ever returned.
             media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
 
         Returns:
             List of matching document IDs, ordered by descending score.
         """
-        if self.bm25 is None:
-            return []
-
-        tokens = query.lower().split()
-        scores = self.bm25.get_scores(tokens)
-
-        results = []
-        for i, score in enumerate(scores):
-            if score > 0:
-                doc_id = self.doc_ids[i]
-                item_type = self._infer_media_type(doc_id)
-
-                if media_type != "all" and media_type != item_type:
-                    continue
+        return [
+            doc_id for doc_id, _score in
+            self.search_scored(query, top_k, threshold, media_type)
+        ]
 
-                results.append((doc_id, score))
+    def search_scored(
+        self,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "all",
+    ) -> List[Tuple[str, float]]:
+        """Like :meth:`search`, but also return each document's BM25 score.
 
-        results.sort(key=lambda x: x[1], reverse=True)
-        return [doc_id for doc_id, _score in results[:top_k]]
+        Returns:
+            ``(doc_id, score)`` pairs ordered by descending score.
+        """
+        with self._lock:
+            if self._current_generation() != self._generation:
+                logger.info("BM25 index changed on disk; reloading")
+                self._load()
+            if self.bm25 is None:
+                return []
+
+            docs, scores = self.bm25.top_k(
+                self.bm25.intern(self.analyzer.analyze(query), add=False),
+                top_k,
+                threshold=threshold,
+                media_type=None if media_type == "all" else media_type,
+            )
+            return [(self._doc_id(i), float(score)) for i, score in zip(docs.tolist(), scores)]
 
     def save(self):
-        """Persist the BM25 index to disk as a pickle."""
-        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        """Write a new index generation and make it current.
+
+        The generation directory holds the delta arrays (see
+        :meth:`InvertedIndex.save`) plus the IDs of the delta documents;
+        the main segment, its document IDs and their sort order are only
+        written to a new ``main-NNNNNN`` directory after a rebuild or
+        compaction.  Document text is not stored.  Directories no longer
+        referenced are removed afterwards (best effort, since another
+        process may still map them).
+        """
         try:
-            with open(self.index_path, "wb") as f:
-                pickle.dump(
-                    {
-                        "bm25": self.bm25,
-                        "documents": self.documents,
-                        "doc_ids": self.doc_ids,
-                    },
-                    f,
-                )
-            logger.info("BM25 index saved to %s", self.index_path)
+            os.makedirs(self.index_path, exist_ok=True)
+            existing = [
+                int(name[4:]) for name in os.listdir(self.index_path)
+                if name.startswith("gen-") and name[4:].isdigit()
+            ]
+            number = max(existing, default=0) + 1
+            generation = "gen-%06d" % number
+            path = os.path.join(self.index_path, generation)
+            shutil.rmtree(path, ignore_errors=True)
+            referenced = {generation}
+
+            if self.bm25 is not None:
+                main_path = self.bm25.main_path
+                new_main = main_path is None
+                if new_main:
+                    main_path = os.path.join(self.index_path, "main-%06d" % number)
+                    shutil.rmtree(main_path, ignore_errors=True)
+                self.bm25.save(path, main_path)
+                if new_main:
+                    self._main_ids.save(main_path, "doc_ids")
+                    np.save(os.path.join(main_path, "doc_order.npy"), self._main_order)
+                StringTable.from_strings(self._delta_ids).save(path, "delta_doc_ids")
+                referenced.add(os.path.basename(main_path))
+            else:
+                os.makedirs(path)
+
+            pointer = os.path.join(self.index_path, "CURRENT")
+            with open(pointer + ".tmp", "w") as f:
+                f.write(generation)
+            os.replace(pointer + ".tmp", pointer)
+            self._generation = generation
+
+            for name in os.listdir(self.index_path):
+                if name.startswith(("gen-", "main-")) and name not in referenced:
+                    shutil.rmtree(os.path.join(self.index_path, name), ignore_errors=True)
+            logger.info("BM25 index saved to %s", path)
         except Exception as exc:
             logger.error("Failed to save BM25 index: %s", exc)
+
+    # Internal helpers
+
+    def _new_index(self) -> InvertedIndex:
+        """Create an empty index tagged with the analyzer signature."""
+        index = InvertedIndex()
+        index.analyzer_signature = self.analyzer.signature
+        return index
+
+    def _register(self, doc_id: str, idx: int):
+        """Record delta document *doc_id* at index position *idx*."""
+        self._delta_ids.append(doc_id)
+        self._delta_index[doc_id] = idx
+        media_id = doc_id.split(FRAME_SEPARATOR, 1)[0]
+        self._delta_media.setdefault(media_id, []).append(idx)
+
+    def _forget(self, doc_id: str, idx: int):
+        """Drop delta document *doc_id* at *idx* from the ID lookups."""
+        if self._delta_index.get(doc_id) == idx:
+            del self._delta_index[doc_id]
+        media_id = doc_id.split(FRAME_SEPARATOR, 1)[0]
+        indices = self._delta_media.get(media_id, [])
+        if idx in indices:
+            indices.remove(idx)
+            if not indices:
+                del self._delta_media[media_id]
+
+    def _drop(self, indices: List[int]):
+        """Tombstone index positions."""
+        if not indices or self.bm25 is None:
+            return
+        self.bm25.delete(indices)
+
+    def _main_rows(self, low: bytes, high: bytes) -> List[int]:
+        """Live main-segment documents whose IDs lie in ``[low, high)``."""
+        rows = self._main_ids.find_range(self._main_order, low, high)
+        if not len(rows) or self.bm25 is None:
+            return []
+        return rows[self.bm25.live[rows]].tolist()
+
+    def _doc_id(self, idx: int) -> str:
+        """Document ID at index position *idx*."""
+        n_main = len(self._main_ids)
+        return self._main_ids[idx] if idx < n_main else self._delta_ids[idx - n_main]
+
+    def _set_main_ids(self, doc_ids: List[str]):
+        """Install the IDs of the main segment's documents and clear the delta."""
+        self._main_ids = StringTable.from_strings(doc_ids)
+        self._main_order = self._main_ids.sorted_order()
+        self._clear_delta()
+
+    def _clear_delta(self):
+        """Forget every delta document ID."""
+        self._delta_ids = []
+        self._delta_index = {}
+        self._delta_media = {}
+
+    def _current_generation(self) -> Optional[str]:
+        """Name of the current generation directory, if any."""
+        pointer = os.path.join(self.index_path, "CURRENT")
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer) as f:
+            generation = f.read().strip()
+        if not os.path.exists(os.path.join(self.index_path, generation, "meta.json")):
+            return None
+        return generation
@@ -0,0 +1,92 @@
+"""Bulk read helpers for ChromaDB collections.
+
+Large collections are read in fixed-size pages so that a single
+``get`` never materialises the whole index at once, and existence
+checks become set lookups instead of one round-trip per item.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+DEFAULT_PAGE_SIZE = 5000
+DEFAULT_CHUNK_SIZE = 500
+
+
+def iter_collection_pages(
+    collection,
+    include: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield successive ``collection.get`` pages until exhausted.
+
+    Args:
+        collection: ChromaDB collection to read.
+        include: Fields to include (defaults to IDs only).
+        where: Optional metadata filter.
+        page_size: Records per page.
+
+    Yields:
+        Raw ``get`` result dicts.
+    """
+    offset = 0
+    while True:
+        page = collection.get(
+            include=include or [],
+            where=where,
+            limit=page_size,
+            offset=offset,
+        )
+        ids = page.get("ids") or []
+        if not ids:
+            return
+        yield page
+        if len(ids) < page_size:
+            return
+        offset += len(ids)
+
+
+def load_ids(
+    collection,
+    where: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Set[str]:
+    """Return every ID in *collection* (optionally filtered by *where*)."""
+    ids: Set[str] = set()
+    for page in iter_collection_pages(collection, where=where, page_size=page_size):
+        ids.update(page["ids"])
+    return ids
+
+
+def find_existing_ids(
+    collection, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Set[str]:
+    """Return the subset of *ids* present in *collection*.
+
+    Issues one ``get`` per chunk of IDs instead of one per item.
+    """
+    found: Set[str] = set()
+    for start in range(0, len(ids), chunk_size):
+        page = collection.get(ids=ids[start:start + chunk_size], include=[])
+        found.update(page.get("ids") or [])
+    return found
+
+
+def find_existing_sources(
+    collection, media_ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Set[str]:
+    """Return the subset of *media_ids* referenced as ``source_media_id``.
+
+    Issues one ``$in`` metadata query per chunk of media IDs.
+    """
+    found: Set[str] = set()
+    for start in range(0, len(media_ids), chunk_size):
+        chunk = media_ids[start:start + chunk_size]
+        for page in iter_collection_pages(
+            collection,
+            include=["metadatas"],
+            where={"source_media_id": {"$in": chunk}},
+        ):
+            for metadata in page.get("metadatas") or []:
+                if metadata and metadata.get("source_media_id"):
+                    found.add(metadata["source_media_id"])
+    return found
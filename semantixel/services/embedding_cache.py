@@ -0,0 +1,320 @@
+"""Bounded cache of query-text embeddings.
+
+Search clients repeat the same queries constantly, and every search
+encodes the query once per modality.  :class:`QueryEmbeddingCache`
+keeps recent query embeddings in an in-memory LRU with a time-to-live
+and, optionally, in a small SQLite database so that they survive
+restarts.  Entries are keyed on the provider class, its model
+checkpoint and the normalised query text, so switching checkpoints can
+never serve a vector from the old embedding space.
+
+All-zero or non-finite vectors are returned but never cached: providers
+such as CLAP return a zero vector when encoding fails, and caching it
+would keep a transient failure alive for the whole TTL.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from semantixel.core.logging import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_embeddings (
+    provider TEXT NOT NULL,
+    checkpoint TEXT NOT NULL,
+    query TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (provider, checkpoint, query)
+)
+"""
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_query(text: str) -> str:
+    """Canonicalise query text for cache lookups.
+
+    Applies Unicode NFC and collapses runs of whitespace.  Case is kept
+    because not every text encoder is uncased.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class QueryEmbeddingCache:
+    """LRU + TTL cache of query embeddings with an optional disk tier.
+
+    Usage::
+
+        cache = QueryEmbeddingCache(max_entries=1024, ttl_seconds=3600)
+        vector = cache.get_or_compute(provider, "a dog", provider.get_text_embeddings)
+
+    When a provider is seen with a different checkpoint than before,
+    every entry of the old checkpoint is dropped from both tiers.
+
+    The disk tier uses one SQLite connection for the cache's lifetime,
+    shared across threads under the cache lock.
+
+    Attributes:
+        max_entries: Maximum embeddings held in memory.
+        ttl_seconds: Age after which an entry is recomputed (``0`` = never).
+        disk_path: SQLite file of the disk tier, or ``None`` to disable it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        disk_path: Optional[str] = None,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[float]]]" = OrderedDict()
+        self._checkpoints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._conn = self._connect() if disk_path else None
+
+    # Public API
+
+    def get_or_compute(
+        self,
+        provider: Any,
+        text: str,
+        compute: Callable[[str], List[float]],
+    ) -> List[float]:
+        """Return the cached embedding of *text*, computing it on a miss.
+
+        Args:
+            provider: Model provider producing the embedding; its class
+                name and ``checkpoint`` attribute form part of the key.
+            text: Raw query text.
+            compute: Function embedding a single string (usually a bound
+                method of *provider*).
+
+        Returns:
+            The embedding vector.
+        """
+        return self.get_or_compute_many(
+            provider, [text], lambda queries: [compute(queries[0])]
+        )[0]
+
+    def get_or_compute_many(
+        self,
+        provider: Any,
+        texts: List[str],
+        compute: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Return embeddings for *texts*, computing all misses in one call.
+
+        Duplicate queries within *texts* are computed once.  Failed
+        encodings (see :meth:`_cacheable`) are not stored.
+
+        Args:
+            provider: Model provider producing the embeddings (see
+                :meth:`get_or_compute`).
+            texts: Raw query texts.
+            compute: Function embedding a list of strings in one batch.
+
+        Returns:
+            One embedding vector per input text, in input order.
+        """
+        keys = [self._key(provider, normalize_query(text)) for text in texts]
+        if keys:
+            self._check_checkpoint(keys[0][0], keys[0][1])
+
+        vectors: List[Optional[List[float]]] = [None] * len(keys)
+        missing: "OrderedDict[CacheKey, List[int]]" = OrderedDict()
+        for position, key in enumerate(keys):
+            vector = self._get_memory(key)
+            if vector is None:
+                entry = self._get_disk(key)
+                if entry is not None:
+                    created_at, vector = entry
+                    self._put_memory(key, vector, created_at)
+            if vector is None:
+                missing.setdefault(key, []).append(position)
+            else:
+                vectors[position] = vector
+
+        if missing:
+            with self._lock:
+                self._misses += len(missing)
+            computed = compute([key[2] for key in missing])
+            created_at = time.time()
+            for (key, positions), vector in zip(missing.items(), computed):
+                vector = list(vector)
+                if self._cacheable(vector):
+                    self._put_memory(key, vector, created_at)
+                    self._put_disk(key, vector, created_at)
+                for position in positions:
+                    vectors[position] = vector
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits + self._disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached embedding from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM query_embeddings")
+                except sqlite3.Error as exc:
+                    logger.warning("Failed to clear query embedding cache: %s", exc)
+
+    # Internal helpers
+
+    @staticmethod
+    def _key(provider: Any, query: str) -> CacheKey:
+        """Build the ``(provider, checkpoint, query)`` cache key."""
+        return (
+            type(provider).__name__,
+            str(getattr(provider, "checkpoint", "unknown")),
+            query,
+        )
+
+    @staticmethod
+    def _cacheable(vector: List[float]) -> bool:
+        """Whether *vector* is a real embedding, not a failure fallback.
+
+        Fallbacks are all zeros or contain NaN or inf.
+        """
+        return all(math.isfinite(x) for x in vector) and any(vector)
+
+    def _expired(self, created_at: float) -> bool:
+        """Whether an entry created at *created_at* has outlived the TTL."""
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _check_checkpoint(self, provider: str, checkpoint: str) -> None:
+        """Invalidate a provider's entries when its checkpoint changes."""
+        with self._lock:
+            previous = self._checkpoints.get(provider)
+            self._checkpoints[provider] = checkpoint
+            if previous is None or previous == checkpoint:
+                return
+            stale = [key for key in self._entries if key[0] == provider]
+            for key in stale:
+                del self._entries[key]
+
+        logger.info(
+            "Checkpoint of %s changed (%s -> %s); dropped cached query embeddings",
+            provider, previous, checkpoint,
+        )
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM query_embeddings WHERE provider = ? AND checkpoint != ?",
+                        (provider, checkpoint),
+                    )
+            except sqlite3.Error as exc:
+                logger.warning("Failed to invalidate query embedding cache: %s", exc)
+
+    def _get_memory(self, key: CacheKey) -> Optional[List[float]]:
+        """Look *key* up in the LRU, refreshing its recency on a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def _put_memory(self, key: CacheKey, vector: List[float], created_at: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (created_at, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the disk tier and create its schema.
+
+        Returns:
+            The connection, or ``None`` (disk tier disabled) if the
+            database cannot be opened.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.disk_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+            with conn:
+                conn.execute(_SCHEMA)
+            return conn
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Query embedding disk cache unavailable: %s", exc)
+            return None
+
+    def _get_disk(self, key: CacheKey) -> Optional[Tuple[float, List[float]]]:
+        """Look *key* up in the disk tier.
+
+        Returns:
+            ``(created_at, vector)``, or ``None`` on a miss or expired entry.
+        """
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT vector, created_at FROM query_embeddings "
+                    "WHERE provider = ? AND checkpoint = ? AND query = ?",
+                    key,
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logger.warning("Query embedding cache read failed: %s", exc)
+                return None
+            if row is None or self._expired(row[1]):
+                return None
+            self._disk_hits += 1
+        return row[1], array("f", row[0]).tolist()
+
+    def _put_disk(self, key: CacheKey, vector: List[float], created_at: float) -> None:
+        """Write an entry to the disk tier, pruning expired rows."""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?, ?, ?)",
+                        key + (array("f", vector).tobytes(), created_at),
+                    )
+                    if self.ttl_seconds > 0:
+                        self._conn.execute(
+                            "DELETE FROM query_embeddings WHERE created_at < ?",
+                            (created_at - self.ttl_seconds,),
+                        )
+            except sqlite3.Error as exc:
+                logger.warning("Query embedding cache write failed: %s", exc)
@@ -0,0 +1,143 @@
+"""Face indexing service.
+
+Detects faces in still images once per scan and stores one embedding
+per detected face in a dedicated ChromaDB collection, so that name
+searches become a single nearest-neighbour lookup instead of running
+the face model over the whole library at query time.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+from semantixel.core.config import config
+from semantixel.core.logging import logger
+from semantixel.media import FRAME_SEPARATOR, MediaDescriptor
+from semantixel.media_types import is_video_file
+
+
+class FaceIndexer:
+    """Indexes detected faces into a ChromaDB collection via DeepFace.
+
+    Each detected face becomes its own entry with the ID
+    ``<media_id>:::face<n>`` and metadata linking it back to the source
+    media item together with its bounding box.
+    """
+
+    def __init__(self, face_collection):
+        self.face_collection = face_collection
+
+    def index_faces(
+        self,
+        visual_items: List[MediaDescriptor],
+        google_drive_source=None,
+        batch_size: Optional[int] = None,
+    ) -> Set[str]:
+        """Detect and embed faces for still images, then upsert them.
+
+        Videos are skipped.  Callers pass only new or changed items, so
+        every image given is (re-)processed.
+
+        Args:
+            visual_items: Media descriptors for images and videos.
+            google_drive_source: Optional source for fetching remote images.
+            batch_size: Images per upsert (defaults to ``config.batch_size``).
+
+        Returns:
+            Media IDs whose face detection failed.
+        """
+        failed: Set[str] = set()
+        face_config = config.face
+        if not face_config.enabled:
+            return failed
+
+        image_items = [m for m in visual_items if not is_video_file(m.locator)]
+        if not image_items:
+            return failed
+
+        from deepface import DeepFace
+        from tqdm import tqdm
+
+        batch_size = batch_size or config.batch_size
+        face_ids: list = []
+        face_embeddings: list = []
+        face_metadatas: list = []
+        processed_media_ids: list = []
+        total_faces = 0
+
+        def flush_batch():
+            if processed_media_ids:
+                self.face_collection.delete(
+                    where={"source_media_id": {"$in": list(processed_media_ids)}}
+                )
+            if face_ids:
+                self.face_collection.upsert(
+                    ids=face_ids,
+                    embeddings=face_embeddings,
+                    metadatas=face_metadatas,
+                )
+            face_ids.clear()
+            face_embeddings.clear()
+            face_metadatas.clear()
+            processed_media_ids.clear()
+
+        for media in tqdm(image_items, desc="Indexing faces"):
+            try:
+                detections = DeepFace.represent(
+                    img_path=self._resolve_input(media, google_drive_source),
+                    model_name=face_config.model_name,
+                    detector_backend=face_config.detector_backend,
+                    enforce_detection=False,
+                )
+            except Exception as exc:
+                logger.debug("Face detection failed for %s: %s", media.display_path, exc)
+                failed.add(media.media_id)
+                continue
+
+            processed_media_ids.append(media.media_id)
+            for idx, detection in enumerate(detections):
+                if detection.get("face_confidence", 1.0) < face_config.min_confidence:
+                    continue
+                face_ids.append("%s%sface%d" % (media.media_id, FRAME_SEPARATOR, idx))
+                face_embeddings.append(detection["embedding"])
+                face_metadatas.append(
+                    self._face_metadata(media, detection.get("facial_area") or {}, detection)
+                )
+                total_faces += 1
+
+            if len(processed_media_ids) >= batch_size:
+                flush_batch()
+
+        flush_batch()
+        logger.info(
+            "Indexed %d faces across %d images", total_faces, len(image_items)
+        )
+        return failed
+
+    # Internal helpers
+
+    @staticmethod
+    def _resolve_input(media: MediaDescriptor, google_drive_source=None):
+        """Return a path or BGR array suitable for ``DeepFace.represent``."""
+        if media.source == "local":
+            return media.locator
+        if google_drive_source and media.source == google_drive_source.SOURCE_NAME:
+            image = google_drive_source.fetch_image(media.locator)
+            return np.array(image)[:, :, ::-1]
+        raise ValueError("Unsupported media source: %s" % media.source)
+
+    @staticmethod
+    def _face_metadata(
+        media: MediaDescriptor, area: Dict[str, Any], detection: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the metadata dict stored alongside a face embedding."""
+        return {
+            "source": media.source,
+            "source_media_id": media.media_id,
+            "locator": media.locator,
+            "display_path": media.display_path,
+            "type": "face",
+            "x": int(area.get("x", 0)),
+            "y": int(area.get("y", 0)),
+            "w": int(area.get("w", 0)),
+            "h": int(area.get("h", 0)),
+            "confidence": float(detection.get("face_confidence", 0.0)),
+        }
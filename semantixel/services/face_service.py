@@ -2,34 +2,34 @@
 
 import os
 import pickle
-import time
-from typing import Dict, List, Optional, Tuple
-import numpy as np
+from typing import Dict, List
 from deepface import DeepFace
 from semantixel.core.config import config
 from semantixel.core.logging import logger
-from semantixel.services.media_scanner import fast_scan_for_media
 
 
 class FaceService:
     """Service for face detection and similarity search.
 
-    Maintains a database of known face embeddings and searches newly
-    scanned images for matches.  The image-path cache is invalidated
-    every ``CACHE_TTL`` seconds to pick up new files.
+    Maintains a database of known face embeddings and matches them
+    against the face collection populated by
+    :class:`~semantixel.services.face_indexer.FaceIndexer` during scans.
 
     Attributes:
         face_db_path: Path to the pickle file storing known-face embeddings.
         known_faces: Dict mapping person name → face embedding vector.
+        face_collection: ChromaDB collection of indexed face embeddings.
     """
 
-    CACHE_TTL = 120  # seconds between re-scans
-
-    def __init__(self, face_db_path: str = "face_db/known_faces.pkl", face_data_dir: str = "face_data"):
+    def __init__(
+        self,
+        face_collection=None,
+        face_db_path: str = "face_db/known_faces.pkl",
+        face_data_dir: str = "face_data",
+    ):
         self.face_db_path = face_db_path
+        self.face_collection = face_collection
         self.known_faces: Dict[str, list] = {}
-        self._cached_paths: List[str] = []
-        self._cache_timestamp: float = 0.0
         self.load_db()
         self.register_faces_from_directory(face_data_dir)
 
@@ -71,7 +71,10 @@ class FaceService:
         """
         try:
             embeddings = DeepFace.represent(
-                img_path=image_path, model_name="Facenet", enforce_detection=False
+                img_path=image_path,
+                model_name=config.face.model_name,
+                detector_backend=config.face.detector_backend,
+                enforce_detection=False,
             )
             if not embeddings:
                 logger.warning("No face detected in %s", image_path)
@@ -116,65 +119,52 @@ class FaceService:
     def search_by_name(self, name_query: str, threshold: float = 0.75) -> List[str]:
         """Find images containing a known person.
 
+        Runs a single nearest-neighbour query against the face
+        collection and keeps faces whose cosine similarity exceeds
+        *threshold*.
+
         Args:
             name_query: Person name (case-insensitive lookup in DB).
             threshold: Cosine similarity threshold (0-1).
 
         Returns:
-            List of image file paths that match.
+            List of image paths (media IDs for non-local sources) that
+            match, ordered by descending similarity.
         """
         name = name_query.lower().strip()
         if name not in self.known_faces:
             logger.warning("Face for '%s' not found in database", name)
             return []
 
-        target_embedding = np.array(self.known_faces[name])
-        image_paths = self._get_image_paths()
+        if self.face_collection is None:
+            logger.warning("Face index is not available")
+            return []
 
-        logger.info("Searching for '%s' across %d images", name, len(image_paths))
+        face_count = self.face_collection.count()
+        if face_count == 0:
+            return []
 
-        results = []
-        for img_path in image_paths:
-            try:
-                embeddings = DeepFace.represent(
-                    img_path=img_path, model_name="Facenet", enforce_detection=False
-                )
-                for embedding_data in embeddings:
-                    current_embedding = np.array(embedding_data["embedding"])
-                    similarity = self._cosine_similarity(
-                        target_embedding, current_embedding
-                    )
-                    if similarity > threshold:
-                        results.append(img_path)
-                        logger.debug(
-                            "Face match found in %s (sim: %.3f)", img_path, similarity
-                        )
-                        break
-            except Exception:
+        results = self.face_collection.query(
+            query_embeddings=[self.known_faces[name]],
+            n_results=min(config.face.max_matches, face_count),
+            include=["distances", "metadatas"],
+        )
+
+        max_distance = 1.0 - threshold
+        matches: List[str] = []
+        seen_media_ids = set()
+        for distance, metadata in zip(results["distances"][0], results["metadatas"][0]):
+            if distance >= max_distance:
+                break
+            metadata = metadata or {}
+            media_id = metadata.get("source_media_id")
+            if not media_id or media_id in seen_media_ids:
                 continue
-
-        return results
-
-    # Internal
-
-    def _get_image_paths(self) -> List[str]:
-        """Return a cached list of image paths, re-scanning if stale."""
-        now = time.time()
-        if now - self._cache_timestamp > self.CACHE_TTL:
-            include_dirs = config.include_directories
-            exclude_dirs = config.exclude_directories
-            paths, _ = fast_scan_for_media(include_dirs, exclude_dirs)
-            self._cached_paths = [
-                p for p in paths if p.lower().endswith((".png", ".jpg", ".jpeg"))
-            ]
-            self._cache_timestamp = now
-        return self._cached_paths
-
-    @staticmethod
-    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-        """Compute cosine similarity between two vectors."""
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(np.dot(a, b) / (norm_a * norm_b))
+            seen_media_ids.add(media_id)
+            if metadata.get("source", "local") == "local":
+                matches.append(metadata.get("locator") or media_id)
+            else:
+                matches.append(media_id)
+
+        logger.info("Found %d face matches for '%s'", len(matches), name)
+        return matches
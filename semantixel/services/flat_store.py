@@ -0,0 +1,662 @@
+"""Memory-mapped flat vector store with exact vectorised search.
+
+An alternative to ChromaDB's HNSW index for collections of up to a few
+million vectors.  Embeddings are appended to a memory-mapped ``.npy``
+matrix; IDs, metadata and documents live in a SQLite sidecar.  Queries
+run an exact blocked matrix multiply followed by ``argpartition``, so
+latency is predictable and there is no graph to rebuild.
+
+The metadata ``type`` of every row is also kept in memory as an integer
+code, so the media-type filters sent by the search service resolve to
+a row mask instead of a SQL scan and can still use an attached
+approximate index.
+
+:class:`FlatVectorStore` implements the subset of the ChromaDB
+collection API used by Semantixel (``upsert``, ``get``, ``query``,
+``delete``, ``count``), so it can be swapped in per collection via
+``config.vector_store.backends``.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from semantixel.core.logging import logger
+
+_KEY_RE = re.compile(r"^[A-Za-z0-9_]+$")
+_COMPARATORS = {
+    "$eq": "=",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS records (
+        row INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        metadata TEXT,
+        document TEXT
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def where_to_sql(where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+    """Translate a ChromaDB-style ``where`` filter into a SQL expression.
+
+    Supports equality, ``$eq``/``$ne``/``$gt``/``$gte``/``$lt``/``$lte``,
+    ``$in``/``$nin`` and nested ``$and``/``$or`` over metadata keys.
+
+    Args:
+        where: Metadata filter dict (or ``None``).
+
+    Returns:
+        ``(sql, params)``; ``sql`` is ``"1"`` when there is no filter.
+
+    Raises:
+        ValueError: On unsupported operators or invalid keys.
+    """
+    if not where:
+        return "1", []
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            if not condition:
+                # Empty conjunction is true, empty disjunction is false.
+                clauses.append("1" if key == "$and" else "0")
+                continue
+            parts = [where_to_sql(sub) for sub in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(sql for sql, _ in parts) + ")")
+            for _, sub_params in parts:
+                params.extend(sub_params)
+            continue
+
+        if not _KEY_RE.match(key):
+            raise ValueError("Unsupported metadata key: %s" % key)
+        field = "json_extract(metadata, '$.%s')" % key
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, value in condition.items():
+            if op in _COMPARATORS:
+                clauses.append("%s %s ?" % (field, _COMPARATORS[op]))
+                params.append(value)
+            elif op in ("$in", "$nin"):
+                values = list(value)
+                if not values:
+                    clauses.append("0" if op == "$in" else "1")
+                    continue
+                placeholders = ", ".join("?" * len(values))
+                negate = "NOT " if op == "$nin" else ""
+                clauses.append("%s %sIN (%s)" % (field, negate, placeholders))
+                params.extend(values)
+            else:
+                raise ValueError("Unsupported where operator: %s" % op)
+
+    return " AND ".join(clauses), params
+
+
+class FlatVectorStore:
+    """Exact-search vector collection backed by a memory-mapped matrix.
+
+    Vectors are L2-normalised on insert so distances match ChromaDB's
+    ``cosine`` space (``1 - cosine similarity``).  Deleted rows are
+    tombstoned and reclaimed by :meth:`compact`.
+
+    Attributes:
+        name: Collection name.
+        path: Directory holding the vector matrix (``vectors.npy``, or
+            ``vectors-<generation>.npy`` after a compaction; the current
+            name is recorded in the sidecar) and ``records.sqlite3``.
+        dtype: Storage dtype (``float16`` or ``float32``).
+        block_size: Rows scored per matrix-multiply block.
+        ann_index: Optional approximate index (e.g. :class:`IVFPQIndex`)
+            used while it matches the store, for unfiltered queries and
+            for ``type`` filters matching at least ``EXACT_FILTER_RATIO``
+            of the live rows.
+    """
+
+    INITIAL_CAPACITY = 1024
+    COMPACT_RATIO = 0.25
+    EXACT_FILTER_RATIO = 0.05
+    MASK_FIELD = "type"
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        dtype: str = "float16",
+        block_size: int = 65536,
+    ):
+        self.name = name
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.block_size = max(1, block_size)
+        self._vectors_path = os.path.join(path, "vectors.npy")
+        self.ann_index = None
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(path, "records.sqlite3"), check_same_thread=False
+        )
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+        self._version = None
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._types = np.zeros(0, dtype=np.int32)
+        self._type_codes: Dict[Any, int] = {}
+        self._refresh()
+        self._remove_stale_vectors()
+
+    # ChromaDB-compatible API
+
+    def count(self) -> int:
+        """Number of live vectors."""
+        with self._lock:
+            self._refresh()
+            return len(self._row_of)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        documents: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        """Insert new vectors or overwrite existing ones in place."""
+        if not ids:
+            return
+        matrix = self._normalise(np.asarray(embeddings, dtype=np.float32))
+        metadatas = metadatas or [None] * len(ids)
+        documents = documents or [None] * len(ids)
+
+        with self._lock:
+            self._refresh()
+            self._ensure_matrix(matrix.shape[1], len(ids))
+
+            rows = []
+            records = []
+            for item_id, metadata, document in zip(ids, metadatas, documents):
+                row = self._row_of.get(item_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._ids.append(item_id)
+                    self._row_of[item_id] = row
+                rows.append(row)
+                records.append((row, item_id, json.dumps(metadata or {}), document))
+
+            self._live = self._grow(self._live, self._size)
+            self._live[rows] = True
+            self._types = self._grow(self._types, self._size)
+            self._types[rows] = [self._type_code(metadata) for metadata in metadatas]
+            self._vectors[rows] = matrix.astype(self.dtype)
+            self._vectors.flush()
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (row, id, metadata, document) "
+                "VALUES (?, ?, ?, ?)",
+                records,
+            )
+            self._bump_version()
+
+    add = upsert
+
+    def delete(
+        self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Tombstone records selected by *ids* and/or *where*.
+
+        Raises:
+            ValueError: If neither *ids* nor a non-empty *where* is given,
+                as in ChromaDB, rather than deleting every record.
+        """
+        if ids is None and not where:
+            raise ValueError("delete() needs ids or a non-empty where filter")
+        with self._lock:
+            self._refresh()
+            rows = self._select_rows(ids, where)
+            if not rows:
+                return
+            self._conn.executemany(
+                "DELETE FROM records WHERE row = ?", [(row,) for row in rows]
+            )
+            for row in rows:
+                self._row_of.pop(self._ids[row], None)
+                self._ids[row] = None
+            self._live[rows] = False
+            self._bump_version()
+
+            dead = self._size - len(self._row_of)
+            if dead > max(self.INITIAL_CAPACITY, self.COMPACT_RATIO * self._size):
+                self.compact()
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch records by ID and/or metadata filter."""
+        include = ["metadatas", "documents"] if include is None else list(include)
+        with self._lock:
+            self._refresh()
+            rows = self._select_rows(ids, where, limit=limit, offset=offset)
+            return self._format_rows(rows, include)
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Exact top-*n_results* cosine search for each query vector."""
+        include = ["metadatas", "documents", "distances"] if include is None else list(include)
+        queries = self._normalise(np.asarray(query_embeddings, dtype=np.float32))
+
+        with self._lock:
+            self._refresh()
+            candidates = None
+            mask = self._where_mask(where) if where else None
+            if where and mask is None:
+                candidates = np.asarray(self._select_rows(None, where), dtype=np.int64)
+            top_rows, top_sims = self._search(queries, n_results, candidates, mask)
+
+            result: Dict[str, Any] = {"ids": []}
+            for key in ("distances", "metadatas", "documents", "embeddings"):
+                if key in include:
+                    result[key] = []
+            for rows, sims in zip(top_rows, top_sims):
+                formatted = self._format_rows(rows.tolist(), include)
+                result["ids"].append(formatted["ids"])
+                if "distances" in include:
+                    result["distances"].append((1.0 - sims).tolist())
+                for key in ("metadatas", "documents", "embeddings"):
+                    if key in include:
+                        result[key].append(formatted[key])
+            return result
+
+    # Maintenance
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever :meth:`compact` renumbers rows."""
+        return int(self._get_info("generation") or 0)
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension (0 while the store is empty)."""
+        return self._vectors.shape[1] if self._vectors is not None else 0
+
+    def raw_state(self) -> Tuple[Optional[np.ndarray], np.ndarray, int]:
+        """Return ``(vectors, live_mask, size)`` for index builders."""
+        with self._lock:
+            self._refresh()
+            return self._vectors, self._live, self._size
+
+    def compact(self) -> None:
+        """Rewrite the matrix and sidecar without tombstoned rows.
+
+        The compacted matrix is written under a new file name, which is
+        recorded together with the row renumbering and the generation in
+        one SQLite transaction.  A crash at any point leaves either the
+        old or the new matrix consistently referenced.  An attached
+        :attr:`ann_index` is then renumbered to the new rows, and the old
+        file is removed last (best effort: on Windows it stays while
+        another process maps it, and is swept on a later open).
+        """
+        with self._lock:
+            live_rows = np.flatnonzero(self._live[: self._size])
+            logger.info(
+                "Compacting flat store '%s': %d live of %d rows",
+                self.name,
+                len(live_rows),
+                self._size,
+            )
+            dim = self._vectors.shape[1] if self._vectors is not None else 0
+            capacity = max(self.INITIAL_CAPACITY, len(live_rows))
+            generation = self.generation + 1
+            file_name = "vectors-%d.npy" % generation
+            new_path = os.path.join(self.path, file_name)
+            old_path = self._vectors_path
+            compacted = np.lib.format.open_memmap(
+                new_path, mode="w+", dtype=self.dtype, shape=(capacity, dim)
+            )
+            for start in range(0, len(live_rows), self.block_size):
+                block = live_rows[start:start + self.block_size]
+                compacted[start:start + len(block)] = self._vectors[block]
+            compacted.flush()
+            del compacted
+
+            mapping = [(int(new), int(old)) for new, old in enumerate(live_rows)]
+            old_to_new = np.full(self._size, -1, dtype=np.int64)
+            old_to_new[live_rows] = np.arange(len(live_rows))
+            try:
+                self._conn.execute("UPDATE records SET row = -row - 1")
+                self._conn.executemany(
+                    "UPDATE records SET row = ? WHERE row = ?",
+                    [(new, -old - 1) for new, old in mapping],
+                )
+                self._size = len(live_rows)
+                self._set_info("vectors_file", file_name)
+                self._set_info("generation", generation)
+                self._bump_version()
+            except BaseException:
+                self._conn.rollback()
+                self._version = None
+                self._refresh()
+                os.remove(new_path)
+                raise
+
+            self._vectors = None
+            self._version = None
+            self._refresh()
+            if self.ann_index is not None:
+                self.ann_index.remap(old_to_new, generation)
+            if old_path != new_path:
+                try:
+                    os.remove(old_path)
+                except OSError as exc:
+                    logger.debug("Old flat vectors %s not removed yet: %s", old_path, exc)
+
+    # Internal helpers
+
+    def _search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        candidates: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Top-*k* search returning per-query ``(rows, similarities)``.
+
+        Uses :attr:`ann_index` when it is current and the rows allowed
+        by *mask* are not too few; otherwise scores the allowed rows
+        exactly, block by block.
+
+        Args:
+            queries: L2-normalised query matrix.
+            k: Results per query.
+            candidates: Rows selected by a SQL filter; scored exactly.
+            mask: Rows selected by an in-memory filter (see
+                :meth:`_where_mask`); ``None`` allows every live row.
+        """
+        empty = [np.zeros(0, dtype=np.int64)] * len(queries)
+        if self._vectors is None or not self._row_of or k <= 0:
+            return empty, [np.zeros(0, dtype=np.float32)] * len(queries)
+
+        if candidates is None:
+            allowed = self._live if mask is None else mask
+            selective = mask is not None and (
+                np.count_nonzero(mask[: self._size])
+                < self.EXACT_FILTER_RATIO * len(self._row_of)
+            )
+            if (
+                not selective
+                and self.ann_index is not None
+                and self.ann_index.is_current(self)
+            ):
+                return self.ann_index.search(
+                    queries, k, self._vectors, allowed, self._size
+                )
+            candidates = np.flatnonzero(allowed[: self._size])
+        if len(candidates) == 0:
+            return empty, [np.zeros(0, dtype=np.float32)] * len(queries)
+
+        k = min(k, len(candidates))
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_sims = np.zeros((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, len(candidates), self.block_size):
+            block_rows = candidates[start:start + self.block_size]
+            block = np.asarray(self._vectors[block_rows], dtype=np.float32)
+            sims = queries @ block.T  # (n_queries, block)
+
+            merged_sims = np.concatenate([best_sims, sims], axis=1)
+            merged_rows = np.concatenate(
+                [best_rows, np.broadcast_to(block_rows, sims.shape)], axis=1
+            )
+            if merged_sims.shape[1] > k:
+                keep = np.argpartition(-merged_sims, k - 1, axis=1)[:, :k]
+                merged_sims = np.take_along_axis(merged_sims, keep, axis=1)
+                merged_rows = np.take_along_axis(merged_rows, keep, axis=1)
+            best_sims, best_rows = merged_sims, merged_rows
+
+        order = np.argsort(-best_sims, axis=1, kind="stable")
+        best_sims = np.take_along_axis(best_sims, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return list(best_rows), list(best_sims)
+
+    def _where_mask(self, where: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Resolve a filter on :attr:`MASK_FIELD` alone to a row mask.
+
+        Handles equality, ``$eq``/``$ne`` and ``$in``/``$nin``, with the
+        same semantics as :func:`where_to_sql` (rows without the field
+        never match).
+
+        Returns:
+            Boolean mask of the live matching rows, or ``None`` if
+            *where* needs the SQL path.
+        """
+        if set(where) != {self.MASK_FIELD}:
+            return None
+        condition = where[self.MASK_FIELD]
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        if len(condition) != 1:
+            return None
+        op, value = next(iter(condition.items()))
+        if op in ("$eq", "$ne"):
+            values = [value]
+        elif op in ("$in", "$nin"):
+            values = list(value)
+        else:
+            return None
+
+        codes = [self._type_codes[v] for v in values if v in self._type_codes]
+        matched = np.isin(self._types, codes)
+        if op in ("$ne", "$nin"):
+            matched = ~matched & (self._types != 0)
+        return matched & self._live
+
+    def _type_code(self, metadata: Optional[Dict[str, Any]]) -> int:
+        """Integer code of *metadata*'s :attr:`MASK_FIELD` (``0`` if absent)."""
+        value = (metadata or {}).get(self.MASK_FIELD)
+        if value is None:
+            return 0
+        return self._type_codes.setdefault(value, len(self._type_codes) + 1)
+
+    def _select_rows(
+        self,
+        ids: Optional[Sequence[str]],
+        where: Optional[Dict[str, Any]],
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[int]:
+        """Resolve IDs / filter / paging to a list of live row numbers."""
+        if ids is not None and not where:
+            rows = [self._row_of[i] for i in ids if i in self._row_of]
+            start = offset or 0
+            return rows[start:start + limit] if limit is not None else rows[start:]
+
+        sql, params = where_to_sql(where)
+        if ids is not None:
+            id_list = list(ids)
+            if not id_list:
+                return []
+            sql = "(%s) AND id IN (%s)" % (sql, ", ".join("?" * len(id_list)))
+            params = params + id_list
+        statement = "SELECT row FROM records WHERE %s ORDER BY row" % sql
+        if limit is not None or offset:
+            statement += " LIMIT ? OFFSET ?"
+            params = params + [limit if limit is not None else -1, offset or 0]
+        return [row for (row,) in self._conn.execute(statement, params)]
+
+    def _format_rows(self, rows: List[int], include: Sequence[str]) -> Dict[str, Any]:
+        """Build a ChromaDB-style ``get`` result for *rows*."""
+        result: Dict[str, Any] = {"ids": [self._ids[row] for row in rows]}
+        if "metadatas" in include or "documents" in include:
+            lookup = self._fetch_records(rows)
+            if "metadatas" in include:
+                result["metadatas"] = [lookup.get(row, (None, None))[0] for row in rows]
+            if "documents" in include:
+                result["documents"] = [lookup.get(row, (None, None))[1] for row in rows]
+        if "embeddings" in include:
+            result["embeddings"] = (
+                np.asarray(self._vectors[rows], dtype=np.float32).tolist() if rows else []
+            )
+        return result
+
+    def _fetch_records(self, rows: List[int]) -> Dict[int, Tuple[Dict[str, Any], Optional[str]]]:
+        """Load metadata and documents for *rows* in chunks."""
+        lookup: Dict[int, Tuple[Dict[str, Any], Optional[str]]] = {}
+        for start in range(0, len(rows), 500):
+            chunk = rows[start:start + 500]
+            statement = "SELECT row, metadata, document FROM records WHERE row IN (%s)" % (
+                ", ".join("?" * len(chunk))
+            )
+            for row, metadata, document in self._conn.execute(statement, chunk):
+                lookup[row] = (json.loads(metadata) if metadata else {}, document)
+        return lookup
+
+    def _ensure_matrix(self, dim: int, extra_rows: int) -> None:
+        """Create or grow the memory-mapped matrix to fit *extra_rows* more."""
+        if self._vectors is not None and self._vectors.shape[1] != dim:
+            raise ValueError(
+                "Embedding dimension %d does not match collection '%s' (%d)"
+                % (dim, self.name, self._vectors.shape[1])
+            )
+        needed = self._size + extra_rows
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(self.INITIAL_CAPACITY, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        tmp_path = self._vectors_path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=self.dtype, shape=(new_capacity, dim)
+        )
+        if self._vectors is not None:
+            for start in range(0, self._size, self.block_size):
+                end = min(start + self.block_size, self._size)
+                grown[start:end] = self._vectors[start:end]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp_path, self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+
+    def _refresh(self) -> None:
+        """Reload in-memory row state if another process wrote to the store."""
+        version = self._get_info("version")
+        if version == self._version and self._vectors is not None:
+            return
+        self._vectors_path = os.path.join(
+            self.path, self._get_info("vectors_file") or "vectors.npy"
+        )
+        if version == self._version and not os.path.exists(self._vectors_path):
+            return
+
+        self._version = version
+        self._size = int(self._get_info("size") or 0)
+        self._vectors = (
+            np.load(self._vectors_path, mmap_mode="r+")
+            if os.path.exists(self._vectors_path)
+            else None
+        )
+        self._ids = [None] * self._size
+        self._row_of = {}
+        self._live = np.zeros(self._size, dtype=bool)
+        self._types = np.zeros(self._size, dtype=np.int32)
+        self._type_codes = {}
+        statement = "SELECT row, id, json_extract(metadata, '$.%s') FROM records" % (
+            self.MASK_FIELD
+        )
+        for row, item_id, value in self._conn.execute(statement):
+            self._ids[row] = item_id
+            self._row_of[item_id] = row
+            self._live[row] = True
+            self._types[row] = self._type_code({self.MASK_FIELD: value})
+
+    def _remove_stale_vectors(self) -> None:
+        """Delete matrices of earlier generations left behind by :meth:`compact`.
+
+        Only files of older generations are touched, so a compaction
+        running in another process keeps the file it is still writing.
+        """
+        generation = self.generation
+        for name in os.listdir(self.path):
+            if name == "vectors.npy":
+                file_generation = 0
+            elif name.startswith("vectors-") and name.endswith(".npy"):
+                try:
+                    file_generation = int(name[len("vectors-"):-len(".npy")])
+                except ValueError:
+                    continue
+            else:
+                continue
+            full_path = os.path.join(self.path, name)
+            if file_generation >= generation or full_path == self._vectors_path:
+                continue
+            try:
+                os.remove(full_path)
+            except OSError:
+                continue
+
+    def _bump_version(self) -> None:
+        """Persist the row count and a new version stamp, then commit."""
+        self._set_info("size", self._size)
+        version = str(int(self._get_info("version") or 0) + 1)
+        self._set_info("version", version)
+        self._conn.commit()
+        self._version = version
+
+    def _get_info(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: Any) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        """Extend a per-row array to *size* entries (new entries are zero)."""
+        if len(array) >= size:
+            return array
+        grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    @staticmethod
+    def _normalise(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalise rows (zero rows are left untouched)."""
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
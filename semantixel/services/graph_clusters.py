@@ -0,0 +1,196 @@
+"""Hierarchical clustering of the semantic graph for level-of-detail views.
+
+Sending every node and link of a large library to the browser does not
+scale.  :class:`ClusterHierarchy` groups the CLIP embeddings of the
+graph into a tree of super-nodes by recursive k-means: the root holds
+every item, each cluster with more than ``leaf_size`` items is split
+into at most ``branching`` children, and the leaves hold the items
+themselves.  A view of level ``N`` therefore has at most
+``branching ** N`` nodes whatever the library size, and expanding one
+cluster returns at most ``branching`` children or ``leaf_size`` items.
+
+Links between clusters aggregate the item edges of the kNN graph that
+cross them: ``count`` is the number of such edges and ``value`` their
+mean similarity.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import numpy as np
+from semantixel.core.logging import logger
+
+ROOT_ID = "0"
+
+
+@dataclass
+class Cluster:
+    """One super-node of the hierarchy.
+
+    Attributes:
+        cluster_id: Dotted path from the root (``"0"``, ``"0.3"``, ``"0.3.1"``).
+        rows: Graph rows of the member items.
+        representative: Row of the member closest to the cluster centroid.
+        children: IDs of the sub-clusters; empty for leaves.
+    """
+
+    cluster_id: str
+    rows: np.ndarray
+    representative: int
+    children: List[str] = field(default_factory=list)
+
+    @property
+    def level(self) -> int:
+        """Depth at which the cluster was created (the root is level 0)."""
+        return self.cluster_id.count(".")
+
+
+class ClusterHierarchy:
+    """Tree of k-means clusters over the nodes of the semantic graph.
+
+    Usage::
+
+        hierarchy = ClusterHierarchy.build(embeddings, branching=16, leaf_size=256)
+        top = hierarchy.level(1)
+        children = [hierarchy.clusters[c] for c in top[0].children]
+
+    Leaves are carried down unchanged, so :meth:`level` always covers
+    every item exactly once.
+
+    Attributes:
+        clusters: Every cluster by ID.
+        depth: Deepest level at which a cluster was split.
+    """
+
+    def __init__(self, clusters: Dict[str, Cluster], levels: List[List[str]]):
+        self.clusters = clusters
+        self._levels = levels
+        self.depth = len(levels) - 1
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        branching: int = 16,
+        leaf_size: int = 256,
+        seed: int = 0,
+    ) -> "ClusterHierarchy":
+        """Cluster *embeddings* recursively.
+
+        Args:
+            embeddings: ``(n, d)`` embeddings in graph row order.
+            branching: Maximum children per split.
+            leaf_size: Largest cluster that is not split.
+            seed: Random seed for k-means.
+
+        Returns:
+            The cluster hierarchy.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        normalized = embeddings / np.maximum(norms, 1e-12)
+        branching = max(2, branching)
+        leaf_size = max(1, leaf_size)
+
+        rows = np.arange(len(normalized))
+        root = Cluster(ROOT_ID, rows, cls._representative(normalized, rows))
+        clusters = {ROOT_ID: root}
+        levels = [[ROOT_ID]]
+        frontier = [root] if len(rows) > leaf_size else []
+
+        while frontier:
+            next_frontier = []
+            for cluster in frontier:
+                x = normalized[cluster.rows]
+                labels = MiniBatchKMeans(
+                    n_clusters=min(branching, len(x)),
+                    random_state=seed,
+                    batch_size=4096,
+                    n_init=1,
+                ).fit_predict(x)
+                groups = [np.flatnonzero(labels == label) for label in np.unique(labels)]
+                if len(groups) < 2:
+                    continue
+                for index, group in enumerate(groups):
+                    member_rows = cluster.rows[group]
+                    child = Cluster(
+                        "%s.%d" % (cluster.cluster_id, index),
+                        member_rows,
+                        cls._representative(normalized, member_rows),
+                    )
+                    clusters[child.cluster_id] = child
+                    cluster.children.append(child.cluster_id)
+                    if len(member_rows) > leaf_size:
+                        next_frontier.append(child)
+
+            if not any(clusters[c].children for c in levels[-1]):
+                break
+            levels.append([
+                child
+                for cluster_id in levels[-1]
+                for child in (clusters[cluster_id].children or [cluster_id])
+            ])
+            frontier = next_frontier
+
+        logger.info(
+            "Clustered %d graph nodes into %d clusters over %d levels",
+            len(rows), len(clusters), len(levels) - 1,
+        )
+        return cls(clusters, levels)
+
+    def level(self, level: int) -> List[Cluster]:
+        """Clusters covering every item at *level* (clamped to :attr:`depth`)."""
+        return [self.clusters[c] for c in self._levels[max(0, min(level, self.depth))]]
+
+    @staticmethod
+    def aggregate_links(
+        groups: List[np.ndarray],
+        size: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        values: np.ndarray,
+    ) -> List[Tuple[int, int, int, float]]:
+        """Aggregate item edges into links between groups of rows.
+
+        Edges with an end outside every group, or inside a single group,
+        are ignored.
+
+        Args:
+            groups: Disjoint arrays of graph rows.
+            size: Total number of graph rows.
+            sources: Edge source rows.
+            targets: Edge target rows.
+            values: Edge similarities.
+
+        Returns:
+            ``(group_a, group_b, count, mean_value)`` tuples with
+            ``group_a < group_b``, most edges first.
+        """
+        labels = np.full(size, -1, dtype=np.int64)
+        for index, rows in enumerate(groups):
+            labels[rows] = index
+        a = labels[sources]
+        b = labels[targets]
+        keep = (a >= 0) & (b >= 0) & (a != b)
+        if not keep.any():
+            return []
+
+        low = np.minimum(a[keep], b[keep])
+        high = np.maximum(a[keep], b[keep])
+        keys, inverse, counts = np.unique(
+            low * len(groups) + high, return_inverse=True, return_counts=True
+        )
+        means = np.bincount(inverse, weights=values[keep]) / counts
+        order = np.lexsort((keys, -counts))
+        return [
+            (int(keys[i] // len(groups)), int(keys[i] % len(groups)), int(counts[i]), float(means[i]))
+            for i in order
+        ]
+
+    @staticmethod
+    def _representative(normalized: np.ndarray, rows: np.ndarray) -> int:
+        """Row of the member most similar to the mean of *rows*."""
+        if not len(rows):
+            return -1
+        members = normalized[rows]
+        return int(rows[np.argmax(members @ members.mean(axis=0))])
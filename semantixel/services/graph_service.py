@@ -1,52 +1,136 @@
 """Semantic graph generation — builds a similarity graph from embeddings."""
 
 import os
+import threading
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import torch
 import torch.nn.functional as F
+from semantixel.core.config import config
 from semantixel.core.logging import logger
-from semantixel.media import parse_media_id
+from semantixel.media import describe_local_media, parse_media_id
+from semantixel.services.graph_clusters import Cluster, ClusterHierarchy
+from semantixel.services.graph_store import Graph, GraphStore, extract_edges, knn_rows
+
+# ``(sources, targets, values)`` arrays from :func:`extract_edges`.
+Edges = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
 
 class GraphService:
     """Generates a semantic similarity graph from a ChromaDB collection.
 
     Each node represents an indexed media item.  Edges connect the top-3
-    nearest neighbours (cosine similarity > 0.5).
+    nearest neighbours (cosine similarity > 0.5).  When a
+    :class:`GraphStore` is given, the full graph is served from it and
+    only built from the collection when nothing usable is stored, and
+    level-of-detail views of it are available through
+    :meth:`generate_level` and :meth:`expand_cluster`.
+
+    Views of the stored graph are returned with the ETag of the graph
+    they were built from, for HTTP revalidation.
     """
 
     TOP_K_NEIGHBORS = 3
     MIN_SIMILARITY = 0.5
+    # Similarity scores held at once while searching neighbours (64 MiB).
+    BLOCK_ELEMENTS = 1 << 24
 
-    def __init__(self, image_collection):
+    def __init__(self, image_collection, graph_store: Optional[GraphStore] = None):
         self.image_collection = image_collection
+        self.graph_store = graph_store
+        self._hierarchy_lock = threading.Lock()
+        self._hierarchy: Optional[Tuple[str, Graph, ClusterHierarchy, Edges]] = None
+        self._nodes_lock = threading.Lock()
+        self._nodes: Optional[Tuple[List[str], List[Dict[str, Any]]]] = None
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Version tag of the stored full graph, if one is stored."""
+        return self.graph_store.etag if self.graph_store is not None else None
 
-    def generate(self) -> Dict[str, Any]:
+    def generate(self) -> Tuple[Dict[str, Any], Optional[str]]:
         """Build and return the full graph.
 
         Returns:
             A dict with ``"nodes"`` and ``"links"`` lists suitable for
-            JSON serialisation.
+            JSON serialisation, and the ETag of the stored graph it was
+            built from (``None`` without a :class:`GraphStore`).
         """
-        t0 = time.time()
-        data = self.image_collection.get(include=["embeddings", "metadatas"])
-        ids = data["ids"]
-        embeddings = data["embeddings"]
+        if self.graph_store is None:
+            data = self.image_collection.get(include=["embeddings", "metadatas"])
+            if not data["ids"]:
+                return {"nodes": [], "links": []}, None
+            return self._generate_from(data["ids"], data["embeddings"]), None
 
-        if not ids:
-            return {"nodes": [], "links": []}
+        t0 = time.time()
+        (ids, neighbors, weights), etag = self._stored_graph()
 
-        nodes = self._build_nodes(ids, data.get("metadatas") or [])
-        links = self._build_links(ids, embeddings)
+        nodes = [dict(node) for node in self._stored_nodes(ids)]
+        links = self._links_from_neighbors(ids, weights, neighbors)
 
         logger.info(
-            "Generated Semantic Graph: %d nodes, %d edges in %.3fs",
+            "Served Semantic Graph: %d nodes, %d edges in %.3fs",
             len(nodes),
             len(links),
             time.time() - t0,
         )
-        return {"nodes": nodes, "links": links}
+        return {"nodes": nodes, "links": links}, etag
+
+    def generate_level(self, level: int) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return the graph of the clusters at one level of detail.
+
+        Args:
+            level: Hierarchy depth; ``0`` is a single root cluster and
+                deeper levels are clamped to the deepest one.
+
+        Returns:
+            A dict with the effective ``"level"``, the hierarchy
+            ``"depth"``, and ``"nodes"``/``"links"`` lists of clusters,
+            and the ETag of the stored graph.
+        """
+        etag, graph, hierarchy, edges = self._cluster_hierarchy()
+        clusters = hierarchy.level(level)
+        return {
+            "level": min(max(0, level), hierarchy.depth),
+            "depth": hierarchy.depth,
+            **self._cluster_graph(graph, clusters, edges),
+        }, etag
+
+    def expand_cluster(self, cluster_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return the contents of one cluster.
+
+        Split clusters expand to their sub-clusters; leaves expand to
+        their media items and the kNN edges between them.
+
+        Args:
+            cluster_id: ID from a level or cluster view.
+
+        Returns:
+            A dict with ``"cluster"``, ``"nodes"`` and ``"links"``, and
+            the ETag of the stored graph.
+
+        Raises:
+            KeyError: If no cluster has that ID.
+        """
+        etag, graph, hierarchy, edges = self._cluster_hierarchy()
+        cluster = hierarchy.clusters[cluster_id]
+        if cluster.children:
+            children = [hierarchy.clusters[c] for c in cluster.children]
+            return {"cluster": cluster_id, **self._cluster_graph(graph, children, edges)}, etag
+
+        ids = graph[0]
+        sources, targets, values = edges
+        inside = np.zeros(len(ids), dtype=bool)
+        inside[cluster.rows] = True
+        keep = np.flatnonzero(inside[sources] & inside[targets])
+        keep = np.sort(keep[np.argsort(-values[keep], kind="stable")[:config.graph.max_links]])
+        nodes = self._stored_nodes(ids)
+        return {
+            "cluster": cluster_id,
+            "nodes": [dict(nodes[row]) for row in cluster.rows.tolist()],
+            "links": self._edge_dicts(ids, sources[keep], targets[keep], values[keep]),
+        }, etag
 
     def generate_for_ids(self, ids: List[str]) -> Dict[str, Any]:
         """Build a filtered graph containing only the specified IDs.
@@ -62,13 +146,13 @@ class GraphService:
 
         t0 = time.time()
         data = self.image_collection.get(
-            ids=ids, include=["embeddings", "metadatas"]
+            ids=ids, include=["embeddings"]
         )
         result_ids = data["ids"]
         if not result_ids:
             return {"nodes": [], "links": []}
 
-        nodes = self._build_nodes(result_ids, data.get("metadatas") or [])
+        nodes = self._build_nodes(result_ids)
         links = self._build_links(result_ids, data["embeddings"])
 
         logger.info(
@@ -81,62 +165,183 @@ class GraphService:
 
     # Internal
 
+    def _stored_graph(self) -> Tuple[Graph, Optional[str]]:
+        """Load the persisted graph, building it if nothing usable is stored.
+
+        Returns the graph and its ETag.  The tag is read before the graph,
+        so a concurrent swap can only leave it older than the graph; a
+        client then refetches once instead of caching stale data under
+        the new tag.
+        """
+        etag = self.graph_store.etag
+        graph = self.graph_store.load(expected_size=self.image_collection.count())
+        if graph is None:
+            graph = self.graph_store.build(self.image_collection)
+            etag = self.graph_store.etag
+        return graph, etag
+
+    def _stored_nodes(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Node dicts of the stored graph's rows, built once per stored graph.
+
+        :class:`GraphStore` returns the same ``ids`` list until its ETag
+        changes, so the list is the cache key; the cache therefore holds
+        exactly one graph's nodes, whatever its size.  Callers copy the
+        dicts they hand out.
+        """
+        with self._nodes_lock:
+            if self._nodes is None or self._nodes[0] is not ids:
+                self._nodes = (ids, self._build_nodes(ids))
+            return self._nodes[1]
+
+    def _cluster_hierarchy(self) -> Tuple[Optional[str], Graph, ClusterHierarchy, Edges]:
+        """Return the stored graph's ETag, the graph, its clusters and its edges.
+
+        Clusters and edges are computed once per stored graph (keyed by
+        its ETag) and reused by every level and cluster view.
+        """
+        if self.graph_store is None:
+            raise RuntimeError("Level-of-detail graphs require a GraphStore")
+        with self._hierarchy_lock:
+            graph, etag = self._stored_graph()
+            if self._hierarchy is None or self._hierarchy[0] != etag:
+                embeddings = self.graph_store.read_embeddings(self.image_collection, graph[0])
+                hierarchy = ClusterHierarchy.build(
+                    embeddings,
+                    branching=config.graph.branching,
+                    leaf_size=config.graph.leaf_size,
+                )
+                edges = extract_edges(graph[1], graph[2], self.MIN_SIMILARITY)
+                self._hierarchy = (etag, graph, hierarchy, edges)
+            return self._hierarchy
+
+    def _cluster_graph(
+        self, graph: Graph, clusters: List[Cluster], edges: Edges
+    ) -> Dict[str, Any]:
+        """Build cluster nodes and the aggregated links between them."""
+        ids = graph[0]
+        if not ids:
+            return {"nodes": [], "links": []}
+        sources, targets, values = edges
+        links = ClusterHierarchy.aggregate_links(
+            [cluster.rows for cluster in clusters], len(ids), sources, targets, values
+        )[:config.graph.max_links]
+
+        stored_nodes = self._stored_nodes(ids)
+        representatives = [dict(stored_nodes[c.representative]) for c in clusters]
+        nodes = [
+            {
+                "id": cluster.cluster_id,
+                "level": cluster.level,
+                "size": len(cluster.rows),
+                "isLeaf": not cluster.children,
+                "representative": representative,
+            }
+            for cluster, representative in zip(clusters, representatives)
+        ]
+        return {
+            "nodes": nodes,
+            "links": [
+                {
+                    "source": clusters[a].cluster_id,
+                    "target": clusters[b].cluster_id,
+                    "value": value,
+                    "count": count,
+                }
+                for a, b, count, value in links
+            ],
+        }
+
+    def _generate_from(self, ids: List[str], embeddings: List[List[float]]) -> Dict[str, Any]:
+        """Build the full graph directly from *ids* and *embeddings*."""
+        t0 = time.time()
+        nodes = self._build_nodes(ids)
+        links = self._build_links(ids, embeddings)
+
+        logger.info(
+            "Generated Semantic Graph: %d nodes, %d edges in %.3fs",
+            len(nodes),
+            len(links),
+            time.time() - t0,
+        )
+        return {"nodes": nodes, "links": links}
+
     @staticmethod
-    def _build_nodes(ids: List[str], metadatas: List[Any]) -> List[Dict[str, Any]]:
-        """Convert ChromaDB records into graph node dicts."""
-        nodes = []
-        for doc_id, metadata in zip(ids, metadatas):
-            try:
-                parsed = parse_media_id(doc_id).to_result()
-            except ValueError:
-                from semantixel.media import describe_local_media
-
-                parsed = describe_local_media(doc_id).to_result()
-
-            nodes.append({
-                "id": doc_id,
-                **parsed,
-                "fileName": os.path.basename(parsed["path"]),
-            })
-        return nodes
+    def _build_nodes(ids: List[str]) -> List[Dict[str, Any]]:
+        """Convert ChromaDB IDs into graph node dicts."""
+        return [_graph_node(doc_id) for doc_id in ids]
 
     @staticmethod
     def _build_links(
         ids: List[str], embeddings: List[List[float]]
     ) -> List[Dict[str, Any]]:
-        """Compute cosine-similarity edges between all node pairs."""
+        """Compute cosine-similarity edges to each node's nearest neighbours."""
         if len(ids) < 2:
             return []
 
-        embs_tensor = torch.tensor(embeddings)
-        sim_matrix = F.cosine_similarity(
-            embs_tensor.unsqueeze(1), embs_tensor.unsqueeze(0), dim=2
+        top_values, top_indices = GraphService._knn(
+            torch.tensor(embeddings, dtype=torch.float32),
+            min(GraphService.TOP_K_NEIGHBORS, len(ids) - 1),
         )
+        return GraphService._links_from_neighbors(ids, top_values, top_indices)
 
-        links = []
-        seen_edges: set = set()
+    @staticmethod
+    def _links_from_neighbors(
+        ids: List[str], top_values: Any, top_indices: Any
+    ) -> List[Dict[str, Any]]:
+        """Turn per-node neighbour lists into de-duplicated edges.
 
-        sim_matrix.fill_diagonal_(-1.0)
-        top_values, top_indices = torch.topk(
-            sim_matrix,
-            min(GraphService.TOP_K_NEIGHBORS, len(ids) - 1),
-            dim=1,
+        Edges are kept in the order a row-major walk of the neighbour
+        lists first meets them, oriented from that row.
+        """
+        sources, targets, values = extract_edges(
+            np.asarray(top_indices), np.asarray(top_values), GraphService.MIN_SIMILARITY
+        )
+        return GraphService._edge_dicts(ids, sources, targets, values)
+
+    @staticmethod
+    def _edge_dicts(
+        ids: List[str], sources: np.ndarray, targets: np.ndarray, values: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Build link dicts from edge arrays over graph rows."""
+        return [
+            {"source": ids[source], "target": ids[target], "value": value}
+            for source, target, value in zip(
+                sources.tolist(), targets.tolist(), values.tolist()
+            )
+        ]
+
+    @staticmethod
+    def _knn(embeddings: torch.Tensor, k: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Find the *k* most cosine-similar other rows of every row.
+
+        Rows are L2-normalised once and searched a block at a time (see
+        :func:`knn_rows`), so peak memory is one ``block × n``
+        similarity block rather than ``n × n × d``.
+
+        Args:
+            embeddings: ``(n, d)`` embedding matrix.
+            k: Neighbours per row (at most ``n - 1``).
+
+        Returns:
+            ``(values, indices)``, both ``(n, k)``, sorted by descending
+            similarity per row.
+        """
+        return knn_rows(
+            F.normalize(embeddings, dim=1),
+            torch.arange(embeddings.shape[0]),
+            k,
+            GraphService.BLOCK_ELEMENTS,
         )
 
-        for i, source_id in enumerate(ids):
-            for j in range(top_indices.shape[1]):
-                target_idx = top_indices[i, j].item()
-                similarity = top_values[i, j].item()
-                target_id = ids[target_idx]
-
-                if similarity > GraphService.MIN_SIMILARITY:
-                    edge_tuple = tuple(sorted([source_id, target_id]))
-                    if edge_tuple not in seen_edges:
-                        seen_edges.add(edge_tuple)
-                        links.append({
-                            "source": source_id,
-                            "target": target_id,
-                            "value": float(similarity),
-                        })
-
-        return links
+
+def _graph_node(doc_id: str) -> Dict[str, Any]:
+    """Graph node dict for one ChromaDB ID."""
+    try:
+        parsed = parse_media_id(doc_id).to_result()
+    except ValueError:
+        parsed = describe_local_media(doc_id).to_result()
+    return {
+        "id": doc_id,
+        **parsed,
+        "fileName": os.path.basename(parsed["path"]),
+    }
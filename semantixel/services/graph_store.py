@@ -0,0 +1,453 @@
+"""Persisted k-nearest-neighbour graph over the image collection.
+
+Rebuilding the semantic graph means reading every embedding and running
+an ``n × n`` similarity search.  :class:`GraphStore` keeps the result
+next to the index instead: for each item, the row numbers of its ``k``
+most similar items (``int32``) and their cosine similarities
+(``float16``).  After a scan only the rows touched by that scan are
+recomputed:
+
+* items of added or changed media get a fresh neighbour search;
+* items whose stored neighbours were removed or changed are searched
+  again as well;
+* every other item only compares its stored neighbours with the
+  touched items, which may now be closer.
+
+Each write goes to a fresh ``gen-*`` directory holding the arrays and
+a ``meta.json`` whose ``etag`` changes whenever the graph does, so HTTP
+clients can revalidate cheaply.  A ``CURRENT`` file names the live
+generation and is repointed with ``os.replace``, so a reader in another
+process (the web server while a scan runs) never sees a half-written or
+missing graph.  Superseded generations are removed after the switch.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+import torch
+import torch.nn.functional as F
+from semantixel.core.logging import logger
+from semantixel.services.collection_utils import iter_collection_pages
+
+FORMAT_VERSION = 1
+
+# Touched fraction above which an update rebuilds the whole graph.
+REBUILD_FRACTION = 0.5
+
+# Age after which an unfinished write's staging directory is removed.
+STALE_STAGING_SECONDS = 3600
+
+Graph = Tuple[List[str], np.ndarray, np.ndarray]
+
+
+def knn_rows(
+    normalized: torch.Tensor, rows: torch.Tensor, k: int, block_elements: int
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Find the *k* most cosine-similar other rows of selected rows.
+
+    The selected rows are multiplied against the full matrix a block at
+    a time, so peak memory is one ``block × n`` similarity block.
+
+    Args:
+        normalized: ``(n, d)`` L2-normalised embedding matrix.
+        rows: Row numbers to search neighbours for.
+        k: Neighbours per row (at most ``n - 1``).
+        block_elements: Similarity scores held at once.
+
+    Returns:
+        ``(values, indices)``, both ``(len(rows), k)``, sorted by
+        descending similarity per row.
+    """
+    n = normalized.shape[0]
+    block = max(1, block_elements // n)
+    values = torch.empty((len(rows), k), dtype=normalized.dtype)
+    indices = torch.empty((len(rows), k), dtype=torch.long)
+
+    with torch.no_grad():
+        for start in range(0, len(rows), block):
+            chunk = rows[start:start + block]
+            sims = normalized[chunk] @ normalized.T
+            sims[torch.arange(len(chunk)), chunk] = -1.0
+            values[start:start + block], indices[start:start + block] = torch.topk(
+                sims, k, dim=1
+            )
+
+    return values, indices
+
+
+def extract_edges(
+    neighbors: np.ndarray, weights: np.ndarray, min_similarity: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Turn per-row neighbour lists into de-duplicated undirected edges.
+
+    An edge listed by both of its ends is kept once, from the row that
+    lists it first in row-major order.
+
+    Args:
+        neighbors: ``(n, k)`` neighbour rows (``-1`` for padding).
+        weights: ``(n, k)`` similarities matching *neighbors*.
+        min_similarity: Edges must score strictly above this.
+
+    Returns:
+        ``(sources, targets, values)`` arrays in first-seen order.
+    """
+    n, k = neighbors.shape
+    flat_weights = np.asarray(weights, dtype=np.float32).ravel()
+    flat_targets = np.asarray(neighbors, dtype=np.int64).ravel()
+    flat_sources = np.repeat(np.arange(n, dtype=np.int64), k)
+    keep = np.flatnonzero((flat_weights > min_similarity) & (flat_targets >= 0))
+    if not len(keep):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    sources = flat_sources[keep]
+    targets = flat_targets[keep]
+    keys = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    return sources[first], targets[first], flat_weights[keep][first]
+
+
+class GraphStore:
+    """On-disk kNN graph maintained incrementally by index scans.
+
+    Usage::
+
+        store = GraphStore(os.path.join(db_path, "graph"))
+        ids, neighbors, weights = store.load() or store.build(collection)
+        store.update(collection, touched_media_ids)
+
+    ``neighbors[i]`` holds the row numbers of the nearest items of
+    ``ids[i]`` in descending similarity, padded with ``-1`` (weight
+    ``-inf``) when the collection has fewer than ``k + 1`` items.
+
+    Attributes:
+        path: Directory holding the ``CURRENT`` pointer and the ``gen-*``
+            directories (``ids.json``, the arrays and ``meta.json``).
+        k: Neighbours stored per item.
+        block_elements: Similarity scores held at once while searching.
+    """
+
+    def __init__(self, path: str, k: int = 3, block_elements: int = 1 << 24):
+        self.path = path
+        self.k = k
+        self.block_elements = block_elements
+        self._graph: Optional[Graph] = None
+        self._meta: Optional[dict] = None
+        self._generation: Optional[str] = None
+
+    # Public API
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Content hash of the stored graph, or ``None`` if there is none."""
+        self._reload_if_changed()
+        return self._meta["etag"] if self._meta else None
+
+    def load(self, expected_size: Optional[int] = None) -> Optional[Graph]:
+        """Return the stored graph, re-reading it if another process rewrote it.
+
+        Args:
+            expected_size: Current number of items in the collection; a
+                stored graph of another size is treated as missing.
+
+        Returns:
+            ``(ids, neighbors, weights)``, or ``None`` when no usable
+            graph is stored.
+        """
+        self._reload_if_changed()
+        if self._meta is None:
+            return None
+        if expected_size is not None and self._meta["size"] != expected_size:
+            logger.info(
+                "Stored graph has %d nodes but the collection has %d; ignoring it",
+                self._meta["size"], expected_size,
+            )
+            return None
+        return self._graph
+
+    def build(self, collection) -> Graph:
+        """Compute the full graph of *collection* and persist it."""
+        ids, _, embeddings = self._read(collection)
+        return self._build(ids, embeddings)
+
+    def update(self, collection, media_ids: Iterable[str]) -> bool:
+        """Refresh the graph after a scan touched *media_ids*.
+
+        Does nothing when no graph has been built yet; the first graph
+        request builds it.
+
+        Args:
+            collection: The image collection, already updated by the scan.
+            media_ids: Media added, changed or deleted by the scan.
+
+        Returns:
+            Whether a stored graph was updated.
+        """
+        stored = self.load()
+        if stored is None:
+            return False
+        old_ids, old_neighbors, old_weights = stored
+
+        ids, owners, embeddings = self._read(collection)
+        if len(ids) < 2:
+            self._build(ids, embeddings)
+            return True
+
+        old_rows = {item_id: row for row, item_id in enumerate(old_ids)}
+        touched_media = set(media_ids)
+        touched = np.array([
+            item_id not in old_rows or item_id in touched_media or owner in touched_media
+            for item_id, owner in zip(ids, owners)
+        ], dtype=bool)
+
+        # Carry surviving rows over, renumbering their neighbours.
+        position = {item_id: row for row, item_id in enumerate(ids)}
+        remap = np.array([position.get(item_id, -1) for item_id in old_ids], dtype=np.int64)
+        neighbors = np.full((len(ids), self.k), -1, dtype=np.int64)
+        weights = np.full((len(ids), self.k), -np.inf, dtype=np.float32)
+        kept = np.flatnonzero(remap >= 0)
+        previous = old_neighbors[kept].astype(np.int64)
+        mapped = np.where(previous >= 0, remap[np.maximum(previous, 0)], -1)
+        neighbors[remap[kept]] = mapped
+        weights[remap[kept]] = old_weights[kept]
+
+        dirty = touched.copy()
+        dirty[remap[kept][((previous >= 0) & (mapped < 0)).any(axis=1)]] = True
+        dirty |= ((neighbors >= 0) & touched[np.maximum(neighbors, 0)]).any(axis=1)
+
+        if not dirty.any() and len(ids) == len(old_ids):
+            return False
+        if dirty.mean() > REBUILD_FRACTION:
+            self._build(ids, embeddings)
+            return True
+
+        normalized = F.normalize(embeddings, dim=1)
+        self._merge_touched(normalized, np.flatnonzero(touched), ~dirty, neighbors, weights)
+        self._search_rows(normalized, np.flatnonzero(dirty), neighbors, weights)
+        self._write(ids, neighbors, weights)
+        logger.info(
+            "Semantic graph updated: %d nodes, %d touched, %d re-searched",
+            len(ids), int(touched.sum()), int(dirty.sum()),
+        )
+        return True
+
+    def read_embeddings(self, collection, ids: List[str]) -> np.ndarray:
+        """Read the embeddings of *ids* from *collection*, in that order.
+
+        Items no longer in the collection get zero vectors.
+
+        Returns:
+            ``(len(ids), d)`` ``float32`` matrix.
+        """
+        found_ids, _, embeddings = self._read(collection)
+        if not found_ids:
+            # An empty collection reads as a ``(0,)`` tensor.
+            return np.zeros((len(ids), 0), dtype=np.float32)
+        matrix = embeddings.numpy().reshape(len(found_ids), -1)
+        position = {item_id: row for row, item_id in enumerate(found_ids)}
+        rows = np.array([position.get(item_id, -1) for item_id in ids], dtype=np.int64)
+        aligned = np.zeros((len(ids), matrix.shape[1]), dtype=np.float32)
+        aligned[rows >= 0] = matrix[rows[rows >= 0]]
+        return aligned
+
+    def clear(self) -> None:
+        """Delete the stored graph.
+
+        The ``CURRENT`` pointer is removed first, so readers see no graph
+        rather than a partly deleted one.
+        """
+        try:
+            os.remove(os.path.join(self.path, "CURRENT"))
+        except OSError:
+            pass
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._graph = None
+        self._meta = None
+        self._generation = None
+
+    # Internal helpers
+
+    def _build(self, ids: List[str], embeddings: torch.Tensor) -> Graph:
+        """Search neighbours for every item and persist the graph."""
+        neighbors = np.full((len(ids), self.k), -1, dtype=np.int64)
+        weights = np.full((len(ids), self.k), -np.inf, dtype=np.float32)
+        if len(ids) > 1:
+            normalized = F.normalize(embeddings, dim=1)
+            self._search_rows(normalized, np.arange(len(ids)), neighbors, weights)
+        self._write(ids, neighbors, weights)
+        logger.info("Built semantic graph: %d nodes", len(ids))
+        return self._graph
+
+    @staticmethod
+    def _read(collection) -> Tuple[List[str], List[str], torch.Tensor]:
+        """Read IDs, owning media IDs and embeddings of every item."""
+        ids: List[str] = []
+        owners: List[str] = []
+        embeddings: List[List[float]] = []
+        for page in iter_collection_pages(collection, include=["embeddings", "metadatas"]):
+            page_ids = page["ids"]
+            metadatas = page.get("metadatas") or [None] * len(page_ids)
+            ids.extend(page_ids)
+            owners.extend(
+                (metadata or {}).get("source_media_id", item_id)
+                for item_id, metadata in zip(page_ids, metadatas)
+            )
+            embeddings.extend(page["embeddings"])
+        return ids, owners, torch.tensor(np.asarray(embeddings, dtype=np.float32))
+
+    def _search_rows(
+        self,
+        normalized: torch.Tensor,
+        rows: np.ndarray,
+        neighbors: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        """Recompute the neighbour lists of *rows* in place."""
+        if not len(rows):
+            return
+        k = min(self.k, normalized.shape[0] - 1)
+        values, indices = knn_rows(
+            normalized, torch.from_numpy(rows), k, self.block_elements
+        )
+        neighbors[rows] = -1
+        weights[rows] = -np.inf
+        neighbors[rows, :k] = indices.numpy()
+        weights[rows, :k] = values.numpy()
+
+    def _merge_touched(
+        self,
+        normalized: torch.Tensor,
+        touched: np.ndarray,
+        clean: np.ndarray,
+        neighbors: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        """Let touched items displace the stored neighbours of clean rows.
+
+        Clean rows never list a touched item already (such rows are
+        dirty), so each touched item is a new candidate for them.
+        """
+        clean_rows = np.flatnonzero(clean)
+        if not len(touched) or not len(clean_rows):
+            return
+        block = max(1, self.block_elements // normalized.shape[0])
+        clean_index = torch.from_numpy(clean_rows)
+        with torch.no_grad():
+            for start in range(0, len(touched), block):
+                chunk = touched[start:start + block]
+                sims = (normalized[torch.from_numpy(chunk)] @ normalized[clean_index].T).T
+                values = torch.cat([torch.from_numpy(weights[clean_rows]), sims], dim=1)
+                candidates = torch.cat([
+                    torch.from_numpy(neighbors[clean_rows]),
+                    torch.from_numpy(chunk).expand(len(clean_rows), -1),
+                ], dim=1)
+                top_values, top_positions = torch.topk(values, self.k, dim=1)
+                weights[clean_rows] = top_values.numpy()
+                neighbors[clean_rows] = torch.gather(candidates, 1, top_positions).numpy()
+
+    def _write(self, ids: List[str], neighbors: np.ndarray, weights: np.ndarray) -> None:
+        """Persist the graph atomically and make it the loaded one."""
+        neighbors = neighbors.astype(np.int32)
+        weights = weights.astype(np.float16)
+        digest = hashlib.sha256()
+        digest.update(json.dumps(ids).encode("utf-8"))
+        digest.update(neighbors.tobytes())
+        digest.update(weights.tobytes())
+
+        os.makedirs(self.path, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            with open(os.path.join(staging, "ids.json"), "w") as f:
+                json.dump(ids, f)
+            np.save(os.path.join(staging, "neighbors.npy"), neighbors)
+            np.save(os.path.join(staging, "weights.npy"), weights)
+            meta = {
+                "version": FORMAT_VERSION,
+                "k": self.k,
+                "size": len(ids),
+                "etag": digest.hexdigest()[:32],
+            }
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+
+            generation = "gen-" + os.path.basename(staging)[len(".tmp-"):]
+            os.rename(staging, os.path.join(self.path, generation))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        pointer = os.path.join(self.path, "CURRENT")
+        pointer_tmp = "%s.%s.tmp" % (pointer, generation)
+        with open(pointer_tmp, "w") as f:
+            f.write(generation)
+        os.replace(pointer_tmp, pointer)
+        self._load(generation)
+        self._remove_stale(generation)
+
+    def _remove_stale(self, current: str) -> None:
+        """Delete superseded generations and abandoned staging directories.
+
+        Best effort: loaded graphs are held in memory, so readers do not
+        depend on the files of an old generation.
+        """
+        now = time.time()
+        for name in os.listdir(self.path):
+            full_path = os.path.join(self.path, name)
+            try:
+                if name.startswith("gen-") and name != current:
+                    shutil.rmtree(full_path, ignore_errors=True)
+                elif name.startswith(".tmp-") and (
+                    now - os.path.getmtime(full_path) > STALE_STAGING_SECONDS
+                ):
+                    shutil.rmtree(full_path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def _current_generation(self) -> Optional[str]:
+        """Name of the generation ``CURRENT`` points to, if any."""
+        try:
+            with open(os.path.join(self.path, "CURRENT")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _load(self, generation: Optional[str]) -> None:
+        """Read graph *generation* if it exists and is compatible."""
+        self._graph = None
+        self._meta = None
+        self._generation = generation
+        if generation is None:
+            return
+        path = os.path.join(self.path, generation)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("version") != FORMAT_VERSION or meta.get("k") != self.k:
+                logger.warning("Ignoring stored graph at %s: incompatible format", path)
+                return
+            with open(os.path.join(path, "ids.json")) as f:
+                ids = json.load(f)
+            graph = (
+                ids,
+                np.load(os.path.join(path, "neighbors.npy")),
+                np.load(os.path.join(path, "weights.npy")),
+            )
+        except (OSError, ValueError):
+            # Superseded and removed by a concurrent writer; the next
+            # call follows CURRENT again.
+            self._generation = None
+            return
+        self._graph = graph
+        self._meta = meta
+
+    def _reload_if_changed(self) -> None:
+        """Pick up a graph rewritten by another process."""
+        generation = self._current_generation()
+        if generation != self._generation:
+            self._load(generation)
@@ -1,28 +1,59 @@
 """Image and video frame indexing service.
 
 Handles CLIP embedding computation and ChromaDB upsert for visual media
-and video frames.
+and video frames.  The heavy lifting runs through the staged
+:class:`~semantixel.services.indexing_pipeline.ImageIndexingPipeline`.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Set
 from semantixel.core.config import config
 from semantixel.core.logging import logger
-from semantixel.media import MediaDescriptor, describe_local_media
+from semantixel.media import MediaDescriptor
 from semantixel.media_types import is_video_file
+from semantixel.services.collection_utils import find_existing_ids, find_existing_sources
+from semantixel.services.indexing_pipeline import ImageIndexingPipeline
 from semantixel.services.model_manager import model_manager
-from semantixel.utils.video_utils import extract_frames_in_memory
 
 
 class ImageIndexer:
     """Indexes images and video frames into a ChromaDB collection via CLIP.
 
     Processes images in configurable batch sizes and handles video
-    frame extraction with histogram-based deduplication.
+    frame extraction with histogram-based deduplication.  Throughput
+    counters from the most recent run are kept in
+    :attr:`last_pipeline_stats`.
+
+    Existence checks are answered from in-memory sets loaded once per
+    scan by :meth:`load_index_state`, so routing a media item costs a
+    set lookup rather than a database round-trip.
     """
 
     def __init__(self, image_collection, text_collection):
         self.image_collection = image_collection
         self.text_collection = text_collection
+        self._indexed_ids: Optional[set] = None
+        self._indexed_sources: Optional[set] = None
+        self.last_pipeline_stats: dict = {}
+
+    def load_index_state(self, visual_items: List[MediaDescriptor]) -> None:
+        """Load which of *visual_items* are already indexed.
+
+        Images are looked up by ID and videos by ``source_media_id``,
+        each with chunked bulk gets.
+
+        Args:
+            visual_items: Media descriptors about to be routed.
+        """
+        image_ids, video_ids = [], []
+        for media in visual_items:
+            (video_ids if is_video_file(media.locator) else image_ids).append(media.media_id)
+        self._indexed_ids = find_existing_ids(self.image_collection, image_ids)
+        self._indexed_sources = find_existing_sources(self.image_collection, video_ids)
+        logger.debug(
+            "Loaded index state: %d images, %d videos already indexed",
+            len(self._indexed_ids),
+            len(self._indexed_sources),
+        )
 
     def needs_indexing(self, media: MediaDescriptor, deep_scan: bool = False) -> bool:
         """Check whether *media* is already indexed.
@@ -34,15 +65,16 @@ class ImageIndexer:
         Returns:
             ``True`` if the item should be indexed.
         """
-        path = media.locator
-        is_video = is_video_file(path)
+        indexed_ids, indexed_sources = self._indexed_ids, self._indexed_sources
+        if indexed_ids is None:
+            # No pre-pass loaded: fall back to a direct lookup.
+            indexed_ids = find_existing_ids(self.image_collection, [media.media_id])
+            indexed_sources = find_existing_sources(self.image_collection, [media.media_id])
 
-        if is_video:
-            results = self.image_collection.get(where={"source_media_id": media.media_id})
-            return not results["ids"]
+        if is_video_file(media.locator):
+            return media.media_id not in indexed_sources
 
-        results = self.image_collection.get(ids=[media.media_id])
-        return not results["ids"] or deep_scan
+        return media.media_id not in indexed_ids or deep_scan
 
     def index_images(
         self,
@@ -50,7 +82,7 @@ class ImageIndexer:
         google_drive_source=None,
         pbar=None,
         batch_size: Optional[int] = None,
-    ) -> None:
+    ) -> Set[str]:
         """Embed images and video frames, then upsert into the collection.
 
         Args:
@@ -58,88 +90,39 @@ class ImageIndexer:
             google_drive_source: Optional source for fetching remote images.
             pbar: Optional ``tqdm`` progress bar to update.
             batch_size: Items per batch (defaults to ``config.batch_size``).
+
+        Returns:
+            Media IDs that could not be decoded or fetched.
         """
+        failed: Set[str] = set()
         if not visual_items:
-            return
-
-        batch_size = batch_size or config.batch_size
-        processing_inputs: list = []
-        processing_ids: list = []
-        processing_metadatas: list = []
-
-        def flush_batch():
-            if not processing_inputs:
-                return
-            logger.debug("Flushing batch of %d items", len(processing_inputs))
-
-            image_embeddings = model_manager.clip.get_image_embeddings(processing_inputs)
-            self.image_collection.upsert(
-                ids=processing_ids,
-                embeddings=image_embeddings,
-                metadatas=processing_metadatas,
+            return failed
+
+        self.load_index_state(visual_items)
+        pending = [m for m in visual_items if self.needs_indexing(m, config.deep_scan)]
+        if pbar:
+            pbar.update(len(visual_items) - len(pending))
+        visual_items = pending
+
+        self.last_pipeline_stats = {}
+        if visual_items:
+            pipeline = ImageIndexingPipeline(
+                self.image_collection,
+                self.text_collection,
+                model_manager,
+                batch_size=batch_size or config.batch_size,
+                decode_workers=config.pipeline.decode_workers,
+                queue_depth=config.pipeline.queue_depth,
+                google_drive_source=google_drive_source,
             )
-
-            ocr_texts = model_manager.ocr.apply_ocr(processing_inputs)
-            for idx, text in enumerate(ocr_texts):
-                if text:
-                    current_id = processing_ids[idx]
-                    metadata = processing_metadatas[idx]
-                    text_embedding = model_manager.text_embed.get_embeddings(text)
-                    self.text_collection.upsert(
-                        ids=[current_id],
-                        embeddings=[text_embedding],
-                        metadatas=[metadata],
-                        documents=[text],
-                    )
-
-            processing_inputs.clear()
-            processing_ids.clear()
-            processing_metadatas.clear()
-
-        for media in visual_items:
-            path = media.locator
-            is_video = is_video_file(path)
-
-            if is_video:
-                for frame in extract_frames_in_memory(path):
-                    processing_inputs.append(frame["image"])
-                    frame_media = describe_local_media(path, timestamp=frame["timestamp"])
-                    processing_ids.append(frame_media.composite_id)
-                    processing_metadatas.append({
-                        "source": frame_media.source,
-                        "source_media_id": frame_media.media_id,
-                        "locator": frame_media.locator,
-                        "display_path": frame_media.display_path,
-                        "timestamp": frame["timestamp"],
-                        "type": "video_frame",
-                    })
-                    if len(processing_inputs) >= batch_size:
-                        flush_batch()
-            else:
-                processing_inputs.append(
-                    media.locator
-                    if media.source == "local"
-                    else self._resolve_remote(media, google_drive_source)
-                )
-                processing_ids.append(media.media_id)
-                processing_metadatas.append({
-                    "source": media.source,
-                    "source_media_id": media.media_id,
-                    "locator": media.locator,
-                    "display_path": media.display_path,
-                    "type": "image",
-                })
-                if len(processing_inputs) >= batch_size:
-                    flush_batch()
-
-            if pbar:
-                pbar.update(1)
-
-        flush_batch()
-
-    @staticmethod
-    def _resolve_remote(media: MediaDescriptor, google_drive_source=None):
-        """Fetch a remote image and return a PIL Image."""
-        if google_drive_source and media.source == google_drive_source.SOURCE_NAME:
-            return google_drive_source.fetch_image(media.locator)
-        raise ValueError("Unsupported media source: %s" % media.source)
+            try:
+                pipeline.run(visual_items, pbar=pbar)
+            finally:
+                self.last_pipeline_stats = {
+                    name: stage.to_dict() for name, stage in pipeline.stats.items()
+                }
+            failed = pipeline.failed_media_ids
+
+        self._indexed_ids = None
+        self._indexed_sources = None
+        return failed
@@ -4,6 +4,7 @@ from typing import List, Set
 from semantixel.core.logging import logger
 from semantixel.media import MediaDescriptor
 from semantixel.services.bm25_service import BM25Service
+from semantixel.services.collection_utils import load_ids
 
 
 class IndexCleanupService:
@@ -13,15 +14,46 @@ class IndexCleanupService:
     longer exists on disk, or when its source file has been deleted.
     """
 
+    DELETE_CHUNK_SIZE = 500
+
     def __init__(self, client, bm25_service: BM25Service):
         self.client = client
         self.bm25_service = bm25_service
 
+    def remove_media(self, media_ids: List[str], *collections) -> None:
+        """Delete every entry derived from the given source media IDs.
+
+        Matches on the ``source_media_id`` metadata field, so video
+        frames, transcripts, ambient embeddings and faces are removed
+        together with the base item.  Used for manifest-driven cleanup
+        of deleted and changed files.
+
+        Args:
+            media_ids: Base media IDs to purge.
+            *collections: ChromaDB collections to purge from.
+        """
+        if not media_ids:
+            return
+
+        for coll in collections:
+            if coll is None:
+                continue
+            try:
+                for start in range(0, len(media_ids), self.DELETE_CHUNK_SIZE):
+                    chunk = media_ids[start:start + self.DELETE_CHUNK_SIZE]
+                    coll.delete(ids=chunk)
+                    coll.delete(where={"source_media_id": {"$in": chunk}})
+            except Exception as exc:
+                logger.warning("Cleanup error in %s collection: %s", coll.name, exc)
+
+        logger.info("Removed index entries for %d media items", len(media_ids))
+
     @staticmethod
     def _collect_known_ids(
         image_collection,
         text_collection,
         audio_collection,
+        face_collection=None,
     ) -> Set[str]:
         """Gather all media IDs currently in the index.
 
@@ -29,10 +61,11 @@ class IndexCleanupService:
             A set of ``media_id`` values.
         """
         known: Set[str] = set()
-        for coll in (image_collection, text_collection, audio_collection):
+        for coll in (image_collection, text_collection, audio_collection, face_collection):
+            if coll is None:
+                continue
             try:
-                data = coll.get(include=[])
-                known.update(data.get("ids", []))
+                known.update(load_ids(coll))
             except Exception:
                 pass
         return known
@@ -43,6 +76,7 @@ class IndexCleanupService:
         image_collection,
         text_collection,
         audio_collection,
+        face_collection=None,
     ) -> None:
         """Remove entries whose media files no longer exist.
 
@@ -51,6 +85,7 @@ class IndexCleanupService:
             image_collection: ChromaDB image embedding collection.
             text_collection: ChromaDB text embedding collection.
             audio_collection: ChromaDB audio embedding collection.
+            face_collection: Optional ChromaDB face embedding collection.
         """
         current_ids: Set[str] = set()
         for media in current_media:
@@ -59,7 +94,7 @@ class IndexCleanupService:
                 current_ids.add(media.composite_id)
 
         indexed_ids = self._collect_known_ids(
-            image_collection, text_collection, audio_collection
+            image_collection, text_collection, audio_collection, face_collection
         )
 
         stale_ids = indexed_ids - current_ids
@@ -80,11 +115,13 @@ class IndexCleanupService:
             return
 
         stale_list = list(stale_base_ids)
-        collections = (
+        collections = [
             ("image", image_collection),
             ("text", text_collection),
             ("audio", audio_collection),
-        )
+        ]
+        if face_collection is not None:
+            collections.append(("face", face_collection))
         successful_collections = []
         failed_collections = []
 
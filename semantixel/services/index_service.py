@@ -2,15 +2,19 @@
 
 The :class:`IndexService` is the top-level coordinator that:
 
-1. Scans configured directories (local + Google Drive).
+1. Scans configured directories (local + Google Drive) and diffs the
+   result against the :class:`ScanManifest` so only new or changed
+   files are processed.
 2. Delegates image/video indexing to :class:`ImageIndexer`.
 3. Delegates audio/transcription indexing to :class:`AudioIndexer`.
-4. Rebuilds the BM25 keyword index.
-5. Cleans up stale entries from deleted or renamed files.
+4. Delegates face detection/embedding to :class:`FaceIndexer`.
+5. Applies the scan's changes to the BM25 keyword index and the
+   persisted semantic graph.
+6. Cleans up stale entries from deleted, renamed or changed files.
 """
 
 import os
-from typing import List
+from typing import List, Set
 from chromadb import PersistentClient
 from semantixel.core.config import config
 from semantixel.core.logging import logger
@@ -19,9 +23,15 @@ from semantixel.media_types import has_audio_modality, has_visual_modality
 from semantixel.sources import GoogleDriveSource
 from semantixel.services.image_indexer import ImageIndexer
 from semantixel.services.audio_indexer import AudioIndexer
+from semantixel.services.face_indexer import FaceIndexer
 from semantixel.services.bm25_service import BM25Service
 from semantixel.services.media_scanner import fast_scan_for_media
 from semantixel.services.index_cleanup import IndexCleanupService
+from semantixel.services.scan_manifest import ScanManifest
+from semantixel.services.flat_store import FlatVectorStore
+from semantixel.services.graph_service import GraphService
+from semantixel.services.graph_store import GraphStore
+from semantixel.services.ivfpq_index import IVFPQIndex
 
 
 class IndexService:
@@ -33,39 +43,73 @@ class IndexService:
         indexer.run_full_scan()
 
     Attributes:
-        image_collection: ChromaDB collection for CLIP image embeddings.
+        image_collection: Collection for CLIP image embeddings (ChromaDB or
+            :class:`FlatVectorStore`, per ``config.vector_store``).
         text_collection: ChromaDB collection for text embeddings (OCR, transcripts).
         audio_collection: ChromaDB collection for CLAP audio embeddings.
+        face_collection: ChromaDB collection for per-face embeddings.
         bm25_service: Keyword search index.
+        graph_store: Persisted kNN graph of the image collection.
+        scan_manifest: Record of indexed files used for incremental scans.
         google_drive_source: Optional Google Drive integration.
+        generation: Counter bumped after every scan or index rebuild that
+            changed the index; search caches are tagged with it.
     """
 
     def __init__(self, db_path: str = "db"):
         self.db_path = db_path
         self.client = PersistentClient(path=db_path)
 
-        self.image_collection = self.client.get_or_create_collection(
-            "images", metadata={"hnsw:space": "cosine"}
-        )
-        self.text_collection = self.client.get_or_create_collection(
-            "texts", metadata={"hnsw:space": "cosine"}
-        )
-        self.audio_collection = self.client.get_or_create_collection(
-            "ambient_audio", metadata={"hnsw:space": "cosine"}
-        )
+        self.image_collection = self._open_collection("images")
+        self.text_collection = self._open_collection("texts")
+        self.audio_collection = self._open_collection("ambient_audio")
+        self.face_collection = self._open_collection("faces")
 
         self.image_indexer = ImageIndexer(self.image_collection, self.text_collection)
         self.audio_indexer = AudioIndexer(self.text_collection, self.audio_collection)
-        self.bm25_service = BM25Service(index_path=os.path.join(db_path, "bm25_index.pkl"))
+        self.face_indexer = FaceIndexer(self.face_collection)
+        self.bm25_service = BM25Service(index_path=os.path.join(db_path, "bm25_index"))
+        self.graph_store = GraphStore(
+            os.path.join(db_path, "graph"),
+            k=GraphService.TOP_K_NEIGHBORS,
+            block_elements=GraphService.BLOCK_ELEMENTS,
+        )
         self.cleanup_service = IndexCleanupService(self.client, self.bm25_service)
+        self.scan_manifest = ScanManifest(os.path.join(db_path, "scan_manifest.sqlite3"))
         self.google_drive_source = GoogleDriveSource()
+        self._generation_path = os.path.join(db_path, "index_generation")
+
+    @property
+    def generation(self) -> int:
+        """Current index generation, shared across processes via ``db/``."""
+        try:
+            with open(self._generation_path) as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def bump_generation(self) -> int:
+        """Advance :attr:`generation` after the index has changed.
+
+        Returns:
+            The new generation number.
+        """
+        generation = self.generation + 1
+        tmp_path = self._generation_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(generation))
+        os.replace(tmp_path, self._generation_path)
+        logger.info("Index generation is now %d", generation)
+        return generation
 
     # Public API
 
     def run_full_scan(self):
         """Perform a full scan of configured directories and index all media.
 
-        Logs progress at each phase and cleans up stale index entries.
+        Only items that are new or changed according to the scan
+        manifest are sent to the indexers; entries for changed and
+        deleted files are purged first.  Logs progress at each phase.
         """
         logger.info("Starting full media scan and index update")
         include_dirs = config.include_directories
@@ -88,15 +132,132 @@ class IndexService:
             "Found %d media files in %.2fs", len(media_items), elapsed
         )
 
-        self._index_media(media_items)
-        self.cleanup_service.cleanup(
-            media_items, self.image_collection, self.text_collection, self.audio_collection
-        )
+        bootstrap = self.scan_manifest.is_empty()
+        diff = self.scan_manifest.diff(media_items, force=config.deep_scan)
+        if diff.is_empty:
+            if diff.entries:
+                # Touched but identical files: store their new stat so
+                # the next scan does not hash them again.
+                self.scan_manifest.commit(diff)
+            if self.bm25_service.bm25 is None and self.text_collection.count():
+                self.bm25_service.rebuild_from_collection(self.text_collection)
+                self.bump_generation()
+            logger.info("Index is up to date")
+            return
+
+        stale_ids = [m.media_id for m in diff.changed] + diff.removed_ids
+        self.cleanup_service.remove_media(stale_ids, *self._collections())
+        failed_ids = self._index_media(diff.to_index)
+        if failed_ids:
+            # A video that failed mid-decode has already written some
+            # frames; drop them so the retry is not skipped as indexed.
+            self.cleanup_service.remove_media(sorted(failed_ids), *self._collections())
+
+        if bootstrap:
+            # No manifest yet: reconcile against whatever an older
+            # version of the index may already contain.
+            self.cleanup_service.cleanup(
+                media_items,
+                self.image_collection,
+                self.text_collection,
+                self.audio_collection,
+                face_collection=self.face_collection,
+            )
+
+        indexed_ids = [m.media_id for m in diff.to_index]
+        if bootstrap or self.bm25_service.bm25 is None:
+            self.bm25_service.rebuild_from_collection(self.text_collection)
+        else:
+            self.bm25_service.update_from_collection(
+                self.text_collection, stale_ids, indexed_ids
+            )
+
+        if bootstrap:
+            self.graph_store.clear()
+        else:
+            self.graph_store.update(self.image_collection, stale_ids + indexed_ids)
+        if failed_ids:
+            logger.warning(
+                "%d media items failed to index and will be retried next scan",
+                len(failed_ids),
+            )
+        self.scan_manifest.commit(diff, failed_ids)
+        self.bump_generation()
+
+    def train_vector_index(self):
+        """Train IVF-PQ indexes for the collections listed in config.
+
+        Only collections on the ``flat`` backend can be indexed, since
+        re-ranking reads their raw vectors.
+        """
+        ivfpq = config.vector_store.ivfpq
+        for collection in self._collections():
+            if collection.name not in ivfpq.collections:
+                continue
+            if not isinstance(collection, FlatVectorStore):
+                logger.warning(
+                    "IVF-PQ requires the flat backend; skipping collection '%s'",
+                    collection.name,
+                )
+                continue
+            index = collection.ann_index or IVFPQIndex(
+                os.path.join(collection.path, "ivfpq"),
+                nprobe=ivfpq.nprobe,
+                rerank=ivfpq.rerank,
+            )
+            index.train(
+                collection,
+                nlist=ivfpq.nlist,
+                m=ivfpq.m,
+                sample_size=ivfpq.train_sample,
+            )
+        self.bump_generation()
 
     # Internal — media processing
 
-    def _index_media(self, media_items: List[MediaDescriptor]):
-        """Route each item to the appropriate indexer."""
+    def _open_collection(self, name: str):
+        """Open *name* with the backend selected in ``config.vector_store``.
+
+        ``"flat"`` selects the memory-mapped :class:`FlatVectorStore`;
+        anything else uses a cosine-space ChromaDB collection.
+        """
+        store_config = config.vector_store
+        backend = store_config.backends.get(name, "chroma")
+        if backend == "flat":
+            logger.info("Using flat vector store for collection '%s'", name)
+            store = FlatVectorStore(
+                name,
+                os.path.join(self.db_path, "flat", name),
+                dtype=store_config.flat_dtype,
+                block_size=store_config.flat_block_size,
+            )
+            ivfpq = store_config.ivfpq
+            if ivfpq.enabled and name in ivfpq.collections:
+                store.ann_index = IVFPQIndex(
+                    os.path.join(store.path, "ivfpq"),
+                    nprobe=ivfpq.nprobe,
+                    rerank=ivfpq.rerank,
+                )
+            return store
+        return self.client.get_or_create_collection(
+            name, metadata={"hnsw:space": "cosine"}
+        )
+
+    def _collections(self) -> tuple:
+        """Return every collection that holds per-media entries."""
+        return (
+            self.image_collection,
+            self.text_collection,
+            self.audio_collection,
+            self.face_collection,
+        )
+
+    def _index_media(self, media_items: List[MediaDescriptor]) -> Set[str]:
+        """Route each item to the appropriate indexer.
+
+        Returns:
+            Media IDs that failed in at least one indexer.
+        """
         from tqdm import tqdm
 
         audio_items = [
@@ -110,11 +271,18 @@ class IndexService:
 
         total_tasks = len(visual_items) + len(audio_items)
         with tqdm(total=total_tasks, desc="Indexing media") as pbar:
-            self.image_indexer.index_images(
+            failed = self.image_indexer.index_images(
                 visual_items,
                 google_drive_source=self.google_drive_source,
                 pbar=pbar,
             )
-            self.audio_indexer.index_audio(audio_items, pbar=pbar)
+            failed |= self.audio_indexer.index_audio(audio_items, pbar=pbar)
+
+        failed |= self.face_indexer.index_faces(
+            visual_items, google_drive_source=self.google_drive_source
+        )
 
-        self.bm25_service.rebuild_from_collection(self.text_collection)
+        for collection in self._collections():
+            if isinstance(collection, FlatVectorStore) and collection.ann_index:
+                collection.ann_index.update(collection)
+        return failed
@@ -0,0 +1,383 @@
+"""Pipelined image indexing engine.
+
+Splits visual indexing into stages connected by bounded queues so that
+image decoding, CLIP inference, OCR, text embedding and database writes
+overlap instead of running strictly one after another::
+
+    decode workers ─► CLIP ─┬──────────────────────────► writer
+                            └─► OCR ─► text embedding ──► writer
+
+Every stage runs in its own thread (decoding uses several).  A single
+writer thread performs all ChromaDB upserts.  Per-stage counters are
+collected in :class:`StageStats` and logged when the pipeline finishes.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Set
+from PIL import Image
+from semantixel.core.logging import log_exception, logger
+from semantixel.media import MediaDescriptor, describe_local_media
+from semantixel.media_types import is_video_file
+from semantixel.utils.video_utils import extract_frames_in_memory
+
+_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for a single pipeline stage.
+
+    Attributes:
+        name: Stage name.
+        items: Records processed.
+        batches: Batches processed (equals ``items`` for per-item stages).
+        busy_seconds: Wall time spent doing work (excluding queue waits).
+    """
+
+    name: str
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, items: int, seconds: float) -> None:
+        """Add one unit of work to the counters."""
+        with self._lock:
+            self.items += items
+            self.batches += 1
+            self.busy_seconds += seconds
+
+    @property
+    def throughput(self) -> float:
+        """Items per busy second."""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable snapshot."""
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.throughput, 2),
+        }
+
+
+@dataclass
+class _Record:
+    """A decoded image plus the ID and metadata it will be stored under."""
+
+    item_id: str
+    metadata: Dict[str, Any]
+    image: Image.Image
+
+
+class ImageIndexingPipeline:
+    """Staged producer/consumer engine used by :class:`ImageIndexer`.
+
+    Usage::
+
+        pipeline = ImageIndexingPipeline(image_collection, text_collection, model_manager)
+        pipeline.run(visual_items, pbar=pbar)
+        print(pipeline.stats)
+
+    Attributes:
+        stats: :class:`StageStats` per stage name.
+        failed_media_ids: Media that could not be decoded or fetched in
+            the last run; they must not be recorded as indexed.
+    """
+
+    STAGES = ("decode", "clip", "ocr", "text_embed", "write")
+
+    def __init__(
+        self,
+        image_collection,
+        text_collection,
+        model_manager,
+        batch_size: int = 16,
+        decode_workers: int = 4,
+        queue_depth: int = 4,
+        google_drive_source=None,
+    ):
+        self.image_collection = image_collection
+        self.text_collection = text_collection
+        self.model_manager = model_manager
+        self.batch_size = max(1, batch_size)
+        self.decode_workers = max(1, decode_workers)
+        self.queue_depth = max(1, queue_depth)
+        self.google_drive_source = google_drive_source
+        self.stats: Dict[str, StageStats] = {name: StageStats(name) for name in self.STAGES}
+        self.failed_media_ids: Set[str] = set()
+
+        self._abort = threading.Event()
+        self._errors: List[BaseException] = []
+        self._errors_lock = threading.Lock()
+
+    # Public API
+
+    def run(self, visual_items: Iterable[MediaDescriptor], pbar=None) -> None:
+        """Index *visual_items* and block until every stage has drained.
+
+        Args:
+            visual_items: Media descriptors for images and videos.
+            pbar: Optional ``tqdm`` progress bar, advanced per media item.
+
+        Raises:
+            Exception: The first error raised by any stage.
+        """
+        t0 = time.time()
+        source_q: queue.Queue = queue.Queue(maxsize=self.queue_depth * self.batch_size)
+        decoded_q: queue.Queue = queue.Queue(maxsize=self.queue_depth * self.batch_size)
+        ocr_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        text_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        write_q: queue.Queue = queue.Queue(maxsize=self.queue_depth * 2)
+
+        decoders = [
+            self._spawn("decode-%d" % i, self._decode_stage, source_q, decoded_q, pbar)
+            for i in range(self.decode_workers)
+        ]
+        threads = decoders + [
+            self._spawn("clip", self._clip_stage, decoded_q, ocr_q, write_q),
+            self._spawn("ocr", self._ocr_stage, ocr_q, text_q),
+            self._spawn("text_embed", self._text_stage, text_q, write_q),
+            self._spawn("write", self._write_stage, write_q),
+        ]
+
+        try:
+            for media in visual_items:
+                self._put(source_q, media)
+            for _ in decoders:
+                self._put(source_q, _DONE)
+            for thread in decoders:
+                thread.join()
+            # CLIP gets a single end marker once every decoder is done;
+            # it then propagates the marker downstream.
+            self._put(decoded_q, _DONE)
+        except PipelineAborted:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+        for thread in threads:
+            thread.join()
+
+        self._log_stats(time.time() - t0)
+        if self._errors:
+            raise self._errors[0]
+
+    # Stages
+
+    def _decode_stage(self, source_q: queue.Queue, decoded_q: queue.Queue, pbar) -> None:
+        """Open images / extract video frames and emit :class:`_Record` objects."""
+        stats = self.stats["decode"]
+        while True:
+            media = self._get(source_q)
+            if media is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                for record in self._decode(media):
+                    stats.record(1, time.perf_counter() - start)
+                    self._put(decoded_q, record)
+                    start = time.perf_counter()
+            except PipelineAborted:
+                raise
+            except Exception as exc:
+                logger.warning("Failed to decode %s: %s", media.display_path, exc)
+                with self._errors_lock:
+                    self.failed_media_ids.add(media.media_id)
+            if pbar:
+                pbar.update(1)
+
+    def _clip_stage(
+        self, decoded_q: queue.Queue, ocr_q: queue.Queue, write_q: queue.Queue
+    ) -> None:
+        """Batch decoded records and compute CLIP image embeddings."""
+        stats = self.stats["clip"]
+        batch: List[_Record] = []
+
+        def flush():
+            if not batch:
+                return
+            start = time.perf_counter()
+            embeddings = self.model_manager.clip.get_image_embeddings(
+                [r.image for r in batch]
+            )
+            stats.record(len(batch), time.perf_counter() - start)
+            ids = [r.item_id for r in batch]
+            metadatas = [r.metadata for r in batch]
+            self._put(write_q, (self.image_collection, ids, embeddings, metadatas, None))
+            self._put(ocr_q, list(batch))
+            batch.clear()
+
+        while True:
+            record = self._get(decoded_q)
+            if record is _DONE:
+                flush()
+                self._put(ocr_q, _DONE)
+                self._put(write_q, _DONE)
+                return
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                flush()
+
+    def _ocr_stage(self, ocr_q: queue.Queue, text_q: queue.Queue) -> None:
+        """Run OCR on each CLIP batch and forward records that contain text."""
+        stats = self.stats["ocr"]
+        while True:
+            batch = self._get(ocr_q)
+            if batch is _DONE:
+                self._put(text_q, _DONE)
+                return
+            start = time.perf_counter()
+            texts = self.model_manager.ocr.apply_ocr([r.image for r in batch])
+            stats.record(len(batch), time.perf_counter() - start)
+            hits = [(r, text) for r, text in zip(batch, texts) if text]
+            if hits:
+                self._put(text_q, hits)
+
+    def _text_stage(self, text_q: queue.Queue, write_q: queue.Queue) -> None:
+        """Embed OCR text and queue one text-collection upsert per batch."""
+        stats = self.stats["text_embed"]
+        while True:
+            hits = self._get(text_q)
+            if hits is _DONE:
+                self._put(write_q, _DONE)
+                return
+            start = time.perf_counter()
+            embeddings = self.model_manager.text_embed.get_embeddings_batch(
+                [text for _, text in hits]
+            )
+            stats.record(len(hits), time.perf_counter() - start)
+            self._put(
+                write_q,
+                (
+                    self.text_collection,
+                    [r.item_id for r, _ in hits],
+                    embeddings,
+                    [r.metadata for r, _ in hits],
+                    [text for _, text in hits],
+                ),
+            )
+
+    def _write_stage(self, write_q: queue.Queue) -> None:
+        """Single writer: apply every upsert in arrival order."""
+        stats = self.stats["write"]
+        producers = 2  # CLIP stage and text-embedding stage
+        while producers:
+            op = self._get(write_q)
+            if op is _DONE:
+                producers -= 1
+                continue
+            collection, ids, embeddings, metadatas, documents = op
+            start = time.perf_counter()
+            kwargs = {"ids": ids, "embeddings": embeddings, "metadatas": metadatas}
+            if documents is not None:
+                kwargs["documents"] = documents
+            collection.upsert(**kwargs)
+            stats.record(len(ids), time.perf_counter() - start)
+
+    # Internal helpers
+
+    def _decode(self, media: MediaDescriptor) -> Iterable[_Record]:
+        """Yield decoded records for a single media item."""
+        if is_video_file(media.locator):
+            for frame in extract_frames_in_memory(media.locator):
+                frame_media = describe_local_media(media.locator, timestamp=frame["timestamp"])
+                yield _Record(
+                    frame_media.composite_id,
+                    {
+                        "source": frame_media.source,
+                        "source_media_id": frame_media.media_id,
+                        "locator": frame_media.locator,
+                        "display_path": frame_media.display_path,
+                        "timestamp": frame["timestamp"],
+                        "type": "video_frame",
+                    },
+                    frame["image"],
+                )
+            return
+
+        if media.source == "local":
+            image = Image.open(media.locator).convert("RGB")
+        elif (
+            self.google_drive_source
+            and media.source == self.google_drive_source.SOURCE_NAME
+        ):
+            image = self.google_drive_source.fetch_image(media.locator)
+        else:
+            raise ValueError("Unsupported media source: %s" % media.source)
+
+        yield _Record(
+            media.media_id,
+            {
+                "source": media.source,
+                "source_media_id": media.media_id,
+                "locator": media.locator,
+                "display_path": media.display_path,
+                "type": "image",
+            },
+            image,
+        )
+
+    def _spawn(self, name: str, target: Callable, *args) -> threading.Thread:
+        """Start a daemon thread that records any failure and aborts the pipeline."""
+
+        def runner():
+            try:
+                target(*args)
+            except PipelineAborted:
+                pass
+            except BaseException as exc:
+                log_exception(logger, "Indexing pipeline stage '%s' failed", name)
+                self._fail(exc)
+
+        thread = threading.Thread(target=runner, name="index-%s" % name, daemon=True)
+        thread.start()
+        return thread
+
+    def _fail(self, exc: BaseException) -> None:
+        """Record *exc* and signal every stage to stop."""
+        with self._errors_lock:
+            self._errors.append(exc)
+        self._abort.set()
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        """Blocking put that gives up once the pipeline is aborted."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        """Blocking get that gives up once the pipeline is aborted."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _log_stats(self, elapsed: float) -> None:
+        """Log per-stage throughput counters."""
+        for stage in self.stats.values():
+            logger.info(
+                "Pipeline stage %-10s %6d items in %5d batches, busy %.2fs (%.1f items/s)",
+                stage.name,
+                stage.items,
+                stage.batches,
+                stage.busy_seconds,
+                stage.throughput,
+            )
+        logger.info("Indexing pipeline finished in %.2fs", elapsed)
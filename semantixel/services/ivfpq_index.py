@@ -0,0 +1,536 @@
+"""Inverted-file product-quantisation (IVF-PQ) index for flat vector stores.
+
+Compresses the vectors of a :class:`FlatVectorStore` into a few bytes
+each so very large collections (tens of millions of video frames) can
+be searched without holding float32 vectors or an HNSW graph in RAM:
+
+1. **Coarse quantiser** — k-means over a training sample splits the
+   space into ``nlist`` inverted lists.
+2. **Product quantiser** — each vector's residual to its list centroid
+   is split into ``m`` sub-vectors, each encoded as one byte (the index
+   of the nearest of 256 sub-centroids).
+3. **Search** — the ``nprobe`` closest lists are scanned with
+   asymmetric distance lookup tables; the best candidates are then
+   re-ranked exactly against the raw vectors in the flat store.
+
+Search takes a row mask rather than only the store's liveness mask, so
+metadata filters resolved by the store drop non-matching rows before
+re-ranking.  When the probed lists hold fewer than ``k`` allowed rows,
+more lists are probed, up to ``MAX_PROBE_GROWTH`` times ``nprobe``.
+
+Codes and row IDs are stored per list in CSR layout on disk and opened
+with ``mmap_mode="r"``.  Rows appended to the store after the index was
+built are scanned exactly until the next :meth:`IVFPQIndex.update`,
+which encodes them into a small appended segment rather than rewriting
+the whole index; segments are merged into the main arrays once there
+are ``MAX_SEGMENTS`` of them.  When the store compacts, it renumbers the
+index's rows through :meth:`IVFPQIndex.remap`.
+
+Each full write goes to a fresh ``gen-*`` directory, and a ``CURRENT``
+file naming the live generation is repointed with ``os.replace``, so a
+process reloading the index never finds it missing and a crash never
+loses the trained one.  Superseded generations are removed afterwards
+on a best-effort basis, since another process may still map them.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+from semantixel.core.logging import logger
+
+FORMAT_VERSION = 1
+
+# Appended segments kept before update() merges them into the main arrays.
+MAX_SEGMENTS = 8
+
+# Largest multiple of nprobe a search widens to when candidates run short.
+MAX_PROBE_GROWTH = 8
+
+# Age after which a leftover staging directory is considered abandoned.
+STALE_STAGING_SECONDS = 3600
+
+# Files of the single-directory layout written by earlier versions.
+LEGACY_FILES = ("centroids.npy", "codebooks.npy", "offsets.npy", "rows.npy", "codes.npy")
+
+
+class IVFPQIndex:
+    """Approximate search index attached to a :class:`FlatVectorStore`.
+
+    Usage::
+
+        index = IVFPQIndex(os.path.join(store.path, "ivfpq"))
+        index.train(store, nlist=4096, m=64)
+        store.ann_index = index
+
+    Attributes:
+        path: Directory holding the ``CURRENT`` pointer and the ``gen-*``
+            directories (index arrays, segments and ``meta.json``).
+        nprobe: Inverted lists scanned per query.
+        rerank: Candidates re-ranked exactly against raw vectors.
+    """
+
+    def __init__(self, path: str, nprobe: int = 32, rerank: int = 256):
+        self.path = path
+        self.nprobe = max(1, nprobe)
+        self.rerank = max(1, rerank)
+        self._meta: Optional[dict] = None
+        self._meta_mtime: Optional[float] = None
+        self._generation: Optional[str] = None
+        self._segments: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._load()
+
+    # Public API
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether trained index files are present."""
+        return self._meta is not None
+
+    def is_current(self, store) -> bool:
+        """Whether the index still matches *store*'s row numbering.
+
+        Compacting the store renumbers rows, which invalidates the
+        stored row IDs until the index is retrained.
+        """
+        self._reload_if_changed()
+        return (
+            self._meta is not None
+            and self._meta["generation"] == store.generation
+            and self._meta["dim"] == store.dim
+        )
+
+    def train(
+        self,
+        store,
+        nlist: int = 4096,
+        m: int = 64,
+        sample_size: int = 200000,
+        seed: int = 0,
+    ) -> None:
+        """Train quantisers on a sample of *store* and encode every row.
+
+        Args:
+            store: Flat store whose vectors are indexed.
+            nlist: Number of inverted lists (clamped to the sample size).
+            m: Number of PQ sub-quantisers (reduced to divide the dimension).
+            sample_size: Maximum vectors used for k-means training.
+            seed: Random seed for sampling and k-means.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        vectors, live, size = store.raw_state()
+        live_rows = np.flatnonzero(live[:size])
+        if vectors is None or len(live_rows) == 0:
+            logger.warning("Flat store '%s' is empty; nothing to train", store.name)
+            return
+
+        rng = np.random.default_rng(seed)
+        if len(live_rows) > sample_size:
+            sample_rows = np.sort(rng.choice(live_rows, sample_size, replace=False))
+        else:
+            sample_rows = live_rows
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+        dim = sample.shape[1]
+
+        nlist = max(1, min(nlist, len(sample) // 39 or 1))
+        while dim % m:
+            m -= 1
+        ksub = min(256, len(sample))
+        logger.info(
+            "Training IVF-PQ for '%s': %d samples, nlist=%d, m=%d",
+            store.name,
+            len(sample),
+            nlist,
+            m,
+        )
+
+        coarse = MiniBatchKMeans(
+            n_clusters=nlist, random_state=seed, batch_size=4096, n_init=1
+        ).fit(sample)
+        centroids = coarse.cluster_centers_.astype(np.float32)
+        residuals = sample - centroids[self._assign(sample, centroids)]
+
+        dsub = dim // m
+        codebooks = np.zeros((m, ksub, dsub), dtype=np.float32)
+        for j in range(m):
+            sub = residuals[:, j * dsub:(j + 1) * dsub]
+            codebooks[j] = MiniBatchKMeans(
+                n_clusters=ksub, random_state=seed, batch_size=4096, n_init=1
+            ).fit(sub).cluster_centers_
+
+        self._centroids = centroids
+        self._codebooks = codebooks
+        lists, codes = self._encode_rows(vectors, live_rows, store.block_size)
+        self._write(lists, live_rows, codes, size, store.generation, sample_size)
+
+    def update(self, store) -> None:
+        """Encode rows appended to *store* since the index was built.
+
+        The new codes are written as an appended segment.  An index that
+        no longer matches the store's row numbering (e.g. a compaction
+        whose remap was interrupted) is retrained.
+        """
+        if not self.is_trained:
+            return
+        if not self.is_current(store):
+            logger.warning(
+                "IVF-PQ index for '%s' is out of date (index generation %d, "
+                "store generation %d); retraining",
+                store.name,
+                self._meta["generation"],
+                store.generation,
+            )
+            self.train(
+                store,
+                nlist=self._meta["nlist"],
+                m=self._meta["m"],
+                sample_size=self._meta.get("train_sample", 200000),
+            )
+            return
+
+        vectors, live, size = store.raw_state()
+        start = self._meta["indexed_size"]
+        if size <= start:
+            return
+
+        new_rows = start + np.flatnonzero(live[start:size])
+        new_lists, new_codes = self._encode_rows(vectors, new_rows, store.block_size)
+        if len(self._meta.get("segments", [])) + 1 >= MAX_SEGMENTS:
+            lists, rows, codes = self._entries()
+            self._write(
+                np.concatenate([lists, new_lists]),
+                np.concatenate([rows, new_rows]),
+                np.concatenate([codes, new_codes]),
+                size,
+                store.generation,
+            )
+        else:
+            self._append_segment(new_lists, new_rows, new_codes, size)
+
+    def remap(self, old_to_new: np.ndarray, generation: int) -> None:
+        """Renumber indexed rows after the store compacted.
+
+        Args:
+            old_to_new: New row number of every old row (``-1`` for rows
+                the compaction dropped).
+            generation: The store's generation after the compaction.
+        """
+        if not self.is_trained:
+            return
+        lists, rows, codes = self._entries()
+        new_rows = old_to_new[rows]
+        keep = new_rows >= 0
+        indexed_size = int(np.count_nonzero(old_to_new[:self._meta["indexed_size"]] >= 0))
+        self._write(lists[keep], new_rows[keep], codes[keep], indexed_size, generation)
+
+    def search(
+        self, queries: np.ndarray, k: int, vectors: np.ndarray, live: np.ndarray, size: int
+    ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Approximate top-*k* search with exact re-ranking.
+
+        Args:
+            queries: L2-normalised query matrix ``(n_queries, dim)``.
+            k: Results per query.
+            vectors: Raw vector matrix of the store.
+            live: Boolean mask of the rows that may be returned (the
+                store's live rows, possibly narrowed by a filter).
+            size: Number of used rows in *vectors*.
+
+        Returns:
+            Per-query ``(rows, similarities)`` sorted by similarity.
+        """
+        nlist = self._meta["nlist"]
+        m = self._meta["m"]
+        dsub = self._meta["dim"] // m
+        nprobe = min(self.nprobe, nlist)
+        max_nprobe = min(nlist, nprobe * MAX_PROBE_GROWTH)
+        indexed_size = self._meta["indexed_size"]
+        tail_rows = indexed_size + np.flatnonzero(live[indexed_size:size])
+
+        coarse = queries @ self._centroids.T
+        probes = np.argpartition(-coarse, max_nprobe - 1, axis=1)[:, :max_nprobe]
+        sub_range = np.arange(m)
+
+        all_rows: List[np.ndarray] = []
+        all_sims: List[np.ndarray] = []
+        for qi, query in enumerate(queries):
+            lut = np.einsum(
+                "md,mkd->mk", query.reshape(m, dsub), self._codebooks
+            )
+            order = probes[qi][np.argsort(-coarse[qi, probes[qi]])]
+            cand_rows = []
+            cand_scores = []
+            found = len(tail_rows)
+            probed, limit = 0, nprobe
+            while True:
+                for lst in order[probed:limit]:
+                    for offsets, segment_rows, segment_codes in self._segments:
+                        start, end = offsets[lst], offsets[lst + 1]
+                        if start == end:
+                            continue
+                        rows = np.asarray(segment_rows[start:end], dtype=np.int64)
+                        keep = live[rows]
+                        if not keep.any():
+                            continue
+                        codes = np.asarray(segment_codes[start:end])[keep]
+                        cand_rows.append(rows[keep])
+                        cand_scores.append(coarse[qi, lst] + lut[sub_range, codes].sum(axis=1))
+                        found += len(codes)
+                probed = limit
+                if found >= k or limit >= max_nprobe:
+                    break
+                limit = min(limit * 2, max_nprobe)
+
+            if cand_rows:
+                rows = np.concatenate(cand_rows)
+                scores = np.concatenate(cand_scores)
+                budget = max(k, self.rerank)
+                if len(rows) > budget:
+                    top = np.argpartition(-scores, budget - 1)[:budget]
+                    rows = rows[top]
+            else:
+                rows = np.zeros(0, dtype=np.int64)
+
+            rows = np.unique(np.concatenate([rows, tail_rows]))
+            if len(rows) == 0:
+                all_rows.append(rows)
+                all_sims.append(np.zeros(0, dtype=np.float32))
+                continue
+            sims = np.asarray(vectors[rows], dtype=np.float32) @ query
+            top = min(k, len(rows))
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best], kind="stable")]
+            all_rows.append(rows[best])
+            all_sims.append(sims[best])
+        return all_rows, all_sims
+
+    def memory_per_vector(self) -> int:
+        """Bytes of index data stored per vector (code plus row ID)."""
+        if not self._meta:
+            return 0
+        return self._meta["m"] + np.dtype(self._meta["row_dtype"]).itemsize
+
+    # Internal helpers
+
+    def _encode_rows(
+        self, vectors: np.ndarray, rows: np.ndarray, block_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign *rows* to lists and PQ-encode their residuals."""
+        m, ksub, dsub = self._codebooks.shape
+        lists = np.zeros(len(rows), dtype=np.int64)
+        codes = np.zeros((len(rows), m), dtype=np.uint8)
+        code_norms = (self._codebooks ** 2).sum(axis=2)  # (m, ksub)
+
+        for start in range(0, len(rows), block_size):
+            block_rows = rows[start:start + block_size]
+            x = np.asarray(vectors[block_rows], dtype=np.float32)
+            assign = self._assign(x, self._centroids)
+            residual = x - self._centroids[assign]
+            lists[start:start + len(block_rows)] = assign
+            for j in range(m):
+                sub = residual[:, j * dsub:(j + 1) * dsub]
+                dots = sub @ self._codebooks[j].T
+                codes[start:start + len(block_rows), j] = np.argmax(
+                    2 * dots - code_norms[j], axis=1
+                )
+        return lists, codes
+
+    @staticmethod
+    def _assign(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid (L2) for each row of *x*."""
+        centroid_norms = (centroids ** 2).sum(axis=1)
+        return np.argmax(2 * (x @ centroids.T) - centroid_norms, axis=1)
+
+    def _entries(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(lists, rows, codes)`` of every segment, concatenated."""
+        nlist = self._meta["nlist"]
+        lists, rows, codes = [], [], []
+        for offsets, segment_rows, segment_codes in self._segments:
+            lists.append(np.repeat(np.arange(nlist, dtype=np.int64), np.diff(offsets)))
+            rows.append(np.asarray(segment_rows, dtype=np.int64))
+            codes.append(np.asarray(segment_codes))
+        return np.concatenate(lists), np.concatenate(rows), np.concatenate(codes)
+
+    def _save_lists(
+        self, path: str, lists: np.ndarray, rows: np.ndarray, codes: np.ndarray, size: int
+    ) -> np.dtype:
+        """Write entries sorted by list in CSR layout; return the row dtype."""
+        nlist = len(self._centroids)
+        order = np.argsort(lists, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lists, minlength=nlist), out=offsets[1:])
+        row_dtype = np.int32 if size < np.iinfo(np.int32).max else np.int64
+        np.save(os.path.join(path, "offsets.npy"), offsets)
+        np.save(os.path.join(path, "rows.npy"), rows[order].astype(row_dtype))
+        np.save(os.path.join(path, "codes.npy"), codes[order])
+        return np.dtype(row_dtype)
+
+    def _append_segment(
+        self, lists: np.ndarray, rows: np.ndarray, codes: np.ndarray, size: int
+    ) -> None:
+        """Persist newly encoded rows as a segment and record it in ``meta.json``."""
+        meta = dict(self._meta)
+        number = meta.get("next_segment", 1)
+        name = "seg-%d" % number
+        directory = self._directory(self._generation)
+        segment_path = os.path.join(directory, name)
+        tmp_path = segment_path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        self._save_lists(tmp_path, lists, rows, codes, size)
+        os.replace(tmp_path, segment_path)
+
+        meta["segments"] = meta.get("segments", []) + [name]
+        meta["next_segment"] = number + 1
+        meta["indexed_size"] = int(size)
+        meta_path = os.path.join(directory, "meta.json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+        self._load(self._generation)
+        logger.info(
+            "IVF-PQ index segment %s written: %d vectors", name, len(rows)
+        )
+
+    def _write(
+        self,
+        lists: np.ndarray,
+        rows: np.ndarray,
+        codes: np.ndarray,
+        size: int,
+        generation: int,
+        train_sample: Optional[int] = None,
+    ) -> None:
+        """Sort entries by list and persist the index atomically."""
+        nlist = len(self._centroids)
+        if train_sample is None and self._meta is not None:
+            train_sample = self._meta.get("train_sample")
+
+        os.makedirs(self.path, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            np.save(os.path.join(staging, "centroids.npy"), self._centroids)
+            np.save(os.path.join(staging, "codebooks.npy"), self._codebooks)
+            row_dtype = self._save_lists(staging, lists, rows, codes, size)
+            meta = {
+                "version": FORMAT_VERSION,
+                "dim": int(self._centroids.shape[1]),
+                "nlist": int(nlist),
+                "m": int(self._codebooks.shape[0]),
+                "ksub": int(self._codebooks.shape[1]),
+                "indexed_size": int(size),
+                "generation": int(generation),
+                "row_dtype": row_dtype.name,
+                "train_sample": train_sample,
+            }
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+
+            name = "gen-" + os.path.basename(staging)[len(".tmp-"):]
+            os.rename(staging, os.path.join(self.path, name))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        pointer = os.path.join(self.path, "CURRENT")
+        pointer_tmp = "%s.%s.tmp" % (pointer, name)
+        with open(pointer_tmp, "w") as f:
+            f.write(name)
+        os.replace(pointer_tmp, pointer)
+        self._load(name)
+        self._remove_stale(name)
+        logger.info(
+            "IVF-PQ index written: %d vectors in %d lists, %d bytes/vector",
+            len(rows),
+            nlist,
+            self.memory_per_vector(),
+        )
+
+    def _remove_stale(self, current: str) -> None:
+        """Delete superseded generations and abandoned staging directories.
+
+        Files of the single-directory layout of earlier versions go too.
+        Best effort: on Windows, files another process still maps cannot
+        be removed; they are retried after the next write.
+        """
+        now = time.time()
+        for name in os.listdir(self.path):
+            full_path = os.path.join(self.path, name)
+            try:
+                if (name.startswith("gen-") and name != current) or name.startswith("seg-"):
+                    shutil.rmtree(full_path, ignore_errors=True)
+                elif name.startswith(".tmp-") and (
+                    now - os.path.getmtime(full_path) > STALE_STAGING_SECONDS
+                ):
+                    shutil.rmtree(full_path, ignore_errors=True)
+                elif name in LEGACY_FILES or name == "meta.json":
+                    os.remove(full_path)
+            except OSError:
+                continue
+
+    def _current_generation(self) -> Optional[str]:
+        """Name of the generation ``CURRENT`` points to, if any."""
+        try:
+            with open(os.path.join(self.path, "CURRENT")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _directory(self, generation: Optional[str]) -> str:
+        """Directory of *generation*; ``None`` is the legacy layout in :attr:`path`."""
+        return os.path.join(self.path, generation) if generation else self.path
+
+    def _load(self, generation: Optional[str] = None) -> None:
+        """Open index arrays of *generation* (default: the one ``CURRENT`` names)."""
+        if generation is None:
+            generation = self._current_generation()
+        self._generation = generation
+        directory = self._directory(generation)
+        meta_path = os.path.join(directory, "meta.json")
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("version") != FORMAT_VERSION:
+                logger.warning("Ignoring IVF-PQ index at %s: unsupported version", directory)
+                self._meta = None
+                return
+
+            self._centroids = np.load(os.path.join(directory, "centroids.npy"))
+            self._codebooks = np.load(os.path.join(directory, "codebooks.npy"))
+            self._segments = [
+                (
+                    np.load(os.path.join(segment_path, "offsets.npy")),
+                    np.load(os.path.join(segment_path, "rows.npy"), mmap_mode="r"),
+                    np.load(os.path.join(segment_path, "codes.npy"), mmap_mode="r"),
+                )
+                for segment_path in [directory] + [
+                    os.path.join(directory, name) for name in meta.get("segments", [])
+                ]
+            ]
+            meta_mtime = os.path.getmtime(meta_path)
+        except (OSError, ValueError):
+            # No index yet, or superseded and removed by a concurrent
+            # writer; the next call follows CURRENT again.
+            self._meta = None
+            self._meta_mtime = None
+            return
+        self._meta = meta
+        self._meta_mtime = meta_mtime
+
+    def _reload_if_changed(self) -> None:
+        """Pick up an index rebuilt or extended by another process."""
+        generation = self._current_generation()
+        try:
+            mtime = os.path.getmtime(
+                os.path.join(self._directory(generation), "meta.json")
+            )
+        except OSError:
+            self._meta = None
+            self._generation = generation
+            return
+        if generation != self._generation or mtime != self._meta_mtime:
+            self._load(generation)
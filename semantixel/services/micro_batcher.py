@@ -0,0 +1,175 @@
+"""Dynamic micro-batching for concurrent inference requests.
+
+:class:`MicroBatcher` sits in front of a batch-capable model call.
+Concurrent callers submit their inputs and block; a single worker
+thread gathers requests until either ``max_batch_size`` inputs are
+queued or ``max_wait_ms`` has elapsed since the first one arrived,
+runs one forward pass, and scatters the outputs back to each caller.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from semantixel.core.logging import logger
+
+_STOP = object()
+
+
+@dataclass
+class _Request:
+    """A pending caller request."""
+
+    items: List[Any]
+    key: Optional[Hashable]
+    future: Future
+
+
+class MicroBatcher:
+    """Coalesce concurrent requests into batched calls of *batch_fn*.
+
+    Requests carrying different *keys* (for example different OCR
+    thresholds) are never mixed in one call.  A request larger than
+    ``max_batch_size`` is run on its own rather than split.
+
+    Usage::
+
+        batcher = MicroBatcher(
+            "clip_image", lambda images, _key: clip.get_image_embeddings(images)
+        )
+        embeddings = batcher.submit(images)
+
+    Attributes:
+        name: Label used in logs and stats.
+        max_batch_size: Upper bound on inputs per forward pass.
+        max_wait_ms: Longest time the first request waits for company.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any], Optional[Hashable]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._histogram: Dict[int, int] = {}
+        self._thread = threading.Thread(
+            target=self._run, name="batcher-%s" % name, daemon=True
+        )
+        self._thread.start()
+
+    # Public API
+
+    def submit(self, items: List[Any], key: Optional[Hashable] = None) -> List[Any]:
+        """Queue *items* and block until their outputs are ready.
+
+        Args:
+            items: Inputs for a single caller.
+            key: Optional grouping key forwarded to *batch_fn*.
+
+        Returns:
+            One output per input, in input order.
+        """
+        if not items:
+            return []
+        future: Future = Future()
+        self._queue.put(_Request(list(items), key, future))
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, totals and the batch-size histogram."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "batch_size_histogram": dict(sorted(self._histogram.items())),
+            }
+
+    def close(self) -> None:
+        """Stop the worker thread after draining queued requests."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # Internal
+
+    def _run(self) -> None:
+        """Worker loop: gather, group by key, execute, scatter."""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            pending = [first]
+            total = len(first.items)
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            stop = False
+            while total < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                pending.append(request)
+                total += len(request.items)
+
+            groups: Dict[Optional[Hashable], List[_Request]] = {}
+            for request in pending:
+                groups.setdefault(request.key, []).append(request)
+            for key, requests in groups.items():
+                self._execute(key, requests)
+
+            if stop:
+                return
+
+    def _execute(self, key: Optional[Hashable], requests: List[_Request]) -> None:
+        """Run *requests* in batches of at most ``max_batch_size`` inputs."""
+        batch: List[_Request] = []
+        size = 0
+        for request in requests:
+            if batch and size + len(request.items) > self.max_batch_size:
+                self._run_batch(key, batch)
+                batch, size = [], 0
+            batch.append(request)
+            size += len(request.items)
+        if batch:
+            self._run_batch(key, batch)
+
+    def _run_batch(self, key: Optional[Hashable], requests: List[_Request]) -> None:
+        """Execute one forward pass and resolve every request's future."""
+        inputs = [item for request in requests for item in request.items]
+        try:
+            outputs = self.batch_fn(inputs, key)
+        except Exception as exc:
+            logger.warning("Micro-batch '%s' failed: %s", self.name, exc)
+            for request in requests:
+                request.future.set_exception(exc)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(inputs)
+            self._histogram[len(inputs)] = self._histogram.get(len(inputs), 0) + 1
+
+        offset = 0
+        for request in requests:
+            count = len(request.items)
+            request.future.set_result(list(outputs[offset:offset + count]))
+            offset += count
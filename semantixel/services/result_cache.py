@@ -0,0 +1,152 @@
+"""Search result cache tagged with the index generation.
+
+Popular queries otherwise repeat the full encode, query, merge and
+filter pipeline.  :class:`SearchResultCache` stores finished result
+lists keyed on the endpoint and its arguments, together with the index
+generation they were computed against (see
+:attr:`IndexService.generation`).  A lookup under any other generation
+(newer, or older after the index was reset) discards the whole cache,
+so results never outlive the index they came from.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+Results = List[Dict[str, Any]]
+
+
+class SearchResultCache:
+    """LRU + TTL cache of search results bound to one index generation.
+
+    Usage::
+
+        cache = SearchResultCache(max_entries=512, ttl_seconds=300)
+        results = cache.get(key, generation)
+        if results is None:
+            results = run_search()
+            cache.put(key, generation, results)
+
+    Attributes:
+        max_entries: Maximum cached result lists (``0`` disables caching).
+        ttl_seconds: Age after which an entry is recomputed (``0`` = never).
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300.0):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Results]]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable, generation: int) -> Optional[Results]:
+        """Return a copy of the results cached under *key*, if still valid.
+
+        Args:
+            key: Endpoint name plus normalised arguments.
+            generation: Current index generation.
+
+        Returns:
+            The cached result list, or ``None`` on a miss.
+        """
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and (
+                time.time() - entry[0] > self.ttl_seconds
+            ):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return [dict(result) for result in entry[1]]
+
+    def put(self, key: Hashable, generation: int, results: Results) -> None:
+        """Store *results* computed against index *generation*.
+
+        Results computed against another generation than the cache's
+        current one are dropped; only lookups move the cache to a new
+        generation, so a slow search cannot roll it back.
+        """
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            if self._generation is None:
+                self._sync_generation(generation)
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.time(), [dict(result) for result in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, occupancy and the cached generation."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached result list."""
+        with self._lock:
+            self._entries.clear()
+
+    def _sync_generation(self, generation: int) -> None:
+        """Discard all entries when the index generation has changed."""
+        if generation != self._generation:
+            if self._entries:
+                self._entries.clear()
+                self._invalidations += 1
+            self._generation = generation
+
+
+def cached_results(endpoint: str) -> Callable:
+    """Decorate a search method so its results go through the result cache.
+
+    The key is *endpoint* plus the method's arguments bound to its
+    signature (so positional and keyword calls share entries).  The
+    decorated object must expose ``result_cache`` and an
+    ``index_service`` with a ``generation`` property.  The generation is
+    read *before* searching, so a scan that finishes mid-search cannot
+    tag stale results as current.
+
+    Args:
+        endpoint: Name distinguishing this search mode in cache keys.
+    """
+
+    def decorator(method: Callable[..., Results]) -> Callable[..., Results]:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs) -> Results:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (endpoint,) + tuple(bound.arguments.values())[1:]
+
+            generation = self.index_service.generation
+            results = self.result_cache.get(key, generation)
+            if results is None:
+                results = method(self, *args, **kwargs)
+                self.result_cache.put(key, generation, results)
+            return results
+
+        return wrapper
+
+    return decorator
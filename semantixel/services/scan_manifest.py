@@ -0,0 +1,279 @@
+"""Persistent scan manifest for incremental indexing.
+
+Records the path, size, modification time, inode and a sampled content
+hash of every indexed media item in a small SQLite database under the
+index directory.  Each scan diffs the freshly discovered media against
+the manifest so that only new or changed files reach the models and
+deletions are detected without reading the vector collections.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from semantixel.core.logging import logger
+from semantixel.media import LOCAL_SOURCE, MediaDescriptor
+
+HASH_SAMPLE_BYTES = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifest (
+    media_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    locator TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    content_hash TEXT,
+    indexed_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """A single manifest row describing the indexed state of a media item.
+
+    Attributes:
+        media_id: Unique media identifier (primary key).
+        source: Source tag (``"local"``, ``"gdrive"``).
+        locator: File path or Drive file ID.
+        size: File size in bytes (``None`` for remote items).
+        mtime_ns: Modification time in nanoseconds (``None`` for remote items).
+        inode: File inode number (``None`` for remote items).
+        content_hash: Sampled BLAKE2b content hash (``None`` for remote items).
+    """
+
+    media_id: str
+    source: str
+    locator: str
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+    inode: Optional[int] = None
+    content_hash: Optional[str] = None
+
+
+@dataclass
+class ManifestDiff:
+    """Result of comparing a scan against the manifest.
+
+    Attributes:
+        new: Media items not present in the manifest.
+        changed: Media items whose size, mtime or content changed.
+        unchanged: Media items that can be skipped.
+        removed_ids: Media IDs present in the manifest but not in the scan.
+        entries: Manifest rows to write once indexing has finished.
+    """
+
+    new: List[MediaDescriptor] = field(default_factory=list)
+    changed: List[MediaDescriptor] = field(default_factory=list)
+    unchanged: List[MediaDescriptor] = field(default_factory=list)
+    removed_ids: List[str] = field(default_factory=list)
+    entries: List[ManifestEntry] = field(default_factory=list)
+
+    @property
+    def to_index(self) -> List[MediaDescriptor]:
+        """Items that must be (re-)indexed."""
+        return self.new + self.changed
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the scan found no additions, changes or deletions."""
+        return not (self.new or self.changed or self.removed_ids)
+
+
+def compute_content_hash(path: str, size: int) -> str:
+    """Hash the size plus the first and last ``HASH_SAMPLE_BYTES`` of a file.
+
+    Files no larger than twice the sample size are hashed in full.
+
+    Args:
+        path: Local file path.
+        size: File size in bytes.
+
+    Returns:
+        Hex digest string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        if size <= 2 * HASH_SAMPLE_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+            f.seek(-HASH_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+class ScanManifest:
+    """SQLite-backed record of what has been indexed.
+
+    Usage::
+
+        manifest = ScanManifest("db/scan_manifest.sqlite3")
+        diff = manifest.diff(media_items)
+        ...  # index diff.to_index, purge diff.changed + diff.removed_ids
+        manifest.commit(diff)
+
+    Attributes:
+        path: Location of the SQLite database file.
+    """
+
+    def __init__(self, path: str = "db/scan_manifest.sqlite3"):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and make sure the schema exists."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute(_SCHEMA)
+        return conn
+
+    def is_empty(self) -> bool:
+        """Whether the manifest has no recorded items."""
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM manifest LIMIT 1").fetchone() is None
+
+    def load(self) -> Dict[str, ManifestEntry]:
+        """Return every manifest row keyed by media ID."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT media_id, source, locator, size, mtime_ns, inode, content_hash "
+                "FROM manifest"
+            ).fetchall()
+        return {row[0]: ManifestEntry(*row) for row in rows}
+
+    def diff(self, media_items: List[MediaDescriptor], force: bool = False) -> ManifestDiff:
+        """Classify *media_items* against the stored manifest.
+
+        Local files are compared on size, mtime and inode first; the
+        content hash is only computed when those differ, so a touched
+        but otherwise identical file is not re-indexed.  Remote items
+        carry no file stats and are only re-indexed when new.
+
+        Args:
+            media_items: Every media item found by the current scan.
+            force: Treat all known items as changed (``deep_scan``).
+
+        Returns:
+            A :class:`ManifestDiff`.
+        """
+        t0 = time.time()
+        known = self.load()
+        result = ManifestDiff()
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            checks = executor.map(
+                lambda media: self._check(media, known.get(media.media_id), force),
+                media_items,
+            )
+            for media, (status, entry) in zip(media_items, checks):
+                getattr(result, status).append(media)
+                if entry is not None:
+                    result.entries.append(entry)
+
+        current_ids = {media.media_id for media in media_items}
+        result.removed_ids = [media_id for media_id in known if media_id not in current_ids]
+
+        logger.info(
+            "Scan manifest diff: %d new, %d changed, %d unchanged, %d removed in %.2fs",
+            len(result.new),
+            len(result.changed),
+            len(result.unchanged),
+            len(result.removed_ids),
+            time.time() - t0,
+        )
+        return result
+
+    def commit(self, diff: ManifestDiff, failed_ids: Iterable[str] = ()) -> None:
+        """Persist the entries and deletions recorded in *diff*.
+
+        Call only after the items in :attr:`ManifestDiff.to_index` have
+        been indexed.  Entries of *failed_ids* are left out so the next
+        scan retries those items.
+
+        Args:
+            diff: The diff whose items were indexed.
+            failed_ids: Media IDs whose indexing failed.
+        """
+        failed = set(failed_ids)
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM manifest WHERE media_id = ?",
+                [(media_id,) for media_id in diff.removed_ids],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest "
+                "(media_id, source, locator, size, mtime_ns, inode, content_hash, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.media_id,
+                        e.source,
+                        e.locator,
+                        e.size,
+                        e.mtime_ns,
+                        e.inode,
+                        e.content_hash,
+                        now,
+                    )
+                    for e in diff.entries
+                    if e.media_id not in failed
+                ],
+            )
+
+    # Internal helpers
+
+    @staticmethod
+    def _check(
+        media: MediaDescriptor, previous: Optional[ManifestEntry], force: bool
+    ) -> Tuple[str, Optional[ManifestEntry]]:
+        """Return ``(status, entry_to_write)`` for a single item.
+
+        ``status`` is the name of the :class:`ManifestDiff` list the item
+        belongs to.  ``entry_to_write`` is ``None`` when the stored row is
+        still accurate.
+        """
+        if media.source != LOCAL_SOURCE:
+            if previous is not None and not force:
+                return "unchanged", None
+            entry = ManifestEntry(media.media_id, media.source, media.locator)
+            return ("new" if previous is None else "changed"), entry
+
+        try:
+            stat = os.stat(media.locator)
+        except OSError:
+            return ("new" if previous is None else "changed"), None
+
+        stat_key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        if (
+            previous is not None
+            and not force
+            and (previous.size, previous.mtime_ns, previous.inode) == stat_key
+        ):
+            return "unchanged", None
+
+        try:
+            content_hash = compute_content_hash(media.locator, stat.st_size)
+        except OSError:
+            content_hash = None
+
+        entry = ManifestEntry(
+            media.media_id,
+            media.source,
+            media.locator,
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+            content_hash,
+        )
+        if previous is None:
+            return "new", entry
+        if not force and content_hash is not None and content_hash == previous.content_hash:
+            return "unchanged", entry
+        return "changed", entry
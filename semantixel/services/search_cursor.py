@@ -0,0 +1,169 @@
+"""Opaque pagination cursors for the search endpoints.
+
+A cursor is a short token: the endpoint, the search parameters, the
+number of results already returned, the score and composite ID of the
+last one, and the ID of a server-side session.  The session
+(:class:`CursorSessions`) keeps what should not travel with every
+request: the query embedding of each modality and the ranked results
+computed so far, so later pages are usually cut from memory instead of
+re-running the search.  If the session has expired, the search
+parameters in the cursor are enough to rank again from the top.
+"""
+
+import base64
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+CURSOR_VERSION = 2
+
+_REQUIRED_KEYS = ("endpoint", "query", "threshold", "media_type", "offset", "sid")
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Serialise a search *state* into an opaque cursor string.
+
+    Args:
+        state: Dict with at least the keys in ``_REQUIRED_KEYS`` plus
+            optional ``last`` (``[score, composite_id]``).
+
+    Returns:
+        URL-safe cursor token.
+    """
+    payload = dict(state)
+    payload["v"] = CURSOR_VERSION
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, endpoint: str) -> Dict[str, Any]:
+    """Parse a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        token: Cursor string from a previous page.
+        endpoint: Endpoint the cursor must have been issued by.
+
+    Returns:
+        The search state.
+
+    Raises:
+        ValueError: If the cursor is malformed, from another version, or
+            was issued by a different endpoint.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid search cursor") from exc
+
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION:
+        raise ValueError("Unsupported search cursor version")
+    if payload.get("endpoint") != endpoint:
+        raise ValueError("Search cursor was issued by a different endpoint")
+    if any(key not in payload for key in _REQUIRED_KEYS):
+        raise ValueError("Invalid search cursor")
+
+    payload["offset"] = int(payload["offset"])
+    return payload
+
+
+class CursorSessions:
+    """Bounded LRU + TTL store of paging sessions keyed by short IDs.
+
+    Usage::
+
+        sessions = CursorSessions(max_entries=256, ttl_seconds=600)
+        sid = sessions.create({"embeddings": {}, "ranked": []})
+        session = sessions.get(sid)  # None once evicted or expired
+
+    Sessions are plain dicts owned by the caller; the store only bounds
+    how many are kept and for how long.
+
+    Attributes:
+        max_entries: Maximum sessions kept (``0`` disables the store).
+        ttl_seconds: Idle time after which a session expires (``0`` = never).
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600.0):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def create(self, session: Dict[str, Any]) -> str:
+        """Store *session* and return its new ID."""
+        session_id = secrets.token_urlsafe(9)
+        if self.max_entries == 0:
+            return session_id
+        with self._lock:
+            self._sessions[session_id] = [time.time(), session]
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session stored under *session_id*, refreshing its age."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            now = time.time()
+            if entry is not None and self.ttl_seconds > 0 and now - entry[0] > self.ttl_seconds:
+                del self._sessions[session_id]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            entry[0] = now
+            self._sessions.move_to_end(session_id)
+            self._hits += 1
+            return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "entries": len(self._sessions),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+def resume_position(results: List[Dict[str, Any]], state: Dict[str, Any]) -> int:
+    """Index in *results* at which the next page starts.
+
+    The page continues right after the cursor's last result.  If that
+    result is no longer present (the index changed in between), it
+    continues at the first result scoring below it, falling back to the
+    cursor's offset when no score was recorded.
+
+    Args:
+        results: Ranked results from the top, at least ``offset`` long
+            when nothing changed.
+        state: Decoded cursor state.
+    """
+    last: Optional[List[Any]] = state.get("last")
+    if not last:
+        return min(state["offset"], len(results))
+
+    last_score, last_id = last
+    for position, result in enumerate(results):
+        if result.get("composite_id") == last_id:
+            return position + 1
+    if last_score is None:
+        return min(state["offset"], len(results))
+    for position, result in enumerate(results):
+        score = result_score(result)
+        if score is not None and score < last_score:
+            return position
+    return len(results)
+
+
+def result_score(result: Dict[str, Any]) -> Optional[float]:
+    """Return the ranking score stored on a result dict, if any."""
+    score = result.get("similarity", result.get("score"))
+    return float(score) if score is not None else None
@@ -5,11 +5,21 @@ The :class:`SearchService` is the public facade for all query modes:
 * :meth:`semantic_text_search` — CLIP + MiniLM + CLAP.
 * :meth:`semantic_image_search` — CLIP visual similarity.
 * :meth:`keyword_search` — BM25 exact-match.
+* :meth:`hybrid_search` — all of the above text modalities fused by rank.
+* :meth:`batch_text_search` / :meth:`batch_image_search` — many queries
+  with one forward pass and one collection query per modality.
 * :meth:`integrated_face_search` — face-name + semantic activity.
+
+The text, image and keyword modes also have ``*_page`` variants that
+return a pagination cursor (see :mod:`semantixel.services.search_cursor`),
+and :meth:`stream_search` yields per-source results as they arrive.
 """
 
 import io
-from typing import Any, Callable, Dict, List, Optional
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import requests
@@ -17,7 +27,16 @@ from PIL import Image
 
 from semantixel.core.config import config
 from semantixel.media import parse_media_id
+from semantixel.services.embedding_cache import QueryEmbeddingCache
 from semantixel.services.model_manager import model_manager
+from semantixel.services.result_cache import SearchResultCache, cached_results
+from semantixel.services.search_cursor import (
+    CursorSessions,
+    decode_cursor,
+    encode_cursor,
+    result_score,
+    resume_position,
+)
 from semantixel.services.index_service import IndexService
 from semantixel.services.face_service import FaceService
 from semantixel.services.graph_service import GraphService
@@ -48,8 +67,24 @@ class SearchService:
         audio_collection: ChromaDB collection for CLAP audio embeddings.
         bm25_service: BM25 keyword search index.
         graph_service: :class:`GraphService` for similarity graph generation.
+        embedding_cache: :class:`QueryEmbeddingCache` shared by all
+            text-query modalities.
+        result_cache: :class:`SearchResultCache` for finished result
+            lists, invalidated by the index generation.
+        cursor_sessions: :class:`CursorSessions` holding the embeddings
+            and ranked results behind pagination cursors.
     """
 
+    FUSION_METHODS = ("rrf", "weighted")
+    STREAM_MODES = ("semantic", "hybrid")
+
+    # Metadata ``type`` values stored for each ``media_type`` filter.
+    MEDIA_TYPE_VALUES = {
+        "image": ["image"],
+        "video": ["video_frame", "video"],
+        "audio": ["audio"],
+    }
+
     MODALITY_RANGES = {
         "clip": {"min_s": 0.10, "max_s": 0.35},
         "minilm": {"min_s": 0.15, "max_s": 0.75},
@@ -63,19 +98,61 @@ class SearchService:
         self.text_collection = index_service.text_collection
         self.audio_collection = index_service.audio_collection
         self.bm25_service = index_service.bm25_service
-        self.graph_service = GraphService(self.image_collection)
+        self.graph_service = GraphService(
+            self.image_collection, index_service.graph_store
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, config.search.max_workers),
+            thread_name_prefix="search",
+        )
+
+        cache_config = config.search.embedding_cache
+        self.embedding_cache = QueryEmbeddingCache(
+            max_entries=cache_config.max_entries,
+            ttl_seconds=cache_config.ttl_seconds,
+            disk_path=(
+                os.path.join(index_service.db_path, "query_embeddings.sqlite3")
+                if cache_config.disk_enabled
+                else None
+            ),
+        )
+
+        self.result_cache = SearchResultCache(
+            max_entries=config.search.result_cache.max_entries,
+            ttl_seconds=config.search.result_cache.ttl_seconds,
+        )
+        self.cursor_sessions = CursorSessions(
+            max_entries=config.search.cursor_cache.max_entries,
+            ttl_seconds=config.search.cursor_cache.ttl_seconds,
+        )
 
         self._modalities: List[tuple[Callable, Any, str]] = [
-            (model_manager.clip.get_text_embeddings, self.image_collection, "clip"),
-            (model_manager.text_embed.get_embeddings, self.text_collection, "minilm"),
+            (self._cached_embedder(lambda: model_manager.clip, "get_text_embeddings"),
+             self.image_collection, "clip"),
+            (self._cached_embedder(lambda: model_manager.text_embed, "get_embeddings"),
+             self.text_collection, "minilm"),
         ]
         if config.audio.clap_enabled:
             self._modalities.append(
-                (model_manager.clap.get_text_embeddings, self.audio_collection, "clap")
+                (self._cached_embedder(lambda: model_manager.clap, "get_text_embeddings"),
+                 self.audio_collection, "clap")
             )
 
+        self._batch_embedders: Dict[str, Callable[[List[str]], List[List[float]]]] = {
+            "clip": self._cached_batch_embedder(
+                lambda: model_manager.clip, "get_text_embeddings_batch"
+            ),
+            "minilm": self._cached_batch_embedder(
+                lambda: model_manager.text_embed, "get_embeddings_batch"
+            ),
+            "clap": self._cached_batch_embedder(
+                lambda: model_manager.clap, "get_text_embeddings_batch"
+            ),
+        }
+
     # Public API
 
+    @cached_results("clip_text")
     def semantic_text_search(
         self,
         query: str,
@@ -86,10 +163,17 @@ class SearchService:
         """Unified natural-language search across all indexed modalities.
 
         Queries the image collection (CLIP), text collection (MiniLM),
-        and — when enabled — the ambient audio collection (CLAP). Results
+        and — when enabled — the ambient audio collection (CLAP)
+        concurrently; a modality that fails or exceeds its timeout is
+        left out rather than failing the whole search. Results
         from each collection are normalised with :meth:`_normalize_distance`,
         merged, sorted by descending similarity, deduplicated, and filtered.
 
+        The media type filter is applied inside each collection query,
+        and only modalities whose page came back full are re-queried
+        with a wider ``n_results`` when deduplication leaves fewer than
+        *top_k* results (see :meth:`_fetch_filtered`).
+
         Args:
             query: Free-text search query.
             top_k: Maximum number of results to return.
@@ -103,37 +187,102 @@ class SearchService:
         logger.info(
             "Unified Semantic Search: %s (top_k=%d, type=%s)", query, top_k, media_type
         )
-        query_k = top_k * 10
-        is_lyrics = self._is_lyrics_query(query)
+        return self._semantic_text_ranked(query, top_k, threshold, media_type, {})
 
-        combined_items = []
-        for embedding_fn, collection, modality in self._modalities:
-            results = self._query_collection(embedding_fn, collection, query, query_k)
-            if not results["ids"] or not results["ids"][0]:
-                continue
-            for p, d, m in zip(
-                results["ids"][0], results["distances"][0], results["metadatas"][0]
-            ):
-                s = self._normalize_distance(d, modality)
-                if is_lyrics and modality == "minilm":
-                    subtype = (m or {}).get("subtype", "")
-                    if subtype == "transcript":
-                        s = min(1.0, s * 1.25)
-                combined_items.append((p, s, m))
-
-        combined_items.sort(key=lambda x: x[1], reverse=True)
-
-        merged_results = {
-            "ids": [[item[0] for item in combined_items]],
-            "distances": [[item[1] for item in combined_items]],
-            "metadatas": [[item[2] for item in combined_items]],
-        }
+    def semantic_text_search_page(
+        self,
+        query: str = "",
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "image",
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Paginated :meth:`semantic_text_search`.
 
-        if not merged_results["ids"] or not merged_results["ids"][0]:
-            return []
+        The first call (no *cursor*) encodes the query; the per-modality
+        query embeddings and ranked results stay in the paging session
+        (see :meth:`_ranked_page`), so later pages skip every encoder
+        pass and are usually cut from the stored ranking. *query*,
+        *threshold* and *media_type* are taken from the cursor when one
+        is given.
+
+        Args:
+            query: Free-text search query (first page only).
+            top_k: Page size.
+            threshold: Minimum similarity score (first page only).
+            media_type: Type filter (first page only).
+            cursor: ``next_cursor`` from the previous page.
+
+        Returns:
+            Dict with ``results`` and ``next_cursor`` (``None`` on the last page).
+
+        Raises:
+            ValueError: If *cursor* is invalid.
+        """
+        def rank(state: Dict[str, Any], session: Dict[str, Any], depth: int) -> list:
+            return self._semantic_text_ranked(
+                state["query"], depth, state["threshold"], state["media_type"],
+                session["embeddings"],
+            )
+
+        return self._ranked_page(
+            "clip_text", cursor, top_k, rank,
+            query=query, threshold=threshold, media_type=media_type,
+        )
+
+    def _semantic_text_ranked(
+        self,
+        query: str,
+        depth: int,
+        threshold: float,
+        media_type: str,
+        embeddings: Dict[str, List[float]],
+        prefetched: Optional[Dict[str, dict]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Ranked, filtered text-search results down to *depth* entries.
 
-        return self._filter_results(merged_results, top_k, threshold, media_type)
+        Args:
+            query: Free-text search query.
+            depth: Number of filtered results to produce.
+            threshold: Minimum similarity score.
+            media_type: Type filter.
+            embeddings: Query embedding per modality; missing entries are
+                computed and stored back into the dict.
+            prefetched: Collection results already fetched with
+                ``n_results = _initial_fetch_size(depth)``, used in place
+                of the first round of queries.
+
+        Returns:
+            Up to *depth* result dicts by descending similarity.
+        """
+        is_lyrics = self._is_lyrics_query(query)
+        where = self._media_type_where(media_type)
+        scored: Dict[str, list] = {}
+        pending = [modality for _, _, modality in self._modalities]
+
+        def fetch(query_k: int) -> Tuple[Dict[str, Any], bool]:
+            nonlocal prefetched
+            if prefetched is not None:
+                responses, prefetched = prefetched, None
+            else:
+                responses = self._gather(
+                    self._submit_modalities(query, query_k, where, pending, embeddings)
+                )
+            pending.clear()
+            for modality, results in responses.items():
+                items = self._score_modality_results(results, modality, is_lyrics)
+                scored[modality] = items
+                if self._page_is_full(items, query_k, threshold):
+                    pending.append(modality)
+
+            merged_results = self._merge_items(
+                [item for items in scored.values() for item in items]
+            )
+            return merged_results, bool(pending)
 
+        return self._fetch_filtered(fetch, depth, threshold, media_type)
+
+    @cached_results("clip_image")
     def semantic_image_search(
         self,
         image_path: str,
@@ -157,22 +306,212 @@ class SearchService:
         """
         query_media, query_input = self._resolve_query_media(image_path)
         embedding = model_manager.clip.get_image_embeddings([query_input])[0]
+        exclude_path = query_media.media_id if query_media is not None else None
+        return self._image_ranked(embedding, top_k, threshold, media_type, exclude_path)
 
-        query_k = top_k * 10
-        results = self.image_collection.query(
-            query_embeddings=[embedding],
-            n_results=query_k,
-            include=["distances", "metadatas"],
+    def semantic_image_search_page(
+        self,
+        image_path: str = "",
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "all",
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Paginated :meth:`semantic_image_search`.
+
+        The paging session keeps the query image's CLIP embedding, so
+        later pages neither fetch nor re-encode the image.  A cursor
+        whose session has expired is rejected rather than resolving the
+        image path it names again.
+
+        Args:
+            image_path: Local path, media ID, or URL (first page only).
+            top_k: Page size.
+            threshold: Minimum similarity score (first page only).
+            media_type: Type filter (first page only).
+            cursor: ``next_cursor`` from the previous page.
+
+        Returns:
+            Dict with ``results`` and ``next_cursor`` (``None`` on the last page).
+
+        Raises:
+            ValueError: If *cursor* is invalid or expired, or the image
+                cannot be resolved.
+        """
+        def rank(state: Dict[str, Any], session: Dict[str, Any], depth: int) -> list:
+            embedding = session["embeddings"].get("clip")
+            if embedding is None:
+                if cursor:
+                    raise ValueError("Search cursor has expired")
+                query_media, query_input = self._resolve_query_media(state["query"])
+                embedding = list(model_manager.clip.get_image_embeddings([query_input])[0])
+                session["embeddings"]["clip"] = embedding
+                session["exclude_path"] = (
+                    query_media.media_id if query_media is not None else None
+                )
+            return self._image_ranked(
+                embedding, depth, state["threshold"], state["media_type"],
+                session.get("exclude_path"),
+            )
+
+        return self._ranked_page(
+            "clip_image", cursor, top_k, rank,
+            query=image_path, threshold=threshold, media_type=media_type,
         )
 
-        exclude_path = query_media.media_id if query_media is not None else None
-        results["distances"][0] = [
-            self._normalize_distance(d, "clip") for d in results["distances"][0]
-        ]
-        return self._filter_results(
-            results, top_k, threshold, media_type, exclude_path=exclude_path
+    def _image_ranked(
+        self,
+        embedding: List[float],
+        depth: int,
+        threshold: float,
+        media_type: str,
+        exclude_path: Optional[str],
+        prefetched: Optional[dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """Ranked, filtered image-search results down to *depth* entries.
+
+        *prefetched*, if given, is the collection result for
+        ``n_results = _initial_fetch_size(depth)`` and replaces the first
+        query.
+        """
+        where = self._media_type_where(media_type)
+
+        def fetch(query_k: int) -> Tuple[Dict[str, Any], bool]:
+            nonlocal prefetched
+            if prefetched is not None:
+                results, prefetched = prefetched, None
+            else:
+                results = self._query_collection(
+                    self.image_collection, embedding, query_k, where
+                )
+            results["distances"][0] = [
+                self._normalize_distance(d, "clip") for d in results["distances"][0]
+            ]
+            similarities = results["distances"][0]
+            more = len(similarities) >= query_k and similarities[-1] > threshold
+            return results, more
+
+        return self._fetch_filtered(
+            fetch, depth, threshold, media_type, exclude_path=exclude_path
+        )
+
+    def batch_text_search(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "image",
+    ) -> List[List[Dict[str, Any]]]:
+        """Run :meth:`semantic_text_search` for many queries at once.
+
+        Each modality encodes all *queries* in one forward pass (cache
+        misses only) and sends every vector in a single
+        ``collection.query``. Merging, filtering and any widening then
+        happen per query, exactly as for a single search.
+
+        Args:
+            queries: Free-text search queries.
+            top_k: Maximum number of results per query.
+            threshold: Minimum similarity score.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+
+        Returns:
+            One result list per query, in input order.
+        """
+        if not queries:
+            return []
+        logger.info(
+            "Batch Semantic Search: %d queries (top_k=%d, type=%s)",
+            len(queries), top_k, media_type,
+        )
+        where = self._media_type_where(media_type)
+        query_k = self._initial_fetch_size(top_k)
+        responses = self._gather({
+            modality: self._executor.submit(
+                self._batch_query_modality, modality, collection, queries, query_k, where
+            )
+            for _, collection, modality in self._modalities
+        })
+
+        results = []
+        for position, query in enumerate(queries):
+            embeddings = {
+                modality: vectors[position]
+                for modality, (vectors, _) in responses.items()
+            }
+            prefetched = {
+                modality: self._slice_query_result(response, position)
+                for modality, (_, response) in responses.items()
+            }
+            results.append(
+                self._semantic_text_ranked(
+                    query, top_k, threshold, media_type, embeddings, prefetched
+                )
+            )
+        return results
+
+    def batch_image_search(
+        self,
+        images: List[Union[str, Image.Image]],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "all",
+    ) -> List[List[Dict[str, Any]]]:
+        """Run :meth:`semantic_image_search` for many query images at once.
+
+        All images are embedded in one CLIP forward pass and searched with
+        a single ``collection.query``. Path and media-ID queries exclude
+        themselves from their results, as in the single-image search.
+
+        Args:
+            images: Local paths, media IDs, URLs, or already decoded images.
+            top_k: Maximum number of results per query.
+            threshold: Minimum similarity score.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+
+        Returns:
+            One result list per query image, in input order.
+
+        Raises:
+            ValueError: If any query image cannot be resolved.
+        """
+        if not images:
+            return []
+        logger.info(
+            "Batch Image Search: %d queries (top_k=%d, type=%s)",
+            len(images), top_k, media_type,
+        )
+        resolved = list(self._executor.map(
+            lambda image: (
+                self._resolve_query_media(image) if isinstance(image, str) else (None, image)
+            ),
+            images,
+        ))
+        embeddings = model_manager.clip.get_image_embeddings(
+            [query_input for _, query_input in resolved]
+        )
+        response = self._query_collection_batch(
+            self.image_collection,
+            embeddings,
+            self._initial_fetch_size(top_k),
+            self._media_type_where(media_type),
         )
 
+        results = []
+        for position, (query_media, _) in enumerate(resolved):
+            results.append(
+                self._image_ranked(
+                    embeddings[position],
+                    top_k,
+                    threshold,
+                    media_type,
+                    query_media.media_id if query_media is not None else None,
+                    prefetched=self._slice_query_result(response, position),
+                )
+            )
+        return results
+
+    @cached_results("embed_text")
     def keyword_search(
         self,
         query: str,
@@ -189,27 +528,309 @@ class SearchService:
             media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
 
         Returns:
-            List of matching result dicts.
+            List of matching result dicts, each with its BM25 ``score``.
         """
-        ids = self.bm25_service.search(query, top_k, threshold, media_type)
-        if not ids:
+        hits = self.bm25_service.search_scored(query, top_k, threshold, media_type)
+        if not hits:
             return []
 
-        metadata_lookup = {}
-        try:
-            collection_data = self.image_collection.get(ids=ids, include=["metadatas"])
-            for item_id, metadata in zip(
-                collection_data["ids"], collection_data.get("metadatas") or []
-            ):
-                metadata_lookup[item_id] = metadata
-        except Exception:
-            metadata_lookup = {}
-
+        metadata_lookup = self._lookup_metadata(
+            self.image_collection, [item_id for item_id, _ in hits]
+        )
         return [
-            self._process_item_id(item_id, metadata_lookup.get(item_id))
-            for item_id in ids
+            dict(self._process_item_id(item_id, metadata_lookup.get(item_id)), score=score)
+            for item_id, score in hits
         ]
 
+    def keyword_search_page(
+        self,
+        query: str = "",
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "all",
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Paginated :meth:`keyword_search`.
+
+        BM25 has no query embedding; the paging session only keeps the
+        ranked hits, which are re-scored against the CSR postings when a
+        page runs past them.
+
+        Args:
+            query: Keyword query string (first page only).
+            top_k: Page size.
+            threshold: Minimum BM25 score (first page only).
+            media_type: Type filter (first page only).
+            cursor: ``next_cursor`` from the previous page.
+
+        Returns:
+            Dict with ``results`` and ``next_cursor`` (``None`` on the last page).
+
+        Raises:
+            ValueError: If *cursor* is invalid.
+        """
+        def rank(state: Dict[str, Any], session: Dict[str, Any], depth: int) -> list:
+            return self.keyword_search(
+                state["query"], depth, state["threshold"], state["media_type"]
+            )
+
+        return self._ranked_page(
+            "embed_text", cursor, top_k, rank,
+            query=query, threshold=threshold, media_type=media_type,
+        )
+
+    @cached_results("hybrid_search")
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "all",
+        fusion: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fuse CLIP, MiniLM, CLAP and BM25 rankings into one result list.
+
+        All modality queries and the BM25 lookup run concurrently on the
+        service's executor. Each source's hits are filtered by
+        *media_type* and collapsed to one entry per media item (see
+        :meth:`_rank_by_media`) before fusion. Sources start with the
+        same ``n_results`` as :meth:`semantic_text_search`; those that
+        returned a full page are re-queried wider while fewer than
+        *top_k* fused results clear *threshold* (see :meth:`_fetch_filtered`).
+
+        * ``"rrf"`` — reciprocal rank fusion; a source adds
+          ``weight / (rrf_k + rank)`` for every item it returned.
+        * ``"weighted"`` — a source adds ``weight * score``, using the
+          :meth:`_normalize_distance` score for modalities and the BM25
+          score divided by the best BM25 score; the sum is divided by
+          the total weight of the sources that returned hits.
+
+        Weights and ``rrf_k`` come from ``config.search``. A source that
+        fails or times out is logged and left out of the fusion.
+
+        Args:
+            query: Free-text search query.
+            top_k: Maximum number of results to return.
+            threshold: Fused scores must exceed this value to be kept.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+            fusion: ``"rrf"`` or ``"weighted"``; defaults to
+                ``config.search.fusion``.
+
+        Returns:
+            Result dicts as returned by :meth:`semantic_text_search`, each
+            with an added ``score`` key, ordered by descending fused score.
+
+        Raises:
+            ValueError: If *fusion* is not a supported method.
+        """
+        fusion = fusion or config.search.fusion
+        if fusion not in self.FUSION_METHODS:
+            raise ValueError("Unsupported fusion method: %s" % fusion)
+
+        logger.info(
+            "Hybrid Search: %s (top_k=%d, type=%s, fusion=%s)",
+            query, top_k, media_type, fusion,
+        )
+        return self._hybrid_ranked(query, top_k, threshold, media_type, fusion, {})
+
+    def stream_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.0,
+        media_type: str = "image",
+        mode: str = "semantic",
+        fusion: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Search and yield each source's results as soon as it returns.
+
+        Yields one ``{"event": "partial", "source": ..., "results": [...]}``
+        per modality (and, in hybrid mode, for BM25) in completion order,
+        then ``{"event": "final", "results": [...]}`` with the merged
+        ranking, identical to :meth:`semantic_text_search` or
+        :meth:`hybrid_search`. Partial results are that source's own top
+        *top_k* after type filtering and deduplication, scored on its own
+        scale. Sources that fail or time out yield no partial event.
+
+        Args:
+            query: Free-text search query.
+            top_k: Maximum number of results per event.
+            threshold: Minimum score for the final ranking (and, in
+                semantic mode, for partial results).
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+            mode: ``"semantic"`` or ``"hybrid"``.
+            fusion: Hybrid fusion method; defaults to ``config.search.fusion``.
+
+        Returns:
+            Iterator of event dicts.
+
+        Raises:
+            ValueError: If *mode* or *fusion* is not supported.
+        """
+        if mode not in self.STREAM_MODES:
+            raise ValueError("Unsupported search mode: %s" % mode)
+        if mode == "hybrid":
+            fusion = fusion or config.search.fusion
+            if fusion not in self.FUSION_METHODS:
+                raise ValueError("Unsupported fusion method: %s" % fusion)
+            return self._stream_hybrid(query, top_k, threshold, media_type, fusion)
+        return self._stream_semantic(query, top_k, threshold, media_type)
+
+    def _stream_semantic(
+        self, query: str, top_k: int, threshold: float, media_type: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Generator behind :meth:`stream_search` in semantic mode."""
+        logger.info(
+            "Streaming Semantic Search: %s (top_k=%d, type=%s)", query, top_k, media_type
+        )
+        is_lyrics = self._is_lyrics_query(query)
+        embeddings: Dict[str, List[float]] = {}
+        futures = self._submit_modalities(
+            query,
+            self._initial_fetch_size(top_k),
+            self._media_type_where(media_type),
+            embeddings=embeddings,
+        )
+
+        responses = {}
+        for modality, results in self._iter_completed(futures):
+            responses[modality] = results
+            items = self._score_modality_results(results, modality, is_lyrics)
+            yield {
+                "event": "partial",
+                "source": modality,
+                "results": self._filter_results(
+                    self._merge_items(items), top_k, threshold, media_type
+                ),
+            }
+
+        yield {
+            "event": "final",
+            "results": self._semantic_text_ranked(
+                query, top_k, threshold, media_type, embeddings, prefetched=responses
+            ),
+        }
+
+    def _stream_hybrid(
+        self, query: str, top_k: int, threshold: float, media_type: str, fusion: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Generator behind :meth:`stream_search` in hybrid mode."""
+        logger.info(
+            "Streaming Hybrid Search: %s (top_k=%d, type=%s, fusion=%s)",
+            query, top_k, media_type, fusion,
+        )
+        embeddings: Dict[str, List[float]] = {}
+        responses = {}
+        for source, ranked, full in self._hybrid_rankings(
+            query, self._initial_fetch_size(top_k), media_type, embeddings=embeddings
+        ):
+            responses[source] = (ranked, full)
+            yield {
+                "event": "partial",
+                "source": source,
+                "results": [
+                    dict(item_info, score=score) for _, score, item_info in ranked[:top_k]
+                ],
+            }
+        yield {
+            "event": "final",
+            "results": self._hybrid_ranked(
+                query, top_k, threshold, media_type, fusion, embeddings, prefetched=responses
+            ),
+        }
+
+    def _hybrid_ranked(
+        self,
+        query: str,
+        top_k: int,
+        threshold: float,
+        media_type: str,
+        fusion: str,
+        embeddings: Dict[str, List[float]],
+        prefetched: Optional[Dict[str, Tuple[list, bool]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fused hybrid results, widening the sources until *top_k* are found.
+
+        Args:
+            query: Free-text search query.
+            top_k: Maximum number of results to return.
+            threshold: Fused scores must exceed this value to be kept.
+            media_type: Type filter.
+            fusion: ``"rrf"`` or ``"weighted"``.
+            embeddings: Query embedding per modality; missing entries are
+                computed and stored back into the dict.
+            prefetched: ``source -> (ranking, full)`` already fetched with
+                ``n_results = _initial_fetch_size(top_k)``, used in place
+                of the first round of queries.
+
+        Returns:
+            Up to *top_k* fused result dicts by descending score.
+        """
+        rankings: Dict[str, List[Tuple[str, float, Dict[str, Any]]]] = {}
+        pending: Optional[List[str]] = None
+
+        def fetch(query_k: int) -> Tuple[Dict[str, Any], bool]:
+            nonlocal prefetched, pending
+            if prefetched is not None:
+                responses, prefetched = prefetched, None
+            else:
+                responses = {
+                    source: (ranked, full)
+                    for source, ranked, full in self._hybrid_rankings(
+                        query, query_k, media_type, pending, embeddings
+                    )
+                }
+            pending = []
+            for source, (ranked, full) in responses.items():
+                rankings[source] = ranked
+                if full:
+                    pending.append(source)
+            return rankings, bool(pending)
+
+        return self._fetch_filtered(
+            fetch,
+            top_k,
+            threshold,
+            media_type,
+            select=lambda fetched: self._fuse_rankings(fetched, top_k, threshold, fusion),
+        )
+
+    def _hybrid_rankings(
+        self,
+        query: str,
+        query_k: int,
+        media_type: str,
+        sources: Optional[List[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> Iterator[Tuple[str, List[Tuple[str, float, Dict[str, Any]]], bool]]:
+        """Query modalities and BM25; yield each source's ranking as it completes.
+
+        Args:
+            query: Free-text search query.
+            query_k: Hits requested from each source.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+            sources: Modality names and/or ``"bm25"`` to query (default: all).
+            embeddings: Known query embeddings by modality (see
+                :meth:`_submit_modalities`).
+
+        Returns:
+            Iterator of ``(source, ranking, full)`` triples, where each
+            ranking is the output of :meth:`_rank_by_media` and *full*
+            tells whether the source returned all *query_k* hits.
+        """
+        is_lyrics = self._is_lyrics_query(query)
+        futures = self._submit_modalities(
+            query, query_k, self._media_type_where(media_type), sources, embeddings
+        )
+        if sources is None or "bm25" in sources:
+            futures["bm25"] = self._executor.submit(
+                self._keyword_hits, query, query_k, media_type
+            )
+        for source, hits in self._iter_completed(futures):
+            if source != "bm25":
+                hits = self._score_modality_results(hits, source, is_lyrics)
+            yield source, self._rank_by_media(hits, media_type), len(hits) >= query_k
+
     def integrated_face_search(
         self,
         query: str,
@@ -262,10 +883,30 @@ class SearchService:
         final_ids = [p for p in face_paths if p in semantic_paths]
         return [self._process_item_id(p) for p in final_ids[:top_k]]
 
-    def generate_graph_data(self) -> Dict[str, Any]:
-        """Delegate to :class:`GraphService`."""
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters of the search caches."""
+        return {
+            "query_embeddings": self.embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+            "cursors": self.cursor_sessions.stats(),
+        }
+
+    def generate_graph_data(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Delegate to :class:`GraphService`; returns the graph and its ETag."""
         return self.graph_service.generate()
 
+    def generate_graph_level(self, level: int) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Delegate a level-of-detail cluster graph to :class:`GraphService`."""
+        return self.graph_service.generate_level(level)
+
+    def expand_graph_cluster(self, cluster_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Delegate cluster expansion to :class:`GraphService`."""
+        return self.graph_service.expand_cluster(cluster_id)
+
+    def graph_etag(self) -> Optional[str]:
+        """Version tag of the stored semantic graph, if one is stored."""
+        return self.graph_service.etag
+
     def generate_subgraph_data(self, ids: List[str]) -> Dict[str, Any]:
         """Delegate filtered subgraph to :class:`GraphService`."""
         return self.graph_service.generate_for_ids(ids)
@@ -318,25 +959,533 @@ class SearchService:
             return 1.0
         return (s - r["min_s"]) / (r["max_s"] - r["min_s"])
 
+    def _cached_embedder(
+        self, get_provider: Callable[[], Any], method: str
+    ) -> Callable[[str], List[float]]:
+        """Wrap a provider's text-embedding method with :attr:`embedding_cache`.
+
+        The provider is resolved on every call so that a provider
+        replaced by the model manager is picked up (and its new
+        checkpoint invalidates the old entries).
+
+        Args:
+            get_provider: Returns the current model provider.
+            method: Name of the provider's single-text embedding method.
+
+        Returns:
+            Function mapping a query string to its embedding.
+        """
+
+        def embed_query(text: str) -> List[float]:
+            provider = get_provider()
+            return self.embedding_cache.get_or_compute(
+                provider, text, getattr(provider, method)
+            )
+
+        return embed_query
+
+    def _cached_batch_embedder(
+        self, get_provider: Callable[[], Any], method: str
+    ) -> Callable[[List[str]], List[List[float]]]:
+        """Batch counterpart of :meth:`_cached_embedder`.
+
+        Only cache misses are encoded, in a single call to the provider's
+        batch *method*.
+        """
+
+        def embed_queries(texts: List[str]) -> List[List[float]]:
+            provider = get_provider()
+            return self.embedding_cache.get_or_compute_many(
+                provider, texts, getattr(provider, method)
+            )
+
+        return embed_queries
+
+    def _batch_query_modality(
+        self,
+        modality: str,
+        collection,
+        queries: List[str],
+        query_k: int,
+        where: Optional[Dict[str, Any]],
+    ) -> Tuple[List[List[float]], dict]:
+        """Encode all *queries* for *modality* and search them in one query.
+
+        Returns:
+            ``(embeddings, result)`` where *result* holds one row per query.
+        """
+        embeddings = self._batch_embedders[modality](queries)
+        return embeddings, self._query_collection_batch(
+            collection, embeddings, query_k, where
+        )
+
+    @staticmethod
+    def _slice_query_result(result: dict, position: int) -> dict:
+        """Extract query *position* of a multi-query result as a one-query result."""
+        return {
+            key: [result[key][position]]
+            for key in ("ids", "distances", "metadatas")
+            if result.get(key)
+        }
+
+    def _submit_modalities(
+        self,
+        query: str,
+        query_k: int,
+        where: Optional[Dict[str, Any]] = None,
+        modalities: Optional[List[str]] = None,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> Dict[str, Future]:
+        """Dispatch the encode + query of each modality to the executor.
+
+        Args:
+            query: Raw text query.
+            query_k: Number of nearest neighbours to request per modality.
+            where: Optional metadata filter passed to every collection.
+            modalities: Names of the modalities to query (default: all).
+            embeddings: Known query embeddings by modality; those missing
+                are encoded and written back into this dict.
+
+        Returns:
+            Mapping of modality name to the future of its ChromaDB result.
+        """
+        if embeddings is None:
+            embeddings = {}
+        return {
+            modality: self._executor.submit(
+                self._query_modality,
+                modality, embedding_fn, collection, query, query_k, where, embeddings,
+            )
+            for embedding_fn, collection, modality in self._modalities
+            if modalities is None or modality in modalities
+        }
+
+    def _query_modality(
+        self,
+        modality: str,
+        embedding_fn: Callable,
+        collection,
+        query: str,
+        query_k: int,
+        where: Optional[Dict[str, Any]],
+        embeddings: Dict[str, List[float]],
+    ) -> dict:
+        """Encode *query* unless its embedding is known, then query *collection*."""
+        embedding = embeddings.get(modality)
+        if embedding is None:
+            embedding = embeddings[modality] = list(embedding_fn(query))
+        return self._query_collection(collection, embedding, query_k, where)
+
+    def _ranked_page(
+        self,
+        endpoint: str,
+        cursor: Optional[str],
+        top_k: int,
+        rank: Callable[[Dict[str, Any], Dict[str, Any], int], List[Dict[str, Any]]],
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """Serve one page of a ranked search from its paging session.
+
+        The session (see :class:`CursorSessions`) keeps the ranked
+        results computed so far.  A page inside them is cut out directly;
+        past their end, *rank* runs again with at least twice the
+        previous depth, so reaching page N costs a few searches in total
+        rather than one search of depth N per page.  The ranking is also
+        recomputed when the index generation has changed.  An expired
+        session is replaced by a new one ranked from the top.
+
+        Args:
+            endpoint: Endpoint name the cursor is bound to.
+            cursor: ``next_cursor`` of the previous page, or ``None``.
+            top_k: Page size.
+            rank: Maps ``(state, session, depth)`` to up to *depth* ranked
+                results; it may store embeddings in ``session["embeddings"]``.
+            **params: ``query``, ``threshold`` and ``media_type`` of a first page.
+
+        Returns:
+            Dict with ``results`` and ``next_cursor``.
+        """
+        if cursor:
+            state = decode_cursor(cursor, endpoint)
+            session = self.cursor_sessions.get(state["sid"])
+        else:
+            state = dict(params, endpoint=endpoint, offset=0, last=None)
+            session = None
+        if session is None:
+            session = {"embeddings": {}, "ranked": [], "depth": 0, "generation": None}
+            state["sid"] = self.cursor_sessions.create(session)
+
+        needed = state["offset"] + top_k + 1
+        generation = self.index_service.generation
+        ranked = session["ranked"]
+        complete = len(ranked) < session["depth"]
+        if session["generation"] != generation or (not complete and len(ranked) < needed):
+            depth = max(needed, 2 * session["depth"])
+            ranked = rank(state, session, depth)
+            session.update(ranked=ranked, depth=depth, generation=generation)
+        return self._page(state, ranked, top_k)
+
+    @staticmethod
+    def _page(
+        state: Dict[str, Any], ranked: List[Dict[str, Any]], top_k: int
+    ) -> Dict[str, Any]:
+        """Cut the next page out of *ranked* and build its cursor.
+
+        *ranked* is expected to hold one result more than the page needs,
+        so that a following page can be detected without another query.
+        """
+        start = resume_position(ranked, state)
+        page = [dict(result) for result in ranked[start:start + top_k]]
+        next_cursor = None
+        if page and len(ranked) > start + len(page):
+            next_cursor = encode_cursor(
+                dict(
+                    state,
+                    offset=start + len(page),
+                    last=[result_score(page[-1]), page[-1]["composite_id"]],
+                )
+            )
+        return {"results": page, "next_cursor": next_cursor}
+
+    def _fetch_filtered(
+        self,
+        fetch: Callable[[int], Tuple[Dict[str, Any], bool]],
+        top_k: int,
+        threshold: float,
+        media_type: str,
+        exclude_path: Optional[str] = None,
+        select: Optional[Callable[[Any], List[Dict[str, Any]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run *fetch* with a growing ``n_results`` until a page is filled.
+
+        The first fetch asks for ``top_k * overfetch_factor`` neighbours.
+        While :meth:`_filter_results` yields fewer than *top_k* results
+        and *fetch* reports that a wider query could return more, the
+        request grows by ``overfetch_growth`` up to
+        ``top_k * overfetch_max_factor`` (all from ``config.search``).
+
+        Args:
+            fetch: Maps ``n_results`` to ``(merged_results, more)``, where
+                *more* is ``False`` once every source is exhausted or its
+                remaining hits fall at or below *threshold*.
+            top_k: Maximum number of results to return.
+            threshold: Minimum similarity (exclusive) to keep a result.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+            exclude_path: Optional media ID to exclude.
+            select: Turns *fetch*'s first value into the result list in
+                place of :meth:`_filter_results` (e.g. hybrid fusion).
+
+        Returns:
+            Filtered, deduplicated result list.
+        """
+        search_config = config.search
+        query_k = self._initial_fetch_size(top_k)
+        limit = max(query_k, top_k * search_config.overfetch_max_factor)
+        while True:
+            merged_results, more = fetch(query_k)
+            if select is not None:
+                results = select(merged_results)
+            else:
+                results = self._filter_results(
+                    merged_results, top_k, threshold, media_type, exclude_path
+                )
+            if len(results) >= top_k or not more or query_k >= limit:
+                return results
+            query_k = min(query_k * max(2, search_config.overfetch_growth), limit)
+            logger.debug("Widening search to n_results=%d", query_k)
+
+    @staticmethod
+    def _initial_fetch_size(top_k: int) -> int:
+        """``n_results`` of the first fetch for a page of *top_k* results."""
+        return max(top_k, top_k * config.search.overfetch_factor, 1)
+
+    @staticmethod
+    def _merge_items(
+        items: List[Tuple[str, float, Optional[Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
+        """Sort scored triples and pack them as a single-query result dict."""
+        items = sorted(items, key=lambda x: x[1], reverse=True)
+        return {
+            "ids": [[item[0] for item in items]],
+            "distances": [[item[1] for item in items]],
+            "metadatas": [[item[2] for item in items]],
+        }
+
+    @staticmethod
+    def _page_is_full(
+        items: List[Tuple[str, float, Any]], query_k: int, threshold: float
+    ) -> bool:
+        """Whether a source returned a full page that still clears *threshold*."""
+        return len(items) >= query_k and min(item[1] for item in items) > threshold
+
+    @classmethod
+    def _media_type_where(cls, media_type: str) -> Optional[Dict[str, Any]]:
+        """Translate a ``media_type`` filter into a collection ``where`` clause.
+
+        Returns:
+            ``None`` for ``"all"`` (or an unknown type), otherwise a filter
+            on the metadata ``type`` field.
+        """
+        values = cls.MEDIA_TYPE_VALUES.get(media_type)
+        if not values:
+            return None
+        if len(values) == 1:
+            return {"type": values[0]}
+        return {"type": {"$in": values}}
+
+    @staticmethod
+    def _source_timeout(source: str) -> Optional[float]:
+        """Seconds *source* may take, or ``None`` for no limit."""
+        timeout = config.search.timeouts.get(source, config.search.timeout_seconds)
+        return timeout if timeout > 0 else None
+
+    def _gather(self, futures: Dict[str, Future]) -> Dict[str, Any]:
+        """Collect the results of concurrently dispatched search sources.
+
+        Args:
+            futures: Mapping of source name to its pending future.
+
+        Returns:
+            Mapping of source name to result for the sources that finished
+            (see :meth:`_iter_completed`).
+        """
+        return dict(self._iter_completed(futures))
+
+    def _iter_completed(self, futures: Dict[str, Future]) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(source, result)`` pairs in completion order.
+
+        Each source's timeout counts from the first call to ``next``.
+        Sources that raise or run past their timeout are logged and
+        omitted; a timed-out future is cancelled if it has not started
+        yet, otherwise its late result is discarded.
+
+        Args:
+            futures: Mapping of source name to its pending future.
+        """
+        start = time.monotonic()
+        deadlines = {}
+        for source in futures:
+            timeout = self._source_timeout(source)
+            deadlines[source] = None if timeout is None else start + timeout
+
+        pending = dict(futures)
+        while pending:
+            finite = [deadlines[source] for source in pending if deadlines[source] is not None]
+            timeout = max(0.0, min(finite) - time.monotonic()) if finite else None
+            done, _ = wait(pending.values(), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for source, future in list(pending.items()):
+                if future in done:
+                    del pending[source]
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        logger.warning("Search source %s failed: %s", source, exc)
+                        continue
+                    yield source, result
+                elif deadlines[source] is not None and now >= deadlines[source]:
+                    del pending[source]
+                    future.cancel()
+                    logger.warning(
+                        "Search source %s timed out after %.2fs; results omitted",
+                        source, deadlines[source] - start,
+                    )
+
+    def _score_modality_results(
+        self, results: dict, modality: str, is_lyrics: bool
+    ) -> List[Tuple[str, float, Optional[Dict[str, Any]]]]:
+        """Convert one collection's query results into scored triples.
+
+        Distances are normalised with :meth:`_normalize_distance`; for
+        lyric-like queries, MiniLM transcript matches get a 1.25x boost.
+
+        Args:
+            results: ChromaDB result dict for a single query embedding.
+            modality: One of ``"clip"``, ``"minilm"``, ``"clap"``.
+            is_lyrics: Result of :meth:`_is_lyrics_query` for the query.
+
+        Returns:
+            ``(item_id, score, metadata)`` triples in collection order.
+        """
+        if not results["ids"] or not results["ids"][0]:
+            return []
+
+        items = []
+        for p, d, m in zip(
+            results["ids"][0], results["distances"][0], results["metadatas"][0]
+        ):
+            s = self._normalize_distance(d, modality)
+            if is_lyrics and modality == "minilm":
+                subtype = (m or {}).get("subtype", "")
+                if subtype == "transcript":
+                    s = min(1.0, s * 1.25)
+            items.append((p, s, m))
+        return items
+
+    def _keyword_hits(
+        self, query: str, top_k: int, media_type: str
+    ) -> List[Tuple[str, float, Optional[Dict[str, Any]]]]:
+        """Run a BM25 query and attach text-collection metadata to each hit.
+
+        Returns:
+            ``(item_id, bm25_score, metadata)`` triples by descending score.
+        """
+        hits = self.bm25_service.search_scored(query, top_k, 0.0, media_type)
+        if not hits:
+            return []
+        metadata_lookup = self._lookup_metadata(
+            self.text_collection, [doc_id for doc_id, _ in hits]
+        )
+        return [
+            (doc_id, score, metadata_lookup.get(doc_id)) for doc_id, score in hits
+        ]
+
+    @staticmethod
+    def _lookup_metadata(collection, ids: List[str]) -> Dict[str, Any]:
+        """Fetch metadata for *ids* from *collection*, keyed by ID.
+
+        Lookup failures yield an empty mapping; callers fall back to
+        parsing the item ID.
+        """
+        metadata_lookup = {}
+        try:
+            collection_data = collection.get(ids=ids, include=["metadatas"])
+            for item_id, metadata in zip(
+                collection_data["ids"], collection_data.get("metadatas") or []
+            ):
+                metadata_lookup[item_id] = metadata
+        except Exception:
+            metadata_lookup = {}
+        return metadata_lookup
+
+    def _rank_by_media(
+        self,
+        items: List[Tuple[str, float, Optional[Dict[str, Any]]]],
+        media_type: str,
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Order one source's hits and keep the best hit per media item.
+
+        Items are keyed the same way :meth:`_filter_results` deduplicates
+        them: by the base media ID for videos and by ``media_id``
+        otherwise.
+
+        Args:
+            items: ``(item_id, score, metadata)`` triples from one source.
+            media_type: ``"image"``, ``"video"``, ``"audio"``, or ``"all"``.
+
+        Returns:
+            ``(media_key, score, result_dict)`` triples by descending score.
+        """
+        ranked = []
+        seen_keys = set()
+        for item_id, score, metadata in sorted(items, key=lambda x: x[1], reverse=True):
+            item_info = self._process_item_id(item_id, metadata)
+            item_type = item_info["type"]
+            if media_type != "all" and media_type != item_type:
+                continue
+
+            key = item_id.split(":::")[0] if item_type == "video" else item_info["media_id"]
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            ranked.append((key, score, item_info))
+        return ranked
+
+    def _fuse_rankings(
+        self,
+        rankings: Dict[str, List[Tuple[str, float, Dict[str, Any]]]],
+        top_k: int,
+        threshold: float,
+        fusion: str,
+    ) -> List[Dict[str, Any]]:
+        """Combine per-source rankings into one list (see :meth:`hybrid_search`).
+
+        Each fused result keeps the result dict of the source that
+        contributed the most to its score, so e.g. the best-matching video
+        frame supplies the timestamp.
+
+        Args:
+            rankings: Output of :meth:`_rank_by_media` per source name.
+            top_k: Maximum number of results to return.
+            threshold: Fused scores must exceed this value to be kept.
+            fusion: ``"rrf"`` or ``"weighted"``.
+
+        Returns:
+            Result dicts with a ``score`` key, by descending fused score.
+        """
+        weights = config.search.weights
+        fused: Dict[str, float] = {}
+        best: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        total_weight = 0.0
+
+        for source, ranked in rankings.items():
+            weight = weights.get(source, 1.0)
+            if weight <= 0 or not ranked:
+                continue
+            total_weight += weight
+            top_score = ranked[0][1]
+            for rank, (key, score, item_info) in enumerate(ranked, start=1):
+                if fusion == "rrf":
+                    contribution = weight / (config.search.rrf_k + rank)
+                else:
+                    if source == "bm25":
+                        score = score / top_score if top_score > 0 else 0.0
+                    contribution = weight * score
+                fused[key] = fused.get(key, 0.0) + contribution
+                if key not in best or contribution > best[key][0]:
+                    best[key] = (contribution, item_info)
+
+        if fusion == "weighted" and total_weight > 0:
+            fused = {key: score / total_weight for key, score in fused.items()}
+
+        final_results = []
+        for key in sorted(fused, key=fused.get, reverse=True):
+            if fused[key] <= threshold:
+                break
+            final_results.append(dict(best[key][1], score=fused[key]))
+            if len(final_results) >= top_k:
+                break
+        return final_results
+
     @staticmethod
     def _query_collection(
-        embedding_fn: Callable, collection, query: str, query_k: int
+        collection,
+        embedding: List[float],
+        query_k: int,
+        where: Optional[Dict[str, Any]] = None,
     ) -> dict:
-        """Encode *query* and run a vector search against *collection*.
+        """Run a vector search for *embedding* against *collection*.
 
         Args:
-            embedding_fn: Callable that maps a string to a list of floats.
             collection: ChromaDB collection to search.
-            query: Raw text query.
+            embedding: Query embedding.
             query_k: Number of nearest neighbours to request.
+            where: Optional metadata filter applied by the collection.
 
         Returns:
             ChromaDB result dict with keys ``ids``, ``distances``, ``metadatas``.
         """
-        embedding = embedding_fn(query)
+        return SearchService._query_collection_batch(
+            collection, [embedding], query_k, where
+        )
+
+    @staticmethod
+    def _query_collection_batch(
+        collection,
+        embeddings: List[List[float]],
+        query_k: int,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """Search *collection* for every vector in *embeddings* in one call.
+
+        Returns:
+            ChromaDB result dict with one row per query embedding.
+        """
         return collection.query(
-            query_embeddings=[embedding],
+            query_embeddings=list(embeddings),
             n_results=query_k,
+            where=where,
             include=["distances", "metadatas"],
         )
 
@@ -496,7 +1645,8 @@ class SearchService:
             exclude_path: Optional media ID to exclude (used in image search).
 
         Returns:
-            Filtered, deduplicated result list.
+            Filtered, deduplicated result list; each result carries its
+            ``similarity``.
         """
         ids = results["ids"][0]
         similarities = results["distances"][0]
@@ -533,6 +1683,7 @@ class SearchService:
                     continue
                 seen_media_ids.add(item_info["media_id"])
 
+            item_info["similarity"] = s
             final_results.append(item_info)
 
             if len(final_results) >= top_k:
@@ -0,0 +1,165 @@
+"""Text analysis chain for the BM25 keyword index.
+
+An :class:`Analyzer` turns raw OCR / transcript text into index terms
+in three steps:
+
+1. **Normalisation** — Unicode NFKC, case folding and (optionally)
+   accent folding, so ``"Café"`` and ``"cafe"`` match.
+2. **Tokenisation** — runs of letters and digits; punctuation glued to
+   words by OCR (``"invoice:"``, ``"total,"``) is dropped.
+3. **Token filters** — a pluggable list of callables, e.g. the light
+   English stemmer and character n-grams that make noisy OCR tokens
+   partially matchable.
+
+:func:`build_analyzer` assembles the chain from ``config.bm25``.
+"""
+
+import re
+import unicodedata
+from typing import Callable, Iterable, List, Optional, Sequence
+
+TokenFilter = Callable[[List[str]], List[str]]
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_VOWELS = set("aeiouy")
+_STEM_SUFFIXES = ("ingly", "edly", "ing", "ed", "ly")
+NGRAM_PREFIX = "#"
+
+
+def fold_accents(text: str) -> str:
+    """Strip combining marks (``"é"`` → ``"e"``)."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def light_stem(token: str) -> str:
+    """Light English suffix stripper for plurals and -ing/-ed/-ly forms.
+
+    Only alphabetic tokens longer than three characters are stemmed, and
+    a suffix is removed only if the remaining stem contains a vowel.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+
+    if token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in _STEM_SUFFIXES:
+        stem = token[: -len(suffix)]
+        if token.endswith(suffix) and len(stem) >= 3 and _VOWELS & set(stem):
+            if stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                stem = stem[:-1]
+            return stem
+    return token
+
+
+def stem_filter(tokens: List[str]) -> List[str]:
+    """Token filter applying :func:`light_stem`."""
+    return [light_stem(token) for token in tokens]
+
+
+def ngram_filter(min_n: int, max_n: int) -> TokenFilter:
+    """Token filter that appends character n-grams of each token.
+
+    N-grams are taken from the token padded with ``^``/``$`` boundary
+    markers and prefixed with ``#`` so they never collide with words.
+    Whole tokens are kept.
+    """
+
+    def apply(tokens: List[str]) -> List[str]:
+        grams: List[str] = []
+        for token in tokens:
+            padded = "^%s$" % token
+            for n in range(min_n, max_n + 1):
+                if len(padded) <= n:
+                    break
+                grams.extend(
+                    NGRAM_PREFIX + padded[i:i + n] for i in range(len(padded) - n + 1)
+                )
+        return tokens + grams
+
+    return apply
+
+
+class Analyzer:
+    """Normalise, tokenise and filter text into index terms.
+
+    Usage::
+
+        analyzer = Analyzer(token_filters=[stem_filter])
+        analyzer.analyze("Invoice: TOTALS, café")
+        # ['invoice', 'total', 'cafe']
+
+    Attributes:
+        fold_accents: Whether accents are stripped during normalisation.
+        min_token_length: Shorter tokens are dropped before filtering.
+        token_filters: Callables applied to the token list in order.
+        signature: String identifying the configuration, stored with
+            the index so that a changed chain triggers a rebuild.
+    """
+
+    def __init__(
+        self,
+        fold_accents: bool = True,
+        min_token_length: int = 1,
+        token_filters: Optional[Sequence[TokenFilter]] = None,
+        signature: Optional[str] = None,
+    ):
+        self.fold_accents = fold_accents
+        self.min_token_length = max(1, min_token_length)
+        self.token_filters = list(token_filters or [])
+        self.signature = signature or "fold=%d,min=%d,filters=%s" % (
+            fold_accents,
+            self.min_token_length,
+            "+".join(getattr(f, "__name__", "custom") for f in self.token_filters),
+        )
+
+    def normalize(self, text: str) -> str:
+        """Apply Unicode NFKC, case folding and optional accent folding."""
+        text = unicodedata.normalize("NFKC", text).casefold()
+        return fold_accents(text) if self.fold_accents else text
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split normalised text into alphanumeric tokens."""
+        return [
+            token for token in _TOKEN_RE.findall(text)
+            if len(token) >= self.min_token_length
+        ]
+
+    def analyze(self, text: str) -> List[str]:
+        """Run the full chain on *text*."""
+        tokens = self.tokenize(self.normalize(text or ""))
+        for token_filter in self.token_filters:
+            tokens = token_filter(tokens)
+        return tokens
+
+    def analyze_all(self, texts: Iterable[str]) -> List[List[str]]:
+        """Run the full chain on each of *texts*."""
+        return [self.analyze(text) for text in texts]
+
+
+def build_analyzer(bm25_config) -> Analyzer:
+    """Create the analyzer described by a :class:`BM25Config`."""
+    filters: List[TokenFilter] = []
+    parts = []
+    if bm25_config.stemming:
+        filters.append(stem_filter)
+        parts.append("stem")
+    if bm25_config.ngram_max > 0:
+        min_n = max(1, bm25_config.ngram_min)
+        filters.append(ngram_filter(min_n, bm25_config.ngram_max))
+        parts.append("ngram%d-%d" % (min_n, bm25_config.ngram_max))
+    return Analyzer(
+        fold_accents=bm25_config.fold_accents,
+        min_token_length=bm25_config.min_token_length,
+        token_filters=filters,
+        signature="v1:fold=%d,min=%d,filters=%s" % (
+            bm25_config.fold_accents,
+            bm25_config.min_token_length,
+            "+".join(parts),
+        ),
+    )